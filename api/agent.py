@@ -2,15 +2,27 @@
 LangGraph agent for RAG with web search capabilities.
 """
 
-from typing import Annotated, List, Sequence, TypedDict
-
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+import asyncio
+import time
+import uuid
+from typing import Annotated, Any, Dict, List, Optional, Sequence, TypedDict
+
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 
 from config import settings
+from router import DecisionCache, RouteClassifier, RouterMetrics
 from tools import get_available_tools
 
 
@@ -23,6 +35,13 @@ class AgentState(TypedDict):
     routing_decision: str  # "simple" or "research"
 
 
+# Number of KB chunks injected on the simple path (and prefetched while routing)
+SIMPLE_RAG_K = 3
+
+# Name of the system message carrying prefetched KB results into research gathering
+WARM_CONTEXT_NAME = "prefetched_kb_context"
+
+
 class RAGAgent:
     """RAG agent using LangGraph for workflow orchestration."""
 
@@ -41,13 +60,42 @@ class RAGAgent:
             openai_api_key=settings.openai_api_key,
             temperature=0,
         )
+        # Tiered routing: the router LLM is only consulted when the local classifier
+        # is unsure and the message has not been routed before
+        self.route_classifier = RouteClassifier(settings.router_confidence_threshold)
+        self.route_cache = DecisionCache(
+            max_size=settings.router_cache_size, ttl_seconds=settings.router_cache_ttl_seconds
+        )
+        self.router_metrics = RouterMetrics()
+        # Speculative KB retrieval started by the router, by run key; kept out of
+        # AgentState so the graph state only ever holds plain data
+        self._prefetches: Dict[str, asyncio.Task] = {}
 
         self.tools = get_available_tools()
-        self.llm_with_tools = self.llm.bind_tools(self.tools)
+        self.tool_node = ToolNode(self.tools)
+        self._bind_tool_llms()
 
         # Build the graph
         self.graph = self._build_graph()
 
+    def _bind_tool_llms(self):
+        """
+        Bind the LLM once per node tool set.
+
+        bind_tools regenerates every tool's JSON schema, so the bound runnables are
+        built here and reused by every request. Call again after replacing self.llm.
+        """
+        from tools import create_web_search_tool, research_topic_breakdown, search_knowledge_base
+
+        web_tool = create_web_search_tool()
+        web_tools = [web_tool] if web_tool else []
+
+        self.llm_with_tools = self.llm.bind_tools(self.tools)
+        # Simple mode: Only web search tool available (RAG already done)
+        self.llm_with_simple_tools = self.llm.bind_tools(web_tools) if web_tools else self.llm
+        self.llm_with_planning = self.llm.bind_tools([research_topic_breakdown])
+        self.llm_with_gathering = self.llm.bind_tools([search_knowledge_base] + web_tools)
+
     @staticmethod
     def _convert_messages_to_langchain(messages: List[dict]) -> List[BaseMessage]:
         """Convert message dicts to LangChain message objects.
@@ -151,10 +199,18 @@ class RAGAgent:
         workflow.add_node("report_builder", self._report_builder)  # Research: Build report
 
         # Tool execution (shared)
-        workflow.add_node("tools", ToolNode(self.tools))
+        workflow.add_node("tools", self._execute_tools)
 
         # Define edges with routing
-        workflow.set_entry_point("router")  # Start with router
+        # Start with router unless the client already chose a path
+        workflow.set_conditional_entry_point(
+            self._select_entry,
+            {
+                "router": "router",
+                "research": "research_planner",
+                "simple": "simple_rag",
+            },
+        )
 
         # Router decides path
         workflow.add_conditional_edges(
@@ -193,13 +249,16 @@ class RAGAgent:
 
         return workflow.compile()
 
-    async def _route_request(self, state: AgentState) -> AgentState:
+    async def _route_request(
+        self, state: AgentState, config: Optional[RunnableConfig] = None
+    ) -> AgentState:
         """
         Intelligently route the request to determine if it needs deep research or simple answer.
         This is the first node - it analyzes user intent.
 
         Args:
             state: Current agent state
+            config: Runnable config (its thread_id keys the speculative retrieval)
 
         Returns:
             Updated state with routing decision
@@ -210,7 +269,39 @@ class RAGAgent:
         if not user_message:
             return state
 
-        # Ask the router LLM to classify the request
+        # Start KB retrieval now so it overlaps with routing; whichever path is taken
+        # awaits the task instead of paying for retrieval after the routing call
+        run_key = self._run_key(config)
+        if run_key is not None:
+            self._prefetches[run_key] = asyncio.create_task(self._prefetch_retrieval(user_message))
+
+        start = time.perf_counter()
+        source = "heuristic"
+        decision = self.route_classifier.decide(user_message)
+        if decision is None:
+            source = "cache"
+            decision = self.route_cache.get(user_message)
+        if decision is None:
+            source = "llm"
+            decision = await self._classify_with_llm(user_message)
+            self.route_cache.set(user_message, decision)
+        self.router_metrics.record(source, decision, time.perf_counter() - start)
+
+        # Update routing decision in state (overwrite default)
+        state["routing_decision"] = decision
+
+        return state
+
+    async def _classify_with_llm(self, user_message: str) -> str:
+        """
+        Ask the router LLM to classify a request the local classifier is unsure about.
+
+        Args:
+            user_message: Latest user message
+
+        Returns:
+            "research" or "simple"
+        """
         routing_prompt = f"""Analyze this user request and determine if it requires:
 A) SIMPLE answer (quick fact, definition, brief explanation)
 B) RESEARCH (comprehensive report, deep analysis, detailed exploration)
@@ -233,14 +324,89 @@ Respond with ONLY ONE WORD:
 - "SIMPLE" if this needs a quick answer"""
 
         routing_response = await self.router_llm.ainvoke([HumanMessage(content=routing_prompt)])
+        return "research" if "RESEARCH" in routing_response.content.upper() else "simple"
 
-        # Store routing decision in state metadata
-        decision = "research" if "RESEARCH" in routing_response.content.upper() else "simple"
+    @staticmethod
+    async def _prefetch_retrieval(user_message: str) -> Optional[list]:
+        """
+        Retrieve KB results for the user message ahead of the routing decision.
 
-        # Update routing decision in state (overwrite default)
-        state["routing_decision"] = decision
+        Args:
+            user_message: Latest user message
 
-        return state
+        Returns:
+            List of (document, score) tuples, or None if retrieval failed
+        """
+        from vector_store import vector_store_service
+
+        try:
+            return await vector_store_service.similarity_search_with_score(
+                user_message, k=SIMPLE_RAG_K
+            )
+        except Exception as e:
+            # Fall back to retrieval inside the node that needs it
+            print(f"Warning: speculative retrieval failed: {e}")
+            return None
+
+    @staticmethod
+    def _run_key(config: Optional[RunnableConfig]) -> Optional[str]:
+        """
+        Get the key of the graph run a node is executing in.
+
+        Args:
+            config: Runnable config passed to the node
+
+        Returns:
+            The run's thread_id, or None when the graph was invoked without one
+        """
+        return ((config or {}).get("configurable") or {}).get("thread_id")
+
+    @staticmethod
+    def _run_config() -> RunnableConfig:
+        """Build the config for one graph run, with a fresh run key."""
+        return {"configurable": {"thread_id": uuid.uuid4().hex}}
+
+    def _pop_prefetch(self, config: Optional[RunnableConfig]) -> Optional[asyncio.Task]:
+        """
+        Take the run's speculative retrieval task, so only its first consumer awaits it.
+
+        Args:
+            config: Runnable config passed to the node
+
+        Returns:
+            The task started by the router, or None if there is none (left)
+        """
+        run_key = self._run_key(config)
+        return self._prefetches.pop(run_key, None) if run_key is not None else None
+
+    def _discard_prefetch(self, config: RunnableConfig) -> None:
+        """Cancel a run's speculative retrieval if no node consumed it."""
+        prefetch = self._pop_prefetch(config)
+        if prefetch is not None:
+            prefetch.cancel()
+
+    def router_stats(self) -> dict:
+        """
+        Get routing statistics.
+
+        Returns:
+            Dictionary with decision counts, LLM fallback rate, latency and cache stats
+        """
+        return {**self.router_metrics.stats(), "cache": self.route_cache.stats()}
+
+    @staticmethod
+    def _select_entry(state: AgentState) -> str:
+        """
+        Pick the entry node, skipping the router when a routing decision was supplied.
+
+        Args:
+            state: Initial agent state
+
+        Returns:
+            "research", "simple", or "router"
+        """
+        decision = state.get("routing_decision")
+        return decision if decision in ("research", "simple") else "router"
 
     def _determine_mode(self, state: AgentState) -> str:
         """
@@ -255,26 +421,33 @@ Respond with ONLY ONE WORD:
         decision = state.get("routing_decision", "simple")
         return decision
 
-    async def _simple_rag(self, state: AgentState) -> AgentState:
+    async def _simple_rag(
+        self, state: AgentState, config: Optional[RunnableConfig] = None
+    ) -> AgentState:
         """
         Handle simple RAG path - automatically retrieve and inject context.
         This is a separate node for the simple path.
 
         Args:
             state: Current agent state
+            config: Runnable config (keys the retrieval started while routing)
 
         Returns:
             Updated state with RAG context injected
         """
         messages = state["messages"]
         user_query = self._find_latest_user_message(messages)
+        prefetch = self._pop_prefetch(config)
+        prefetched = await prefetch if prefetch is not None else None
 
         if user_query:
-            from vector_store import vector_store_service
+            docs_with_scores = prefetched
+            if docs_with_scores is None:
+                from vector_store import vector_store_service
 
-            docs_with_scores = await vector_store_service.similarity_search_with_score(
-                user_query, k=3
-            )
+                docs_with_scores = await vector_store_service.similarity_search_with_score(
+                    user_query, k=SIMPLE_RAG_K
+                )
 
             if docs_with_scores:
                 context, sources_list = self._build_rag_sources(
@@ -335,16 +508,7 @@ Respond with ONLY ONE WORD:
             messages = [system_message] + list(messages)
 
         # Simple mode: Only web search tool available (RAG already done)
-        from tools import create_web_search_tool
-
-        web_tool = create_web_search_tool()
-        simple_tools = [web_tool] if web_tool else []
-
-        if simple_tools:
-            llm_with_simple_tools = self.llm.bind_tools(simple_tools)
-            response = await llm_with_simple_tools.ainvoke(messages)
-        else:
-            response = await self.llm.ainvoke(messages)
+        response = await self.llm_with_simple_tools.ainvoke(messages)
 
         # Preserve sources from state (populated by _simple_rag node)
         return {"messages": [response], "sources": state.get("sources", [])}
@@ -376,28 +540,28 @@ Respond with ONLY ONE WORD:
         messages = [system_message] + list(messages)
 
         # Only give planning tool
-        from tools import research_topic_breakdown
-
-        planning_tools = [research_topic_breakdown]
-        llm_with_planning = self.llm.bind_tools(planning_tools)
-
-        response = await llm_with_planning.ainvoke(messages)
+        response = await self.llm_with_planning.ainvoke(messages)
         return {"messages": [response]}
 
-    async def _research_gatherer(self, state: AgentState) -> AgentState:
+    async def _research_gatherer(
+        self, state: AgentState, config: Optional[RunnableConfig] = None
+    ) -> AgentState:
         """
         Research gathering agent - collects information from KB and web.
 
         Args:
             state: Current agent state with research plan
+            config: Runnable config (keys the retrieval started while routing)
 
         Returns:
             Updated state with gathered information
         """
         messages = state["messages"]
 
-        # Check if we need a system message
-        if not any(isinstance(msg, SystemMessage) for msg in messages):
+        # Check if we need a system message (the warm KB context does not count)
+        if not any(
+            isinstance(msg, SystemMessage) and msg.name != WARM_CONTEXT_NAME for msg in messages
+        ):
             system_message = SystemMessage(
                 content=(
                     "You are a Research Gathering Agent. You have a research plan. "
@@ -415,18 +579,30 @@ Respond with ONLY ONE WORD:
             )
             messages = [system_message] + list(messages)
 
-        # Give access to KB and web search tools
-        from tools import create_web_search_tool, search_knowledge_base
-
-        gathering_tools = [search_knowledge_base]
-        web_search_tool = create_web_search_tool()
-        if web_search_tool:
-            gathering_tools.append(web_search_tool)
+        # KB results retrieved while routing give the gatherer a warm start. Only the
+        # first iteration finds the task; it adds the context to the conversation so
+        # every later iteration (and the report builder) still sees it
+        new_messages: List[BaseMessage] = []
+        prefetch = self._pop_prefetch(config)
+        if prefetch is not None:
+            docs_with_scores = await prefetch
+            context, _ = self._build_rag_sources(docs_with_scores or [], settings.score_threshold)
+            if context:
+                new_messages.append(
+                    SystemMessage(
+                        content=(
+                            "KNOWLEDGE BASE RESULTS ALREADY RETRIEVED FOR THE ORIGINAL REQUEST:\n\n"
+                            f"{context}\n\n"
+                            "Use these as a starting point; search further for each subtopic."
+                        ),
+                        name=WARM_CONTEXT_NAME,
+                    )
+                )
 
-        llm_with_gathering = self.llm.bind_tools(gathering_tools)
-        response = await llm_with_gathering.ainvoke(messages)
+        # Give access to KB and web search tools
+        response = await self.llm_with_gathering.ainvoke(list(messages) + new_messages)
 
-        return {"messages": [response]}
+        return {"messages": new_messages + [response]}
 
     async def _report_builder(self, state: AgentState) -> AgentState:
         """
@@ -475,6 +651,72 @@ Respond with ONLY ONE WORD:
         response = await self.llm.ainvoke(messages)
         return {"messages": [response]}
 
+    async def _execute_tools(
+        self, state: AgentState, config: Optional[RunnableConfig] = None
+    ) -> dict:
+        """
+        Execute the last message's tool calls, batching knowledge base searches.
+
+        Several search_knowledge_base calls in one message are coalesced into one
+        batched embedding request plus concurrent index queries; other tool calls run
+        through the regular ToolNode alongside the batch.
+
+        Args:
+            state: Current agent state
+            config: Runnable config (used to emit batch latency events)
+
+        Returns:
+            Update with one ToolMessage per tool call, in call order
+        """
+        last_message = state["messages"][-1]
+        tool_calls = getattr(last_message, "tool_calls", None) or []
+        kb_calls = [call for call in tool_calls if call["name"] == "search_knowledge_base"]
+        if len(kb_calls) < 2:
+            update: dict = await self.tool_node.ainvoke(state, config)
+            return update
+
+        from tools import search_knowledge_base_batch
+
+        other_calls = [call for call in tool_calls if call["name"] != "search_knowledge_base"]
+
+        async def run_kb_batch():
+            start = time.perf_counter()
+            try:
+                outputs = await search_knowledge_base_batch(
+                    [call["args"]["query"] for call in kb_calls]
+                )
+                status = "success"
+            except Exception as e:
+                # Report the failure to the model like ToolNode's handle_tool_errors would
+                outputs = [f"Error: {e!r}\n Please fix your mistakes."] * len(kb_calls)
+                status = "error"
+            return outputs, status, time.perf_counter() - start
+
+        async def run_other_tools():
+            if not other_calls:
+                return []
+            other_message = last_message.model_copy(update={"tool_calls": other_calls})
+            result = await self.tool_node.ainvoke({"messages": [other_message]}, config)
+            return result["messages"]
+
+        (kb_outputs, kb_status, kb_seconds), other_messages = await asyncio.gather(
+            run_kb_batch(), run_other_tools()
+        )
+
+        if config is not None:
+            await adispatch_custom_event(
+                "kb_batch",
+                {"queries": len(kb_calls), "latency_ms": round(kb_seconds * 1000, 1)},
+                config=config,
+            )
+
+        by_id = {message.tool_call_id: message for message in other_messages}
+        for call, output in zip(kb_calls, kb_outputs):
+            by_id[call["id"]] = ToolMessage(
+                content=output, tool_call_id=call["id"], name=call["name"], status=kb_status
+            )
+        return {"messages": [by_id[call["id"]] for call in tool_calls]}
+
     def _check_research_ready(self, state: AgentState) -> str:
         """
         Check if research gathering is complete or needs more information.
@@ -572,18 +814,8 @@ Respond with ONLY ONE WORD:
         # For simple mode, give access to web tool only (RAG already done)
         # For research mode, give access to all tools
         if mode == "simple":
-            # Simple mode: Only web search tool available
-            from tools import create_web_search_tool
-
-            web_tool = create_web_search_tool()
-            simple_tools = [web_tool] if web_tool else []
-
-            if simple_tools:
-                llm_with_simple_tools = self.llm.bind_tools(simple_tools)
-                response = await llm_with_simple_tools.ainvoke(messages)
-            else:
-                # No tools available, just answer
-                response = await self.llm.ainvoke(messages)
+            # Simple mode: Only web search tool available (plain LLM if none configured)
+            response = await self.llm_with_simple_tools.ainvoke(messages)
         else:
             # Research mode: All tools available
             response = await self.llm_with_tools.ainvoke(messages)
@@ -609,19 +841,31 @@ Respond with ONLY ONE WORD:
 
         return "end"
 
-    async def astream(self, messages: List[dict], session_id: str = None):
+    def _initial_state(self, messages: List[dict], mode: Optional[str]) -> dict:
+        """Build the graph input, pre-seeding the routing decision when one was requested."""
+        initial_state: Dict[str, Any] = {
+            "messages": self._convert_messages_to_langchain(messages),
+            "sources": [],
+        }
+        if mode is not None:
+            initial_state["routing_decision"] = mode
+        return initial_state
+
+    async def astream(
+        self, messages: List[dict], session_id: str = None, mode: Optional[str] = None
+    ):
         """
         Stream responses from the agent with token-level streaming.
 
         Args:
             messages: List of message dictionaries with 'role' and 'content'
             session_id: Optional session ID for tracking
+            mode: Optional "simple" or "research" to skip the router
 
         Yields:
             Chunks of the response as tokens are generated
         """
-        lc_messages = self._convert_messages_to_langchain(messages)
-        initial_state = {"messages": lc_messages, "sources": []}
+        initial_state = self._initial_state(messages, mode)
 
         # Use astream_events for token-level streaming (v2 API)
         routing_mode = None
@@ -630,38 +874,61 @@ Respond with ONLY ONE WORD:
         # Track which phase we're in to filter streaming
         current_phase = "routing"  # routing -> gathering/rag -> responding
 
-        async for event in self.graph.astream_events(initial_state, version="v2"):
-            kind = event["event"]
-            node_name = event.get("name", "")
-
-            # Track phase transitions via node completions
-            if kind == "on_chain_start":
-                # Update phase when entering specific nodes
-                if "simple_agent" in node_name or "report_builder" in node_name:
-                    current_phase = "responding"
-                elif "simple_rag" in node_name:
-                    current_phase = "rag"
-
-            # Capture routing decision from router node
-            if kind == "on_chain_end":
-                if "router" in node_name.lower() or node_name == "_route_request":
-                    output = event.get("data", {}).get("output", {})
-                    if isinstance(output, dict) and "routing_decision" in output:
-                        routing_mode = output["routing_decision"]
-                        current_phase = "gathering" if routing_mode == "research" else "rag"
-                        yield {"type": "step", "content": routing_mode}
-
-                # Capture sources from simple_rag node
-                elif "simple_rag" in node_name.lower() or node_name == "_simple_rag":
-                    output = event.get("data", {}).get("output", {})
-                    if isinstance(output, dict) and "sources" in output:
-                        collected_sources = output["sources"]
-
-            # Stream tokens ONLY during the responding phase
-            elif kind == "on_chat_model_stream" and current_phase == "responding":
-                chunk = event["data"]["chunk"]
-                if hasattr(chunk, "content") and chunk.content:
-                    yield {"type": "token", "content": chunk.content}
+        if mode is not None:
+            # Router is skipped, so announce the requested path up front
+            routing_mode = mode
+            current_phase = "gathering" if mode == "research" else "rag"
+            yield {"type": "step", "content": routing_mode}
+
+        config = self._run_config()
+        try:
+            async for event in self.graph.astream_events(
+                initial_state, config=config, version="v2"
+            ):
+                kind = event["event"]
+                node_name = event.get("name", "")
+
+                # Track phase transitions via node completions
+                if kind == "on_chain_start":
+                    # Update phase when entering specific nodes
+                    if "simple_agent" in node_name or "report_builder" in node_name:
+                        current_phase = "responding"
+                    elif "simple_rag" in node_name:
+                        current_phase = "rag"
+
+                # Capture routing decision from router node
+                if kind == "on_chain_end":
+                    if "router" in node_name.lower() or node_name == "_route_request":
+                        output = event.get("data", {}).get("output", {})
+                        if isinstance(output, dict) and "routing_decision" in output:
+                            routing_mode = output["routing_decision"]
+                            current_phase = "gathering" if routing_mode == "research" else "rag"
+                            yield {"type": "step", "content": routing_mode}
+
+                    # Capture sources from simple_rag node
+                    elif "simple_rag" in node_name.lower() or node_name == "_simple_rag":
+                        output = event.get("data", {}).get("output", {})
+                        if isinstance(output, dict) and "sources" in output:
+                            collected_sources = output["sources"]
+
+                # Surface batched knowledge base searches as research steps
+                elif kind == "on_custom_event" and event["name"] == "kb_batch":
+                    batch = event["data"]
+                    yield {
+                        "type": "step",
+                        "step": (
+                            f"Knowledge base batch: {batch['queries']} queries "
+                            f"in {batch['latency_ms']:.0f} ms"
+                        ),
+                    }
+
+                # Stream tokens ONLY during the responding phase
+                elif kind == "on_chat_model_stream" and current_phase == "responding":
+                    chunk = event["data"]["chunk"]
+                    if hasattr(chunk, "content") and chunk.content:
+                        yield {"type": "token", "content": chunk.content}
+        finally:
+            self._discard_prefetch(config)
 
         # Emit sources if any were collected
         if collected_sources:
@@ -670,22 +937,28 @@ Respond with ONLY ONE WORD:
         # Signal completion
         yield {"type": "done"}
 
-    async def ainvoke(self, messages: List[dict], session_id: str = None) -> dict:
+    async def ainvoke(
+        self, messages: List[dict], session_id: str = None, mode: Optional[str] = None
+    ) -> dict:
         """
         Invoke the agent and get a complete response.
 
         Args:
             messages: List of message dictionaries
             session_id: Optional session ID
+            mode: Optional "simple" or "research" to skip the router
 
         Returns:
             Dictionary with response and sources
         """
-        lc_messages = self._convert_messages_to_langchain(messages)
-        initial_state = {"messages": lc_messages, "sources": []}
+        initial_state = self._initial_state(messages, mode)
 
         # Run the graph
-        result = await self.graph.ainvoke(initial_state)
+        config = self._run_config()
+        try:
+            result = await self.graph.ainvoke(initial_state, config=config)
+        finally:
+            self._discard_prefetch(config)
 
         # Extract the final response
         final_message = result["messages"][-1]
@@ -0,0 +1,127 @@
+"""
+Load benchmark for concurrent /api/chat/stream requests.
+
+Replaces Pinecone and the LLMs with offline stand-ins (a retrieval stub that sleeps
+synchronously, like the real client does on the network) and fires concurrent
+streaming requests through the ASGI app. Compares the executor-backed retrieval
+path against the old inline behaviour where the blocking call ran on the event loop.
+
+Usage:
+    python -m benchmarks.concurrent_stream --requests 20 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from unittest.mock import patch
+
+# Settings are validated at import time; the benchmark never talks to real services
+os.environ.setdefault("OPENAI_API_KEY", "bench-openai-key")
+os.environ.setdefault("PINECONE_API_KEY", "bench-pinecone-key")
+os.environ.setdefault("PINECONE_ENVIRONMENT", "bench-env")
+os.environ["TAVILY_API_KEY"] = ""
+# Every request must reach the (simulated) index
+os.environ["RESULT_CACHE_SIZE"] = "0"
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+import httpx  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+
+from agent import agent  # noqa: E402
+from main import app  # noqa: E402
+from vector_store import vector_store_service  # noqa: E402
+
+
+class FakeToolChatModel(FakeListChatModel):
+    """Fake chat model that accepts tool bindings (and ignores them)."""
+
+    def bind_tools(self, tools, **kwargs):
+        """Return the model itself; the canned responses never call tools."""
+        return self
+
+
+class SlowBlockingVectorStore:
+    """Synchronous vector store stand-in with fixed network latency."""
+
+    def __init__(self, latency: float):
+        """Initialize with the simulated round-trip latency in seconds."""
+        self.latency = latency
+
+    def similarity_search_with_score(self, query: str, k: int = 5):
+        """Block for the configured latency, then return one document."""
+        time.sleep(self.latency)
+        doc = Document(
+            page_content=f"Context for {query}",
+            metadata={"file_name": "bench.md", "document_title": "Benchmark"},
+        )
+        return [(doc, 0.9)]
+
+    def similarity_search(self, query: str, k: int = 5):
+        """Block for the configured latency, then return one document."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+
+async def _inline_run_blocking(func, *args, **kwargs):
+    """Old behaviour: run the blocking call directly on the event loop."""
+    return func(*args, **kwargs)
+
+
+async def _stream_once(client: httpx.AsyncClient, i: int) -> float:
+    """Send one streaming chat request and return its latency."""
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/chat/stream",
+        json={"message": f"What is RAG? ({i})", "session_id": f"bench-{i}"},
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_load(num_requests: int) -> tuple[float, list[float]]:
+    """Fire concurrent streaming requests and return (wall time, per-request latencies)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(_stream_once(client, i) for i in range(num_requests)))
+        return time.perf_counter() - start, list(latencies)
+
+
+def _report(label: str, wall: float, latencies: list[float], latency: float) -> None:
+    """Print a one-line summary for a benchmark run."""
+    serial = latency * len(latencies)
+    print(
+        f"{label:<10} wall={wall:6.3f}s  "
+        f"p50={sorted(latencies)[len(latencies) // 2]:6.3f}s  "
+        f"max={max(latencies):6.3f}s  "
+        f"(fully serialized would be {serial:.3f}s)"
+    )
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent /api/chat/stream")
+    parser.add_argument("--requests", type=int, default=20, help="Concurrent requests")
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Simulated retrieval latency (s)"
+    )
+    args = parser.parse_args()
+
+    vector_store_service._vectorstore = SlowBlockingVectorStore(args.latency)
+    agent.router_llm = FakeListChatModel(responses=["SIMPLE"])
+    agent.llm = FakeToolChatModel(responses=["Benchmark answer."])
+    agent._bind_tool_llms()
+
+    print(f"{args.requests} concurrent requests, {args.latency:.3f}s retrieval latency")
+
+    with patch.object(vector_store_service, "_run_blocking", _inline_run_blocking):
+        wall, latencies = asyncio.run(run_load(args.requests))
+    _report("inline", wall, latencies, args.latency)
+
+    wall, latencies = asyncio.run(run_load(args.requests))
+    _report("executor", wall, latencies, args.latency)
+
+
+if __name__ == "__main__":
+    main()
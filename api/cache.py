@@ -0,0 +1,306 @@
+"""
+In-process caches for the retrieval layer.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry time-to-live and hit/miss counters."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries before least-recently-used eviction
+            ttl_seconds: Seconds an entry stays valid after it is stored
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a key, counting the hit or miss.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def values(self) -> List[Any]:
+        """Snapshot unexpired entries without touching counters or recency."""
+        now = self._clock()
+        with self._lock:
+            return [value for expires_at, value in self._entries.values() if expires_at > now]
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones not yet purged."""
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text for cache keys (case and whitespace insensitive)."""
+    return " ".join(text.split()).casefold()
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that caches query vectors.
+
+    Keys are the embedding model plus the normalized query text, so repeated or
+    trivially reworded queries skip the OpenAI round-trip. Document embedding is
+    passed straight through.
+    """
+
+    def __init__(self, embeddings: Embeddings, model: str, cache: TTLCache):
+        """
+        Initialize the wrapper.
+
+        Args:
+            embeddings: Underlying embeddings client
+            model: Embedding model name (part of the cache key)
+            cache: Cache to store query vectors in
+        """
+        self.embeddings = embeddings
+        self.model = model
+        self.cache = cache
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, serving repeated queries from the cache."""
+        key = (self.model, normalize_query(text))
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.cache.set(key, vector)
+        return vector
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several queries, sending only the uncached ones in a single batched request.
+
+        Args:
+            texts: Query texts
+
+        Returns:
+            One vector per query, in input order
+        """
+        keys = [(self.model, normalize_query(text)) for text in texts]
+        cached = [self.cache.get(key) for key in keys]
+
+        # First position of each uncached key, so repeated queries are embedded once
+        missing: Dict[Tuple[str, str], int] = {}
+        for i, (key, vector) in enumerate(zip(keys, cached)):
+            if vector is None:
+                missing.setdefault(key, i)
+
+        fresh: Dict[Tuple[str, str], List[float]] = {}
+        if missing:
+            embedded = self.embeddings.embed_documents([texts[i] for i in missing.values()])
+            for key, vector in zip(missing, embedded):
+                self.cache.set(key, vector)
+                fresh[key] = vector
+        return [fresh[key] if vector is None else vector for key, vector in zip(keys, cached)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents without caching."""
+        return self.embeddings.embed_documents(texts)
+
+
+class SearchResultCache:
+    """
+    Cache of similarity search results keyed on (normalized query, k).
+
+    Entries are tied to an index generation: when the ingest pipeline bumps the
+    generation marker, everything cached for the old generation is dropped.
+    Optionally, a query whose embedding is within ``similarity_threshold`` cosine
+    of a cached query's embedding is served that query's results.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        similarity_threshold: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached result lists
+            ttl_seconds: Seconds a cached result list stays valid
+            similarity_threshold: Minimum cosine similarity for near-duplicate hits
+                (None disables near-duplicate matching)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._cache = TTLCache(max_size, ttl_seconds, clock)
+        self.similarity_threshold = similarity_threshold
+        self.generation: Optional[Any] = None
+        self.semantic_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether results are cached at all."""
+        return self._cache.max_size > 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether near-duplicate query matching is enabled."""
+        return self.enabled and self.similarity_threshold is not None
+
+    def check_generation(self, generation: Any) -> None:
+        """
+        Invalidate all entries if the index generation has changed.
+
+        Args:
+            generation: Current index generation marker
+        """
+        if generation != self.generation:
+            self._cache.clear()
+            self.generation = generation
+
+    def get(self, query: str, k: int) -> Optional[List[tuple[Document, float]]]:
+        """
+        Look up results for an exact (normalized) query match.
+
+        Args:
+            query: Search query
+            k: Number of results requested
+
+        Returns:
+            Cached (document, score) list, or None on a miss
+        """
+        entry = self._cache.get((normalize_query(query), k))
+        return list(entry[2]) if entry is not None else None
+
+    def get_similar(
+        self, embedding: Sequence[float], k: int
+    ) -> Optional[List[tuple[Document, float]]]:
+        """
+        Look up results for the most similar cached query above the threshold.
+
+        Args:
+            embedding: Embedding of the incoming query
+            k: Number of results requested
+
+        Returns:
+            Cached (document, score) list, or None if no cached query is close enough
+        """
+        if not self.semantic_enabled:
+            return None
+
+        candidates = [
+            (vector, results)
+            for key_k, vector, results in self._cache.values()
+            if key_k == k and vector is not None
+        ]
+        if not candidates:
+            return None
+
+        query_vector = _unit_vector(embedding)
+        matrix = np.stack([vector for vector, _ in candidates])
+        similarities = matrix @ query_vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        self.semantic_hits += 1
+        return list(candidates[best][1])
+
+    def set(
+        self,
+        query: str,
+        k: int,
+        results: List[tuple[Document, float]],
+        embedding: Optional[Sequence[float]] = None,
+    ) -> None:
+        """
+        Store results for a query.
+
+        Args:
+            query: Search query
+            k: Number of results requested
+            results: (document, score) list to cache
+            embedding: Query embedding, kept for near-duplicate matching
+        """
+        vector = _unit_vector(embedding) if embedding is not None else None
+        self._cache.set((normalize_query(query), k), (k, vector, list(results)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters, near-duplicate hits and current size."""
+        return {
+            **self._cache.stats(),
+            "semantic_hits": self.semantic_hits,
+            "generation": self.generation,
+        }
+
+
+def _unit_vector(embedding: Sequence[float]) -> np.ndarray:
+    """Convert an embedding to a unit-length float32 array for cosine comparison."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
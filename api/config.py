@@ -2,9 +2,9 @@
 Configuration for the API.
 """
 
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -22,9 +22,21 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(..., description="OpenAI API key")
     openai_model: str = Field(default="gpt-4-turbo-preview", description="OpenAI model to use")
 
+    # Vector Store Configuration
+    vector_backend: Literal["pinecone", "local"] = Field(
+        default="pinecone", description="Vector store backend (pinecone or local)"
+    )
+    local_index_path: str = Field(
+        default="../ingest/data/local_index/ai-agent-demo-index",
+        description="Directory of the local index written by the ingest pipeline",
+    )
+    local_ivf_probes: int = Field(
+        default=4, gt=0, description="IVF partitions scanned per query on the local backend"
+    )
+
     # Pinecone Configuration
-    pinecone_api_key: str = Field(..., description="Pinecone API key")
-    pinecone_environment: str = Field(..., description="Pinecone environment")
+    pinecone_api_key: str = Field(default="", description="Pinecone API key")
+    pinecone_environment: str = Field(default="", description="Pinecone environment")
     pinecone_index_name: str = Field(
         default="ai-agent-demo-index", description="Pinecone index name"
     )
@@ -32,13 +44,69 @@ class Settings(BaseSettings):
     # Embedding Configuration
     embedding_model: str = Field(default="text-embedding-3-small", description="Embedding model")
     embedding_dimensions: int = Field(default=1536, description="Embedding dimensions")
+    embedding_cache_size: int = Field(
+        default=1024, ge=0, description="Maximum cached query embeddings (0 disables)"
+    )
+    embedding_cache_ttl_seconds: float = Field(
+        default=3600.0, gt=0, description="Seconds a cached query embedding stays valid"
+    )
 
     # RAG Configuration
     retrieval_k: int = Field(default=5, description="Number of documents to retrieve")
     score_threshold: float = Field(default=0.5, description="Minimum similarity score threshold")
+    result_cache_size: int = Field(
+        default=256, ge=0, description="Maximum cached search result lists (0 disables)"
+    )
+    result_cache_ttl_seconds: float = Field(
+        default=300.0, gt=0, description="Seconds cached search results stay valid"
+    )
+    result_cache_similarity_threshold: Optional[float] = Field(
+        default=None,
+        gt=0,
+        le=1,
+        description="Cosine similarity for serving near-duplicate queries from cache (unset disables)",
+    )
+    index_generation_check_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        description="How often to poll the ingest pipeline's index generation marker",
+    )
+    retrieval_max_concurrency: int = Field(
+        default=8, gt=0, description="Maximum concurrent blocking vector store queries"
+    )
+
+    # Routing Configuration
+    router_confidence_threshold: float = Field(
+        default=0.6,
+        ge=0,
+        le=1,
+        description="Local classifier confidence needed to skip the router LLM (1 always asks it)",
+    )
+    router_cache_size: int = Field(
+        default=512, ge=0, description="Maximum cached router LLM decisions (0 disables)"
+    )
+    router_cache_ttl_seconds: float = Field(
+        default=3600.0, gt=0, description="Seconds a cached routing decision stays valid"
+    )
 
     # Tavily Search Configuration
     tavily_api_key: Optional[str] = Field(None, description="Tavily API key for web search")
+    tavily_base_url: str = Field(
+        default="https://api.tavily.com",
+        description="Tavily API base URL (point at a stub offline)",
+    )
+    web_search_max_concurrency: int = Field(
+        default=4, gt=0, description="Maximum concurrent web searches per process"
+    )
+    web_search_timeout_seconds: float = Field(
+        default=15.0, gt=0, description="Timeout for a single web search call"
+    )
+    web_search_cache_size: int = Field(
+        default=256, ge=0, description="Maximum cached web search results (0 disables)"
+    )
+    web_search_cache_ttl_seconds: float = Field(
+        default=900.0, gt=0, description="Seconds cached web search results stay valid"
+    )
 
     # LangSmith Configuration (for observability)
     langchain_tracing_v2: bool = Field(default=True, description="Enable LangSmith tracing")
@@ -48,6 +116,19 @@ class Settings(BaseSettings):
     # Application Configuration
     debug: bool = Field(default=False, description="Debug mode")
 
+    @model_validator(mode="after")
+    def _require_pinecone_credentials(self) -> "Settings":
+        """Pinecone credentials are only needed for the Pinecone backend."""
+        if self.vector_backend == "pinecone":
+            missing = [
+                name
+                for name in ("pinecone_api_key", "pinecone_environment")
+                if not getattr(self, name)
+            ]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} required for the pinecone backend")
+        return self
+
 
 # Global settings instance
 settings = Settings()
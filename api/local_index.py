@@ -0,0 +1,176 @@
+"""
+Read-only local vector index backend for offline retrieval.
+
+Serves similarity search from the memory-mapped index files written by the ingest
+pipeline's LocalVectorIndex (see ingest/services/local_index.py for the format).
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+MANIFEST_FILE = "manifest.json"
+
+
+class LocalVectorStore:
+    """Similarity search over a local float32 matrix with an optional IVF partitioning."""
+
+    def __init__(
+        self,
+        path: str,
+        embedding: Embeddings,
+        text_key: str = "content_preview",
+        ivf_probes: int = 4,
+    ):
+        """
+        Initialize the local vector store.
+
+        Args:
+            path: Directory containing the index manifest and data files
+            embedding: Embeddings client used for queries
+            text_key: Metadata field holding the chunk text
+            ivf_probes: Number of IVF partitions to scan when the index is partitioned
+        """
+        self.path = Path(path)
+        self.embedding = embedding
+        self.text_key = text_key
+        self.ivf_probes = ivf_probes
+
+        self._lock = threading.Lock()
+        self._manifest_mtime: Optional[int] = None
+        self.generation: Optional[Any] = None
+        # (vectors, metadata rows, ivf arrays) swapped as one unit on reload
+        self._data: tuple[np.ndarray, List[Dict[str, Any]], Optional[Dict[str, np.ndarray]]] = (
+            np.zeros((0, 0), dtype=np.float32),
+            [],
+            None,
+        )
+
+        if not (self.path / MANIFEST_FILE).exists():
+            raise ValueError(
+                f"Local index '{self.path}' not found. Please run the ingestion pipeline first."
+            )
+        self._ensure_loaded()
+
+    def _ensure_loaded(self) -> None:
+        """(Re)load the index if the ingest pipeline has published a new generation."""
+        manifest_path = self.path / MANIFEST_FILE
+        mtime = os.stat(manifest_path).st_mtime_ns
+        if mtime == self._manifest_mtime:
+            return
+
+        with self._lock:
+            if mtime == self._manifest_mtime:
+                return
+
+            manifest = json.loads(manifest_path.read_text())
+            files = manifest.get("files", {})
+            count = manifest["count"]
+
+            vectors = np.zeros((0, manifest["dimension"]), dtype=np.float32)
+            rows: List[Dict[str, Any]] = []
+            if count:
+                vectors = np.memmap(
+                    self.path / files["vectors"],
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(count, manifest["dimension"]),
+                )
+                rows = json.loads((self.path / files["metadata"]).read_text())
+
+            ivf = None
+            if "ivf" in files:
+                with np.load(self.path / files["ivf"]) as arrays:
+                    ivf = {name: arrays[name] for name in ("centroids", "offsets", "order")}
+
+            self._data = (vectors, rows, ivf)
+            self.generation = manifest.get("generation")
+            self._manifest_mtime = mtime
+
+    def _candidate_rows(
+        self, query: np.ndarray, ivf: Optional[Dict[str, np.ndarray]]
+    ) -> Optional[np.ndarray]:
+        """Sorted row indices from the closest IVF partitions, or None to scan everything."""
+        if ivf is None:
+            return None
+
+        centroid_scores = ivf["centroids"] @ query
+        probes = min(self.ivf_probes, len(centroid_scores))
+        nearest = np.argpartition(-centroid_scores, probes - 1)[:probes]
+        offsets, order = ivf["offsets"], ivf["order"]
+        return np.sort(np.concatenate([order[offsets[p] : offsets[p + 1]] for p in nearest]))
+
+    def similarity_search_by_vector_with_score(
+        self, embedding: Sequence[float], k: int = 4
+    ) -> List[tuple[Document, float]]:
+        """
+        Find the k most similar chunks to an embedding.
+
+        Args:
+            embedding: Query embedding
+            k: Number of results to return
+
+        Returns:
+            List of (document, cosine similarity) tuples, best first
+        """
+        self._ensure_loaded()
+        vectors, rows, ivf = self._data
+        if not rows or k <= 0:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        candidates = self._candidate_rows(query, ivf)
+        if candidates is None:
+            candidates = np.arange(len(rows))
+            scores = vectors @ query
+        else:
+            scores = vectors[candidates] @ query
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            metadata = dict(rows[candidates[i]]["metadata"])
+            text = metadata.pop(self.text_key, "")
+            results.append((Document(page_content=text, metadata=metadata), float(scores[i])))
+        return results
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[tuple[Document, float]]:
+        """
+        Find the k most similar chunks to a query.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+
+        Returns:
+            List of (document, cosine similarity) tuples, best first
+        """
+        return self.similarity_search_by_vector_with_score(self.embedding.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """
+        Find the k most similar chunks to a query.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+
+        Returns:
+            List of documents, best first
+        """
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
@@ -3,6 +3,7 @@ AI Agent API with RAG capabilities using LangChain, LangGraph, and LangSmith.
 """
 
 import os
+from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 from fastapi import FastAPI, HTTPException
@@ -12,6 +13,7 @@ from sse_starlette.sse import EventSourceResponse
 from agent import agent
 from config import settings
 from models import ChatRequest, ChatResponse, SourceDocument, StreamChunk
+from web_search import tavily_client
 
 # Set up LangSmith tracing
 if settings.langchain_tracing_v2 and settings.langchain_api_key:
@@ -19,10 +21,19 @@ if settings.langchain_tracing_v2 and settings.langchain_api_key:
     os.environ["LANGCHAIN_API_KEY"] = settings.langchain_api_key
     os.environ["LANGCHAIN_PROJECT"] = settings.langchain_project
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close pooled outbound clients on shutdown."""
+    yield
+    await tavily_client.aclose()
+
+
 app = FastAPI(
     title="AI Agent API",
     version="0.1.0",
     description="RAG system with LangChain, LangGraph, and web search capabilities",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -56,6 +67,14 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """Routing and retrieval cache metrics."""
+    from vector_store import vector_store_service
+
+    return {"router": agent.router_stats(), "retrieval": vector_store_service.cache_stats()}
+
+
 async def generate_chat_stream(request: ChatRequest) -> AsyncIterator[str]:
     """
     Generate streaming response from the agent.
@@ -76,7 +95,9 @@ async def generate_chat_stream(request: ChatRequest) -> AsyncIterator[str]:
         messages.append({"role": "user", "content": request.message})
 
         # Stream the response
-        async for chunk in agent.astream(messages, session_id=request.session_id):
+        async for chunk in agent.astream(
+            messages, session_id=request.session_id, mode=request.routing_override
+        ):
             # Convert chunk to StreamChunk model
             stream_chunk = StreamChunk(**chunk)
 
@@ -129,7 +150,9 @@ async def chat(request: ChatRequest):
         messages.append({"role": "user", "content": request.message})
 
         # Get response from agent
-        result = await agent.ainvoke(messages, session_id=request.session_id)
+        result = await agent.ainvoke(
+            messages, session_id=request.session_id, mode=request.routing_override
+        )
 
         # Convert sources to SourceDocument models
         sources = [SourceDocument(**source) for source in result.get("sources", [])]
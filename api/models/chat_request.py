@@ -2,7 +2,7 @@
 ChatRequest Pydantic model.
 """
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -21,3 +21,14 @@ class ChatRequest(BaseModel):
         default=False,
         description="If True, activates deep research mode for comprehensive reports",
     )
+    mode: Optional[Literal["simple", "research"]] = Field(
+        default=None,
+        description="Explicit routing override; skips the router when set (takes precedence over research_mode)",
+    )
+
+    @property
+    def routing_override(self) -> Optional[str]:
+        """Routing decision requested by the client, or None to let the agent route."""
+        if self.mode is not None:
+            return self.mode
+        return "research" if self.research_mode else None
@@ -0,0 +1,205 @@
+"""
+Tiered request routing with a local classifier and decision cache ahead of the router LLM.
+"""
+
+import re
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from cache import TTLCache, normalize_query
+
+SIMPLE = "simple"
+RESEARCH = "research"
+
+# Weighted phrases mirroring the indicators in the router LLM prompt
+RESEARCH_PATTERNS: Tuple[Tuple[re.Pattern, float], ...] = tuple(
+    (re.compile(pattern), weight)
+    for pattern, weight in (
+        (r"\bcomprehensive\b", 2.0),
+        (r"\b(write|draft|create|prepare) (a |an )?(\w+ )?(report|paper|essay|review)\b", 2.5),
+        (r"\breport (on|about)\b", 2.0),
+        (r"\bdeep[- ]dive\b", 2.0),
+        (r"\bin[- ]depth\b", 1.5),
+        (r"\bcompare\b.*\bin detail\b", 2.0),
+        (r"\bresearch\b", 1.5),
+        (r"\banaly[sz](e|is)\b", 1.0),
+        (r"\b(detailed|thorough|exhaustive)\b", 1.0),
+        (r"\b(literature review|survey of|state of the art)\b", 1.5),
+        (r"\b(multiple|different) (sources|perspectives|viewpoints)\b", 1.5),
+        (r"\b(sections|outline|structured)\b", 1.0),
+        (r"\b(pros and cons|trade-?offs|implications)\b", 0.5),
+    )
+)
+
+SIMPLE_PATTERNS: Tuple[Tuple[re.Pattern, float], ...] = tuple(
+    (re.compile(pattern), weight)
+    for pattern, weight in (
+        (r"^(what|who|when|where|which) (is|are|was|were|did|does|do)\b", 2.0),
+        (r"^(who|when) \w+", 1.0),
+        (r"^(define|definition of|meaning of)\b", 2.0),
+        (r"^how (many|much|old|long)\b", 1.5),
+        (r"\bstand for\b", 1.5),
+        (r"\b(briefly|quick(ly)?|in (one|a) sentence|short answer|tl;?dr)\b", 2.0),
+    )
+)
+
+# Short messages without research cues are almost always quick questions
+SHORT_MESSAGE_WORDS = 12
+LONG_MESSAGE_WORDS = 60
+
+
+class RouteClassifier:
+    """Deterministic keyword/heuristic classifier for simple vs research requests."""
+
+    def __init__(self, confidence_threshold: float = 0.6):
+        """
+        Initialize the classifier.
+
+        Args:
+            confidence_threshold: Minimum confidence for a local decision (0-1)
+        """
+        self.confidence_threshold = confidence_threshold
+
+    @staticmethod
+    def score(message: str) -> float:
+        """
+        Score a message: positive leans research, negative leans simple.
+
+        Args:
+            message: User message
+
+        Returns:
+            Signed evidence score
+        """
+        text = normalize_query(message)
+        research = sum(weight for pattern, weight in RESEARCH_PATTERNS if pattern.search(text))
+        simple = sum(weight for pattern, weight in SIMPLE_PATTERNS if pattern.search(text))
+
+        words = len(text.split())
+        if words <= SHORT_MESSAGE_WORDS and not research:
+            simple += 1.0
+        elif words >= LONG_MESSAGE_WORDS:
+            research += 1.0
+
+        return research - simple
+
+    def classify(self, message: str) -> Tuple[str, float]:
+        """
+        Classify a message.
+
+        Args:
+            message: User message
+
+        Returns:
+            Tuple of (decision, confidence) where confidence is in [0, 1]
+        """
+        score = self.score(message)
+        decision = RESEARCH if score > 0 else SIMPLE
+        # Three points of net evidence is treated as certain
+        return decision, min(abs(score) / 3.0, 1.0)
+
+    def decide(self, message: str) -> Optional[str]:
+        """
+        Classify a message, returning None when confidence is too low to skip the LLM.
+
+        Args:
+            message: User message
+
+        Returns:
+            "simple", "research", or None
+        """
+        decision, confidence = self.classify(message)
+        return decision if confidence >= self.confidence_threshold else None
+
+
+class RouterMetrics:
+    """Thread-safe counters and latency samples for routing decisions."""
+
+    SOURCES = ("heuristic", "cache", "llm")
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize the metrics.
+
+        Args:
+            window: Number of recent latency samples kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self.decisions = {source: 0 for source in self.SOURCES}
+        self.routes = {SIMPLE: 0, RESEARCH: 0}
+        self._latencies_ms: Dict[str, Deque[float]] = {
+            source: deque(maxlen=window) for source in self.SOURCES
+        }
+
+    def record(self, source: str, decision: str, latency_seconds: float) -> None:
+        """
+        Record one routing decision.
+
+        Args:
+            source: Which tier decided ("heuristic", "cache" or "llm")
+            decision: Routing decision
+            latency_seconds: Time spent routing
+        """
+        with self._lock:
+            self.decisions[source] += 1
+            self.routes[decision] = self.routes.get(decision, 0) + 1
+            self._latencies_ms[source].append(latency_seconds * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get decision counts, LLM fallback rate and latency percentiles."""
+        with self._lock:
+            total = sum(self.decisions.values())
+            latency = {}
+            for source, samples in self._latencies_ms.items():
+                ordered = sorted(samples)
+                latency[source] = {
+                    "p50_ms": _percentile(ordered, 0.5),
+                    "p95_ms": _percentile(ordered, 0.95),
+                }
+            all_samples = sorted(s for samples in self._latencies_ms.values() for s in samples)
+            latency["all"] = {
+                "p50_ms": _percentile(all_samples, 0.5),
+                "p95_ms": _percentile(all_samples, 0.95),
+            }
+            return {
+                "total": total,
+                "decisions": dict(self.decisions),
+                "routes": dict(self.routes),
+                "llm_fallback_rate": self.decisions["llm"] / total if total else 0.0,
+                "latency": latency,
+            }
+
+
+class DecisionCache:
+    """Cache of past router LLM decisions keyed on the normalized user message."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum cached decisions (0 disables)
+            ttl_seconds: Seconds a cached decision stays valid
+        """
+        self._cache = TTLCache(max_size, ttl_seconds)
+
+    def get(self, message: str) -> Optional[str]:
+        """Look up a past decision for a message."""
+        return self._cache.get(normalize_query(message))
+
+    def set(self, message: str, decision: str) -> None:
+        """Remember a decision for a message."""
+        self._cache.set(normalize_query(message), decision)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        return self._cache.stats()
+
+
+def _percentile(ordered: list, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not ordered:
+        return None
+    index = min(int(fraction * len(ordered)), len(ordered) - 1)
+    return round(float(ordered[index]), 3)
@@ -43,6 +43,15 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
 
+    def test_metrics_endpoint(self, client):
+        """Test metrics endpoint reports router and retrieval stats."""
+        response = client.get("/api/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "llm_fallback_rate" in data["router"]
+        assert "results" in data["retrieval"]
+
     def test_features_endpoint_includes_capabilities(self, client):
         """Test that features endpoint shows all capabilities."""
         response = client.get("/")
@@ -120,6 +129,27 @@ class TestStreamingFunctionality:
             assert any(c["type"] == "token" for c in chunk_data)
             assert any(c["type"] == "done" for c in chunk_data)
 
+    @pytest.mark.asyncio
+    async def test_generate_chat_stream_passes_routing_override(self, sample_chat_request_dict):
+        """Test research_mode is forwarded to the agent as the routing mode."""
+        from main import generate_chat_stream
+
+        received = {}
+
+        async def mock_astream(messages, session_id=None, mode=None):
+            received["mode"] = mode
+            yield {"type": "done"}
+
+        mock_agent = AgentFactory.create_mock_agent()
+        mock_agent.astream = mock_astream
+        request = ChatRequest(**{**sample_chat_request_dict, "research_mode": True})
+
+        with patch("main.agent", mock_agent):
+            async for _ in generate_chat_stream(request):
+                pass
+
+        assert received["mode"] == "research"
+
     @pytest.mark.asyncio
     async def test_generate_chat_stream_handles_errors(self, sample_chat_request_dict):
         """Test chat stream handles errors gracefully."""
@@ -4,12 +4,14 @@ Test factories for creating test doubles and mock objects.
 
 from .agent_factory import AgentFactory
 from .llm_factory import LLMFactory
+from .tavily_stub_server import TavilyStubServer
 from .vector_store_factory import VectorStoreFactory
 from .vector_store_search_factory import VectorStoreSearchFactory
 
 __all__ = [
     "AgentFactory",
     "LLMFactory",
+    "TavilyStubServer",
     "VectorStoreFactory",
     "VectorStoreSearchFactory",
 ]
@@ -14,7 +14,7 @@ class AgentFactory:
         mock = AsyncMock()
 
         # Mock astream for streaming responses
-        async def mock_astream(messages, session_id=None):
+        async def mock_astream(messages, session_id=None, mode=None):
             yield {"type": "token", "content": "Test "}
             yield {"type": "token", "content": "response."}
             yield {"type": "done"}
@@ -33,7 +33,7 @@ class AgentFactory:
         """Create a mock agent that returns sources."""
         mock = AsyncMock()
 
-        async def mock_astream(messages, session_id=None):
+        async def mock_astream(messages, session_id=None, mode=None):
             yield {"type": "token", "content": "RAG "}
             yield {"type": "token", "content": "response "}
             yield {"type": "token", "content": "with sources."}
@@ -71,7 +71,7 @@ class AgentFactory:
         """Create a mock agent that raises an error."""
         mock = AsyncMock()
 
-        async def mock_error_stream(messages, session_id=None):
+        async def mock_error_stream(messages, session_id=None, mode=None):
             raise Exception("Agent processing error")
 
         mock.astream = mock_error_stream
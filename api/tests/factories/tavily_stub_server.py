@@ -0,0 +1,105 @@
+"""
+Local stub of the Tavily search API for offline tests.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class TavilyStubServer:
+    """
+    Threaded HTTP server answering POST /search like the Tavily API.
+
+    Counts requests and TCP connections (to observe keep-alive reuse), tracks the
+    peak number of in-flight requests, and can delay responses to exercise
+    timeouts and the concurrency limit. Use as a context manager; ``base_url``
+    points the client at the stub.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        """
+        Initialize the stub.
+
+        Args:
+            delay: Seconds to wait before answering each search
+        """
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queries = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running stub."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections alive between requests
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.queries.append(body["query"])
+                try:
+                    time.sleep(stub.delay)
+                    payload = json.dumps(
+                        {
+                            "query": body["query"],
+                            "results": [
+                                {
+                                    "title": f"Result for {body['query']}",
+                                    "url": "https://example.com/result",
+                                    "content": f"Stub content about {body['query']}.",
+                                    "score": 0.9,
+                                }
+                            ],
+                        }
+                    ).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out and hung up before the response was sent
+                    self.close_connection = True
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "TavilyStubServer":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
@@ -65,6 +65,21 @@ class TestChatRequest:
         req = ChatRequest(message="Research AI", research_mode=True)
         assert req.research_mode is True
 
+    def test_routing_override(self):
+        """Test research_mode and mode map to the agent's routing override."""
+        assert ChatRequest(message="Test").routing_override is None
+        assert ChatRequest(message="Test", research_mode=True).routing_override == "research"
+        assert ChatRequest(message="Test", mode="simple").routing_override == "simple"
+        assert (
+            ChatRequest(message="Test", research_mode=True, mode="simple").routing_override
+            == "simple"
+        )
+
+    def test_invalid_mode_rejected(self):
+        """Test only known routing modes are accepted."""
+        with pytest.raises(ValidationError):
+            ChatRequest(message="Test", mode="fast")
+
     def test_empty_message_validation(self):
         """Test that empty message is rejected."""
         with pytest.raises(ValidationError):
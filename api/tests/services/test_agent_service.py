@@ -3,10 +3,12 @@ Tests for agent service functionality.
 Unit tests for agent components.
 """
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 
 
 class TestAgentStateManagement:
@@ -60,10 +62,41 @@ class TestRAGAgentInitialization:
                 assert agent.tools == []
                 assert agent.graph is not None
 
+    def test_tool_llms_bound_once_at_construction(self):
+        """Test node invocations reuse the tool-bound LLMs instead of rebinding."""
+        from agent import RAGAgent
+        from tests.factories import LLMFactory
+
+        with patch("agent.ChatOpenAI") as mock_chat:
+            with patch("agent.get_available_tools", return_value=[]):
+                with patch("tools.create_web_search_tool", return_value=None):
+                    mock_llm = LLMFactory.create_mock_llm()
+                    mock_chat.return_value = mock_llm
+
+                    agent = RAGAgent()
+                    binds = mock_llm.bind_tools.call_count
+
+        state = {
+            "messages": [HumanMessage(content="Research AI")],
+            "sources": [],
+            "routing_decision": "research",
+        }
+        asyncio.run(agent._research_planner(state))
+        asyncio.run(agent._research_gatherer(state))
+        asyncio.run(agent._simple_agent(state))
+
+        assert mock_llm.bind_tools.call_count == binds
+
 
 class TestAgentRouting:
     """Tests for agent routing logic."""
 
+    @pytest.fixture(autouse=True)
+    def no_prefetch(self):
+        """Keep the speculative KB retrieval away from the real vector store."""
+        with patch("agent.RAGAgent._prefetch_retrieval", AsyncMock(return_value=[])):
+            yield
+
     @pytest.mark.asyncio
     async def test_route_request_simple(self):
         """Test routing to simple path."""
@@ -114,6 +147,111 @@ class TestAgentRouting:
 
                 assert result["routing_decision"] == "research"
 
+    @pytest.mark.asyncio
+    async def test_route_request_confident_message_skips_llm(self):
+        """Test the local classifier answers clear requests without the router LLM."""
+        from agent import RAGAgent
+        from tests.factories import LLMFactory
+
+        with patch("agent.ChatOpenAI") as mock_chat:
+            with patch("agent.get_available_tools", return_value=[]):
+                mock_llm = LLMFactory.create_mock_llm()
+                mock_router = LLMFactory.create_mock_router_llm(decision="RESEARCH")
+
+                mock_chat.side_effect = [mock_llm, mock_router]
+
+                agent = RAGAgent()
+
+                state = {
+                    "messages": [HumanMessage(content="What is RAG?")],
+                    "sources": [],
+                    "routing_decision": "simple",
+                }
+
+                result = await agent._route_request(state)
+
+                assert result["routing_decision"] == "simple"
+                mock_router.ainvoke.assert_not_called()
+                assert agent.router_stats()["decisions"]["heuristic"] == 1
+
+    @pytest.mark.asyncio
+    async def test_route_request_ambiguous_falls_back_to_llm_once(self):
+        """Test ambiguous requests ask the router LLM and reuse its cached decision."""
+        from agent import RAGAgent
+        from tests.factories import LLMFactory
+
+        with patch("agent.ChatOpenAI") as mock_chat:
+            with patch("agent.get_available_tools", return_value=[]):
+                mock_llm = LLMFactory.create_mock_llm()
+                mock_router = LLMFactory.create_mock_router_llm(decision="RESEARCH")
+
+                mock_chat.side_effect = [mock_llm, mock_router]
+
+                agent = RAGAgent()
+
+                message = "Tell me about transformers and how attention works in modern models"
+                for _ in range(2):
+                    state = {
+                        "messages": [HumanMessage(content=message)],
+                        "sources": [],
+                        "routing_decision": "simple",
+                    }
+                    result = await agent._route_request(state)
+                    assert result["routing_decision"] == "research"
+
+                mock_router.ainvoke.assert_called_once()
+                stats = agent.router_stats()
+                assert stats["decisions"]["llm"] == 1
+                assert stats["decisions"]["cache"] == 1
+                assert stats["llm_fallback_rate"] == 0.5
+
+    @pytest.mark.parametrize(
+        "decision,entry",
+        [("research", "research"), ("simple", "simple"), (None, "router")],
+    )
+    def test_entry_point_skips_router_when_mode_given(self, decision, entry):
+        """Test the graph starts at the requested path when a mode is supplied."""
+        from agent import RAGAgent
+
+        state = {"messages": [], "sources": []}
+        if decision:
+            state["routing_decision"] = decision
+
+        assert RAGAgent._select_entry(state) == entry
+
+    @pytest.mark.asyncio
+    async def test_astream_with_mode_announces_step_without_router(self):
+        """Test an explicit mode is streamed as the step and the router LLM is not called."""
+        from agent import RAGAgent
+        from tests.factories import LLMFactory
+
+        with patch("agent.ChatOpenAI") as mock_chat:
+            with patch("agent.get_available_tools", return_value=[]):
+                mock_llm = LLMFactory.create_mock_llm()
+                mock_router = LLMFactory.create_mock_router_llm()
+                mock_chat.side_effect = [mock_llm, mock_router]
+
+                agent = RAGAgent()
+
+                captured = {}
+
+                async def fake_events(initial_state, version, config=None):
+                    captured["state"] = initial_state
+                    return
+                    yield
+
+                agent.graph = MagicMock()
+                agent.graph.astream_events = fake_events
+
+                chunks = [
+                    c
+                    async for c in agent.astream([{"role": "user", "content": "Hi"}], mode="simple")
+                ]
+
+                assert chunks[0] == {"type": "step", "content": "simple"}
+                assert captured["state"]["routing_decision"] == "simple"
+                mock_router.ainvoke.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_route_request_no_user_message(self):
         """Test routing with no user message."""
@@ -290,6 +428,220 @@ class TestSimpleRAG:
                     assert result["sources"] == []
 
 
+class TestSpeculativeRetrieval:
+    """Tests for KB retrieval overlapping with routing."""
+
+    CONFIG = {"configurable": {"thread_id": "run-1"}}
+
+    @staticmethod
+    def _agent(router_delay=0.0):
+        """Create an agent whose router LLM takes router_delay seconds to answer."""
+        from agent import RAGAgent
+        from tests.factories import LLMFactory
+
+        with patch("agent.ChatOpenAI") as mock_chat:
+            with patch("agent.get_available_tools", return_value=[]):
+                mock_router = LLMFactory.create_mock_router_llm(decision="SIMPLE")
+
+                async def slow_route(*args, **kwargs):
+                    await asyncio.sleep(router_delay)
+                    return AIMessage(content="SIMPLE")
+
+                mock_router.ainvoke = AsyncMock(side_effect=slow_route)
+                mock_chat.side_effect = [LLMFactory.create_mock_llm(), mock_router]
+                return RAGAgent()
+
+    @pytest.mark.asyncio
+    async def test_routing_and_retrieval_overlap(self):
+        """Test simple-path latency is max(routing, retrieval), not the sum."""
+        from tests.factories import VectorStoreFactory
+
+        agent = self._agent(router_delay=0.2)
+        mock_vector_store = VectorStoreFactory.create_mock_vector_store()
+        docs = await mock_vector_store.similarity_search_with_score("q")
+
+        async def slow_search(query, k=None):
+            await asyncio.sleep(0.2)
+            return docs
+
+        mock_vector_store.similarity_search_with_score = AsyncMock(side_effect=slow_search)
+
+        with patch("vector_store.vector_store_service", mock_vector_store):
+            # No routing indicators, so the router LLM is consulted
+            message = "Tell me about transformers and how attention works in modern models"
+            state = {"messages": [HumanMessage(content=message)], "sources": []}
+
+            start = time.perf_counter()
+            state = await agent._route_request(state, self.CONFIG)
+            result = await agent._simple_rag(state, self.CONFIG)
+            elapsed = time.perf_counter() - start
+
+        assert state["routing_decision"] == "simple"
+        assert len(result["sources"]) > 0
+        # The task stays outside graph state
+        assert not any(isinstance(value, asyncio.Task) for value in state.values())
+        assert "prefetched" not in result
+        assert agent._prefetches == {}
+        assert elapsed < 0.35
+        mock_vector_store.similarity_search_with_score.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_prefetch_falls_back_to_direct_retrieval(self):
+        """Test the simple path retrieves again when the speculative search failed."""
+        from tests.factories import VectorStoreFactory
+
+        agent = self._agent()
+        mock_vector_store = VectorStoreFactory.create_mock_vector_store()
+        docs = await mock_vector_store.similarity_search_with_score("q")
+        mock_vector_store.similarity_search_with_score = AsyncMock(
+            side_effect=[Exception("timeout"), docs]
+        )
+
+        with patch("vector_store.vector_store_service", mock_vector_store):
+            state = {"messages": [HumanMessage(content="What is RAG?")], "sources": []}
+            state = await agent._route_request(state, self.CONFIG)
+            result = await agent._simple_rag(state, self.CONFIG)
+
+        assert len(result["sources"]) > 0
+        assert mock_vector_store.similarity_search_with_score.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_research_gatherer_keeps_warm_context(self):
+        """Test prefetched KB results join the conversation and reach later iterations."""
+        from tests.factories import VectorStoreFactory
+
+        agent = self._agent()
+        docs = await VectorStoreFactory.create_mock_vector_store().similarity_search_with_score("q")
+        prefetch = asyncio.get_running_loop().create_future()
+        prefetch.set_result(docs)
+        agent._prefetches["run-1"] = prefetch
+
+        with patch("tools.create_web_search_tool", return_value=None):
+            messages = [HumanMessage(content="Write a comprehensive report on RAG")]
+            state = {"messages": messages, "sources": [], "routing_decision": "research"}
+            first = await agent._research_gatherer(state, self.CONFIG)
+            first_sent = agent.llm.ainvoke.call_args[0][0]
+            state = {**state, "messages": messages + first["messages"]}
+            await agent._research_gatherer(state, self.CONFIG)
+            second_sent = agent.llm.ainvoke.call_args[0][0]
+
+        warm_context = first["messages"][0]
+        assert isinstance(warm_context, SystemMessage)
+        assert "ALREADY RETRIEVED" in warm_context.content
+        assert "rag-guide.md" in warm_context.content
+        assert first_sent[-1] is warm_context
+        # Later iterations see the context from the conversation, not injected again,
+        # and still get the gatherer's own instructions
+        assert [m for m in second_sent if "ALREADY RETRIEVED" in str(m.content)] == [warm_context]
+        assert "Research Gathering Agent" in second_sent[0].content
+        assert "prefetched" not in first
+
+    @pytest.mark.asyncio
+    async def test_unconsumed_prefetch_is_cancelled_after_the_run(self):
+        """Test a run that never reaches a retrieval node does not leak its prefetch task."""
+        agent = self._agent()
+        started = asyncio.Event()
+
+        async def never_finishes(user_message):
+            started.set()
+            await asyncio.sleep(3600)
+
+        async def route_then_fail(initial_state, config=None):
+            with patch.object(agent, "_prefetch_retrieval", never_finishes):
+                await agent._route_request(initial_state, config)
+            await started.wait()
+            raise RuntimeError("graph failed")
+
+        agent.graph = MagicMock()
+        agent.graph.ainvoke = route_then_fail
+
+        with pytest.raises(RuntimeError):
+            await agent.ainvoke([{"role": "user", "content": "What is RAG?"}])
+
+        assert agent._prefetches == {}
+
+
+class TestToolExecution:
+    """Tests for the tool execution node."""
+
+    @staticmethod
+    def _agent():
+        from agent import RAGAgent
+        from tests.factories import LLMFactory
+
+        with patch("agent.ChatOpenAI") as mock_chat:
+            mock_chat.return_value = LLMFactory.create_mock_llm()
+            return RAGAgent()
+
+    @pytest.mark.asyncio
+    async def test_kb_calls_are_batched(self, mock_env_vars):
+        """Test several KB searches in one message run as one batch, in call order."""
+        agent = self._agent()
+        message = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "search_knowledge_base", "args": {"query": "a"}, "id": "kb-1"},
+                {"name": "research_topic_breakdown", "args": {"topic": "RAG"}, "id": "plan-1"},
+                {"name": "search_knowledge_base", "args": {"query": "b"}, "id": "kb-2"},
+            ],
+        )
+        batch = AsyncMock(return_value=["result a", "result b"])
+        plan_result = ToolMessage(content="plan", tool_call_id="plan-1")
+        agent.tool_node = MagicMock()
+        agent.tool_node.ainvoke = AsyncMock(return_value={"messages": [plan_result]})
+
+        with patch("tools.search_knowledge_base_batch", batch):
+            result = await agent._execute_tools({"messages": [message]})
+
+        batch.assert_awaited_once_with(["a", "b"])
+        # Only the non-KB call goes through the regular ToolNode
+        sent = agent.tool_node.ainvoke.call_args[0][0]["messages"][0]
+        assert [call["id"] for call in sent.tool_calls] == ["plan-1"]
+        ids = [m.tool_call_id for m in result["messages"]]
+        assert ids == ["kb-1", "plan-1", "kb-2"]
+        assert result["messages"][0].content == "result a"
+
+    @pytest.mark.asyncio
+    async def test_failed_kb_batch_returns_error_tool_messages(self, mock_env_vars):
+        """Test a failing KB batch answers each KB call with an error instead of raising."""
+        agent = self._agent()
+        message = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "search_knowledge_base", "args": {"query": "a"}, "id": "kb-1"},
+                {"name": "search_knowledge_base", "args": {"query": "b"}, "id": "kb-2"},
+            ],
+        )
+        batch = AsyncMock(side_effect=RuntimeError("index unavailable"))
+
+        with patch("tools.search_knowledge_base_batch", batch):
+            result = await agent._execute_tools({"messages": [message]})
+
+        assert [m.tool_call_id for m in result["messages"]] == ["kb-1", "kb-2"]
+        for tool_message in result["messages"]:
+            assert tool_message.status == "error"
+            assert "index unavailable" in tool_message.content
+
+    @pytest.mark.asyncio
+    async def test_astream_reports_batch_latency_step(self, mock_env_vars):
+        """Test KB batch events are streamed as step chunks."""
+        agent = self._agent()
+
+        async def fake_events(initial_state, version, config=None):
+            yield {
+                "event": "on_custom_event",
+                "name": "kb_batch",
+                "data": {"queries": 3, "latency_ms": 412.3},
+            }
+
+        agent.graph = MagicMock()
+        agent.graph.astream_events = fake_events
+
+        chunks = [c async for c in agent.astream([{"role": "user", "content": "Hi"}])]
+
+        assert {"type": "step", "step": "Knowledge base batch: 3 queries in 412 ms"} in chunks
+
+
 class TestResearchPlanner:
     """Tests for research planner functionality."""
 
@@ -0,0 +1,181 @@
+"""
+Tests for the retrieval-layer caches.
+Testing LRU/TTL eviction, counters, and query embedding caching.
+"""
+
+from unittest.mock import MagicMock
+
+from langchain_core.documents import Document
+
+from cache import CachedQueryEmbeddings, SearchResultCache, TTLCache, normalize_query
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for the TTL/LRU cache."""
+
+    def test_get_returns_stored_value_and_counts_hit(self):
+        """Test a stored value is returned and counted as a hit."""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        """Test entries are treated as misses once their TTL elapses."""
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl_seconds=30, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 29
+        assert cache.get("a") == 1
+
+        clock.now = 31
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_zero_size_disables_cache(self):
+        """Test a zero-size cache never stores anything."""
+        cache = TTLCache(max_size=0, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+
+
+class TestCachedQueryEmbeddings:
+    """Tests for the query embedding cache wrapper."""
+
+    def test_repeated_query_is_embedded_once(self):
+        """Test repeated and trivially reworded queries hit the cache."""
+        inner = MagicMock()
+        inner.embed_query.return_value = [0.1, 0.2]
+        embeddings = CachedQueryEmbeddings(
+            inner, model="text-embedding-3-small", cache=TTLCache(10, 60)
+        )
+
+        first = embeddings.embed_query("What is RAG?")
+        second = embeddings.embed_query("  what   is rag? ")
+
+        assert first == second == [0.1, 0.2]
+        inner.embed_query.assert_called_once_with("What is RAG?")
+        assert embeddings.cache.stats()["hits"] == 1
+
+    def test_cache_key_includes_model(self):
+        """Test the same query under a different model is not shared."""
+        cache = TTLCache(10, 60)
+        small = MagicMock()
+        small.embed_query.return_value = [0.1]
+        large = MagicMock()
+        large.embed_query.return_value = [0.9]
+
+        CachedQueryEmbeddings(small, model="small", cache=cache).embed_query("RAG")
+        result = CachedQueryEmbeddings(large, model="large", cache=cache).embed_query("RAG")
+
+        assert result == [0.9]
+        large.embed_query.assert_called_once()
+
+    def test_embed_queries_batches_uncached_queries(self):
+        """Test a batch sends only uncached, de-duplicated queries in one request."""
+        inner = MagicMock()
+        inner.embed_query.return_value = [0.0]
+        inner.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        embeddings = CachedQueryEmbeddings(inner, model="m", cache=TTLCache(10, 60))
+        embeddings.embed_query("cached")
+
+        vectors = embeddings.embed_queries(["cached", "new one", "New  one", "other"])
+
+        assert vectors == [[0.0], [7.0], [7.0], [5.0]]
+        inner.embed_documents.assert_called_once_with(["new one", "other"])
+        assert embeddings.embed_query("other") == [5.0]
+
+    def test_documents_are_not_cached(self):
+        """Test document embedding passes straight through."""
+        inner = MagicMock()
+        inner.embed_documents.return_value = [[0.1], [0.2]]
+        embeddings = CachedQueryEmbeddings(inner, model="m", cache=TTLCache(10, 60))
+
+        assert embeddings.embed_documents(["a", "b"]) == [[0.1], [0.2]]
+        assert len(embeddings.cache) == 0
+
+    def test_normalize_query(self):
+        """Test normalization collapses whitespace and case."""
+        assert normalize_query("  What\tIs\nRAG ") == "what is rag"
+
+
+class TestSearchResultCache:
+    """Tests for the search result cache."""
+
+    @staticmethod
+    def _results():
+        return [(Document(page_content="RAG combines retrieval with generation."), 0.9)]
+
+    def test_exact_query_hit(self):
+        """Test results are returned for the same normalized query and k."""
+        cache = SearchResultCache(max_size=10, ttl_seconds=60)
+        cache.set("What is RAG?", 5, self._results())
+
+        assert cache.get("what is  RAG?", 5) == self._results()
+        assert cache.get("What is RAG?", 3) is None
+
+    def test_generation_change_invalidates(self):
+        """Test a new index generation drops all cached results."""
+        cache = SearchResultCache(max_size=10, ttl_seconds=60)
+        cache.check_generation(1)
+        cache.set("What is RAG?", 5, self._results())
+
+        cache.check_generation(1)
+        assert cache.get("What is RAG?", 5) is not None
+
+        cache.check_generation(2)
+        assert cache.get("What is RAG?", 5) is None
+        assert cache.stats()["generation"] == 2
+
+    def test_near_duplicate_query_above_threshold(self):
+        """Test a query with a near-identical embedding is served from cache."""
+        cache = SearchResultCache(max_size=10, ttl_seconds=60, similarity_threshold=0.95)
+        cache.set("What is RAG?", 5, self._results(), embedding=[1.0, 0.0, 0.0])
+
+        assert cache.get_similar([0.99, 0.05, 0.0], 5) == self._results()
+        assert cache.get_similar([0.99, 0.05, 0.0], 3) is None
+        assert cache.get_similar([0.0, 1.0, 0.0], 5) is None
+        assert cache.stats()["semantic_hits"] == 1
+
+    def test_near_duplicate_matching_disabled_by_default(self):
+        """Test near-duplicate lookups are skipped without a threshold."""
+        cache = SearchResultCache(max_size=10, ttl_seconds=60)
+        cache.set("What is RAG?", 5, self._results(), embedding=[1.0, 0.0])
+
+        assert not cache.semantic_enabled
+        assert cache.get_similar([1.0, 0.0], 5) is None
+
+    def test_zero_size_disables_cache(self):
+        """Test a zero-size result cache reports itself disabled."""
+        assert not SearchResultCache(max_size=0, ttl_seconds=60).enabled
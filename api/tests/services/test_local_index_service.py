@@ -0,0 +1,98 @@
+"""
+Tests for LocalVectorStore.
+Testing search over the ingest pipeline's local index files and reloads.
+"""
+
+import json
+import os
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from local_index import LocalVectorStore
+
+
+def write_index(path, vectors, generation=1, ivf=None):
+    """Write index files in the ingest pipeline's local format."""
+    path.mkdir(parents=True, exist_ok=True)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    files = {"vectors": f"vectors-{generation}.f32", "metadata": f"metadata-{generation}.json"}
+    vectors.tofile(path / files["vectors"])
+    rows = [
+        {"id": f"chunk-{i}", "metadata": {"content_preview": f"text {i}", "chunk_index": i}}
+        for i in range(len(vectors))
+    ]
+    (path / files["metadata"]).write_text(json.dumps(rows))
+    if ivf is not None:
+        files["ivf"] = f"ivf-{generation}.npz"
+        np.savez(path / files["ivf"], **ivf)
+    manifest = {
+        "dimension": vectors.shape[1],
+        "count": len(vectors),
+        "generation": generation,
+        "files": files,
+    }
+    (path / "manifest.json").write_text(json.dumps(manifest))
+
+
+class TestLocalVectorStore:
+    """Tests for the read-only local vector store."""
+
+    def test_missing_index_raises(self, tmp_path):
+        """Test a clear error when the ingest pipeline has not written the index."""
+        with pytest.raises(ValueError, match="not found"):
+            LocalVectorStore(str(tmp_path / "missing"), embedding=MagicMock())
+
+    def test_returns_top_k_by_cosine_similarity(self, tmp_path):
+        """Test results are ordered best first with text taken from metadata."""
+        write_index(tmp_path, [[1, 0, 0], [0, 1, 0], [1, 1, 0]])
+        store = LocalVectorStore(str(tmp_path), embedding=MagicMock())
+
+        results = store.similarity_search_by_vector_with_score([1.0, 0.1, 0.0], k=2)
+
+        assert [doc.page_content for doc, _ in results] == ["text 0", "text 2"]
+        assert results[0][1] > results[1][1]
+        assert "content_preview" not in results[0][0].metadata
+        assert results[0][0].metadata["chunk_index"] == 0
+
+    def test_query_text_is_embedded(self, tmp_path):
+        """Test text queries go through the embeddings client."""
+        write_index(tmp_path, [[1, 0], [0, 1]])
+        embedding = MagicMock()
+        embedding.embed_query.return_value = [0.0, 1.0]
+        store = LocalVectorStore(str(tmp_path), embedding=embedding)
+
+        docs = store.similarity_search("second", k=1)
+
+        assert [doc.page_content for doc in docs] == ["text 1"]
+        embedding.embed_query.assert_called_once_with("second")
+
+    def test_ivf_scans_only_probed_partitions(self, tmp_path):
+        """Test only rows in the closest partitions are candidates."""
+        ivf = {
+            "centroids": np.array([[1, 0], [0, 1]], dtype=np.float32),
+            "offsets": np.array([0, 2, 4], dtype=np.int32),
+            "order": np.array([0, 1, 2, 3], dtype=np.int32),
+        }
+        write_index(tmp_path, [[1, 0], [1, 0.2], [0, 1], [0.2, 1]], ivf=ivf)
+        store = LocalVectorStore(str(tmp_path), embedding=MagicMock(), ivf_probes=1)
+
+        results = store.similarity_search_by_vector_with_score([0.1, 1.0], k=4)
+
+        assert sorted(doc.page_content for doc, _ in results) == ["text 2", "text 3"]
+
+    def test_reloads_new_generation(self, tmp_path):
+        """Test a newly published manifest is picked up on the next search."""
+        write_index(tmp_path, [[1, 0]], generation=1)
+        store = LocalVectorStore(str(tmp_path), embedding=MagicMock())
+
+        write_index(tmp_path, [[1, 0], [0, 1]], generation=2)
+        stat = os.stat(tmp_path / "manifest.json")
+        os.utime(tmp_path / "manifest.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        results = store.similarity_search_by_vector_with_score([0.0, 1.0], k=1)
+
+        assert store.generation == 2
+        assert results[0][0].page_content == "text 1"
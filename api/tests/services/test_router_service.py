@@ -0,0 +1,88 @@
+"""
+Tests for the tiered router.
+Testing the heuristic classifier, decision cache and routing metrics.
+"""
+
+import pytest
+
+from router import DecisionCache, RouteClassifier, RouterMetrics
+
+
+class TestRouteClassifier:
+    """Tests for the local heuristic classifier."""
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "What is RAG?",
+            "Who invented the transformer?",
+            "Define embeddings",
+            "What does LLM stand for?",
+            "Briefly explain vector databases",
+        ],
+    )
+    def test_confident_simple(self, message):
+        """Test direct questions are routed simple without the LLM."""
+        assert RouteClassifier().decide(message) == "simple"
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "Write a comprehensive report on AI safety",
+            "Do a deep dive into retrieval augmented generation",
+            "Compare vector databases in detail with multiple perspectives",
+            "Research the state of the art in agents and write a report",
+        ],
+    )
+    def test_confident_research(self, message):
+        """Test explicit research requests are routed research without the LLM."""
+        assert RouteClassifier().decide(message) == "research"
+
+    def test_ambiguous_message_defers_to_llm(self):
+        """Test a message without clear indicators returns no local decision."""
+        message = "Tell me about transformers and how attention works in modern language models"
+
+        assert RouteClassifier().decide(message) is None
+
+    def test_threshold_of_one_always_defers(self):
+        """Test a confidence threshold of 1 sends weak cases to the LLM."""
+        assert RouteClassifier(confidence_threshold=1.0).decide("Explain RAG") is None
+
+
+class TestDecisionCache:
+    """Tests for the routing decision cache."""
+
+    def test_normalized_message_hit(self):
+        """Test decisions are shared across whitespace and case differences."""
+        cache = DecisionCache(max_size=10, ttl_seconds=60)
+        cache.set("Tell me about RAG", "research")
+
+        assert cache.get("  tell me ABOUT rag") == "research"
+        assert cache.get("Tell me about agents") is None
+
+
+class TestRouterMetrics:
+    """Tests for routing metrics."""
+
+    def test_fallback_rate_and_latency(self):
+        """Test LLM fallback rate and latency percentiles are reported."""
+        metrics = RouterMetrics()
+        metrics.record("heuristic", "simple", 0.0001)
+        metrics.record("heuristic", "research", 0.0002)
+        metrics.record("cache", "simple", 0.0001)
+        metrics.record("llm", "research", 0.4)
+
+        stats = metrics.stats()
+
+        assert stats["total"] == 4
+        assert stats["llm_fallback_rate"] == 0.25
+        assert stats["routes"] == {"simple": 2, "research": 2}
+        assert stats["latency"]["llm"]["p50_ms"] == 400.0
+        assert stats["latency"]["cache"]["p95_ms"] == 0.1
+
+    def test_empty_stats(self):
+        """Test stats with no decisions recorded."""
+        stats = RouterMetrics().stats()
+
+        assert stats["llm_fallback_rate"] == 0.0
+        assert stats["latency"]["all"]["p50_ms"] is None
@@ -43,6 +43,38 @@ class TestKnowledgeBaseSearchTool:
             assert "No relevant information found" in result
 
 
+class TestKnowledgeBaseBatchSearch:
+    """Tests for batched knowledge base searches."""
+
+    @pytest.mark.asyncio
+    async def test_batch_dedupes_chunks_across_queries(self):
+        """Test each chunk gets one KB number across the batch."""
+        from langchain_core.documents import Document
+
+        from tools import search_knowledge_base_batch
+
+        shared = Document(
+            id="chunk-1", page_content="RAG basics.", metadata={"file_name": "rag.md"}
+        )
+        other = Document(id="chunk-2", page_content="Vector DBs.", metadata={"file_name": "db.md"})
+        mock_vector_store = VectorStoreFactory.create_mock_vector_store()
+        mock_vector_store.batch_similarity_search_with_score.return_value = [
+            [(shared, 0.9)],
+            [(shared, 0.8), (other, 0.7)],
+        ]
+
+        with patch("tools.vector_store_service", mock_vector_store):
+            first, second = await search_knowledge_base_batch(["What is RAG?", "Vector DBs?"])
+
+        assert "[KB-1] rag.md" in first and "RAG basics." in first
+        assert (
+            '[KB-1] rag.md\nFull text given as [KB-1] in the results for "What is RAG?"' in second
+        )
+        assert "RAG basics." not in second
+        assert "[KB-2] db.md" in second
+        mock_vector_store.batch_similarity_search_with_score.assert_called_once()
+
+
 class TestResearchTools:
     """Tests for research-related tools."""
 
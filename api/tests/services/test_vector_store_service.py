@@ -3,6 +3,9 @@ Tests for VectorStoreService.
 Testing vector store interactions and search functionality.
 """
 
+import asyncio
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -42,6 +45,19 @@ class TestVectorStoreServiceInitialization:
         assert service.index_name == "test-index"
         assert service._vectorstore is None
 
+    def test_query_embeddings_are_cached(self, mock_env_vars, mock_pinecone, mock_embeddings):
+        """Test the service embeds repeated queries only once."""
+        from vector_store import VectorStoreService
+
+        mock_embeddings.return_value.embed_query.return_value = [0.1, 0.2]
+
+        service = VectorStoreService()
+        service.embeddings.embed_query("What is RAG?")
+        service.embeddings.embed_query("What is RAG?")
+
+        mock_embeddings.return_value.embed_query.assert_called_once()
+        assert service.cache_stats()["embeddings"]["hits"] == 1
+
     def test_vectorstore_property(
         self, mock_env_vars, mock_pinecone, mock_embeddings, mock_langchain_pinecone
     ):
@@ -58,6 +74,249 @@ class TestVectorStoreServiceInitialization:
         mock_langchain_pinecone.assert_called_once()
 
 
+class TestVectorStoreServiceSearch:
+    """Tests for non-blocking similarity search."""
+
+    @pytest.fixture
+    def service(self, mock_env_vars):
+        """Vector store service with Pinecone and embeddings mocked out."""
+        with patch("vector_store.Pinecone"), patch("vector_store.OpenAIEmbeddings"):
+            from vector_store import VectorStoreService
+
+            yield VectorStoreService()
+
+    @pytest.mark.asyncio
+    async def test_search_runs_off_event_loop_thread(self, service):
+        """Test blocking Pinecone calls run on the retrieval pool, not the loop thread."""
+        call_threads = []
+
+        def blocking_search(query, k):
+            call_threads.append(threading.current_thread())
+            return [("doc", 0.9)]
+
+        service._vectorstore = MagicMock()
+        service._vectorstore.similarity_search_with_score.side_effect = blocking_search
+
+        results = await service.similarity_search_with_score("What is RAG?", k=3)
+
+        assert results == [("doc", 0.9)]
+        assert call_threads[0] is not threading.current_thread()
+        service._vectorstore.similarity_search_with_score.assert_called_once_with(
+            "What is RAG?", k=3
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_overlap(self, service):
+        """Test slow searches overlap instead of serializing on the event loop."""
+
+        def slow_search(query, k):
+            time.sleep(0.2)
+            return []
+
+        service._vectorstore = MagicMock()
+        service._vectorstore.similarity_search_with_score.side_effect = slow_search
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(service.similarity_search_with_score(f"query {i}") for i in range(4))
+        )
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.6
+
+    @pytest.mark.asyncio
+    async def test_similarity_search_uses_default_k(self, service):
+        """Test similarity_search falls back to settings.retrieval_k."""
+        service._vectorstore = MagicMock()
+        service._vectorstore.similarity_search.return_value = ["doc"]
+
+        results = await service.similarity_search("What is RAG?")
+
+        assert results == ["doc"]
+        service._vectorstore.similarity_search.assert_called_once_with("What is RAG?", k=5)
+
+
+class TestVectorStoreServiceResultCache:
+    """Tests for search result caching and index generation invalidation."""
+
+    @pytest.fixture
+    def mock_pinecone(self):
+        """Mock Pinecone client whose generation marker can be changed by tests."""
+        with patch("vector_store.Pinecone") as mock:
+            yield mock
+
+    @pytest.fixture
+    def service(self, mock_env_vars, mock_pinecone):
+        """Vector store service with a stub vector store."""
+        with patch("vector_store.OpenAIEmbeddings"):
+            from vector_store import VectorStoreService
+
+            service = VectorStoreService()
+            service._vectorstore = MagicMock()
+            service._vectorstore.similarity_search_with_score.return_value = [("doc", 0.9)]
+            yield service
+
+    @staticmethod
+    def _set_generation(mock_pinecone, generation):
+        marker = MagicMock()
+        marker.metadata = {"generation": generation}
+        fetch = mock_pinecone.return_value.Index.return_value.fetch
+        fetch.return_value.vectors = {"index-generation": marker}
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self, service, mock_pinecone):
+        """Test an identical (query, k) pair hits Pinecone only once."""
+        self._set_generation(mock_pinecone, 1)
+
+        first = await service.similarity_search_with_score("What is RAG?", k=3)
+        second = await service.similarity_search_with_score("What is RAG?", k=3)
+
+        assert first == second == [("doc", 0.9)]
+        service._vectorstore.similarity_search_with_score.assert_called_once()
+        assert service.cache_stats()["results"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_generation_bump_invalidates_results(self, service, mock_pinecone):
+        """Test results are re-fetched after the ingest pipeline bumps the generation."""
+        self._set_generation(mock_pinecone, 1)
+        await service.similarity_search_with_score("What is RAG?", k=3)
+
+        self._set_generation(mock_pinecone, 2)
+        service._generation_checked_at = None  # Force the next poll
+        await service.similarity_search_with_score("What is RAG?", k=3)
+
+        assert service._vectorstore.similarity_search_with_score.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_embeds_each_query_once(self, service, mock_pinecone):
+        """Test near-duplicate matching reuses its query embedding for the search."""
+        self._set_generation(mock_pinecone, 1)
+        service.result_cache.similarity_threshold = 0.95
+        service.embedding_cache.max_size = 0
+        service.embeddings.embeddings.embed_query.return_value = [1.0, 0.0]
+        service._vectorstore.similarity_search_by_vector_with_score.return_value = [("doc", 0.9)]
+
+        results = await service.similarity_search_with_score("What is RAG?", k=3)
+
+        assert results == [("doc", 0.9)]
+        service.embeddings.embeddings.embed_query.assert_called_once()
+        service._vectorstore.similarity_search_by_vector_with_score.assert_called_once_with(
+            [1.0, 0.0], k=3
+        )
+        service._vectorstore.similarity_search_with_score.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_results_searched_before_invalidation_are_not_cached(
+        self, service, mock_pinecone
+    ):
+        """Test a search that straddles a generation bump does not repopulate the cache."""
+        self._set_generation(mock_pinecone, 1)
+
+        def search_during_reingest(query, k):
+            service.result_cache.check_generation(2)
+            return [("old", 0.9)]
+
+        service._vectorstore.similarity_search_with_score.side_effect = search_during_reingest
+        results = await service.similarity_search_with_score("What is RAG?", k=3)
+
+        assert results == [("old", 0.9)]
+        assert service.result_cache.get("What is RAG?", 3) is None
+
+    @pytest.mark.asyncio
+    async def test_marker_read_failure_keeps_cache(self, service, mock_pinecone):
+        """Test a failed marker read does not invalidate or break searches."""
+        self._set_generation(mock_pinecone, 1)
+        await service.similarity_search_with_score("What is RAG?", k=3)
+
+        mock_pinecone.return_value.Index.return_value.fetch.side_effect = Exception("down")
+        service._generation_checked_at = None
+        results = await service.similarity_search_with_score("What is RAG?", k=3)
+
+        assert results == [("doc", 0.9)]
+        service._vectorstore.similarity_search_with_score.assert_called_once()
+
+
+class TestVectorStoreServiceBatchSearch:
+    """Tests for batched multi-query search."""
+
+    @pytest.fixture
+    def service(self, mock_env_vars):
+        """Vector store service with stub embeddings and vector store."""
+        with patch("vector_store.Pinecone"), patch("vector_store.OpenAIEmbeddings") as mock_emb:
+            from vector_store import VectorStoreService
+
+            mock_emb.return_value.embed_documents.side_effect = lambda texts: [
+                [float(i), 1.0] for i in range(len(texts))
+            ]
+            service = VectorStoreService()
+            service._generation_checked_at = time.monotonic()
+            service._vectorstore = MagicMock()
+            service._vectorstore.similarity_search_by_vector_with_score.side_effect = (
+                lambda embedding, k: [(f"doc-{embedding[0]:.0f}", 0.9)]
+            )
+            yield service, mock_emb.return_value
+
+    @pytest.mark.asyncio
+    async def test_one_embedding_request_per_batch(self, service):
+        """Test all queries are embedded together and searched by vector."""
+        service, embeddings = service
+
+        results = await service.batch_similarity_search_with_score(["a", "b", "c"], k=2)
+
+        assert results == [[("doc-0", 0.9)], [("doc-1", 0.9)], [("doc-2", 0.9)]]
+        embeddings.embed_documents.assert_called_once_with(["a", "b", "c"])
+        embeddings.embed_query.assert_not_called()
+        assert service._vectorstore.similarity_search_by_vector_with_score.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_cached_queries_skip_embedding_and_search(self, service):
+        """Test queries already in the result cache are not re-embedded or searched."""
+        service, embeddings = service
+        service.result_cache.set("a", 2, [("cached", 1.0)])
+
+        results = await service.batch_similarity_search_with_score(["a", "b"], k=2)
+
+        assert results[0] == [("cached", 1.0)]
+        embeddings.embed_documents.assert_called_once_with(["b"])
+        assert service._vectorstore.similarity_search_by_vector_with_score.call_count == 1
+
+
+class TestVectorStoreServiceLocalBackend:
+    """Tests for the local index backend."""
+
+    @pytest.fixture
+    def service(self, mock_env_vars, monkeypatch, tmp_path):
+        """Vector store service pointed at an empty local index."""
+        from config import settings
+
+        (tmp_path / "manifest.json").write_text(
+            '{"dimension": 2, "count": 0, "generation": 7, "files": {}}'
+        )
+        monkeypatch.setattr(settings, "vector_backend", "local")
+        monkeypatch.setattr(settings, "local_index_path", str(tmp_path))
+        with (
+            patch("vector_store.Pinecone") as mock_pinecone,
+            patch("vector_store.OpenAIEmbeddings"),
+        ):
+            from vector_store import VectorStoreService
+
+            yield VectorStoreService()
+            mock_pinecone.assert_not_called()
+
+    def test_vectorstore_is_local(self, service):
+        """Test the local backend needs no Pinecone client."""
+        from local_index import LocalVectorStore
+
+        assert service.pc is None
+        assert isinstance(service.vectorstore, LocalVectorStore)
+
+    @pytest.mark.asyncio
+    async def test_generation_read_from_manifest(self, service):
+        """Test the result cache follows the local index generation."""
+        assert await service.similarity_search_with_score("What is RAG?") == []
+        assert service.cache_stats()["results"]["generation"] == 7
+
+
 class TestVectorStoreServiceSingleton:
     """Tests for vector store service singleton instance."""
 
@@ -0,0 +1,142 @@
+"""
+Tests for the pooled Tavily client.
+Testing connection reuse, concurrency limit, timeouts and result caching against a local stub.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from cache import TTLCache
+from tests.factories import TavilyStubServer
+
+
+def make_client(base_url, max_concurrency=4, timeout_seconds=5.0, cache_size=16):
+    """Create a client pointed at the stub server."""
+    from web_search import TavilyClient
+
+    return TavilyClient(
+        api_key="test-tavily-key",
+        base_url=base_url,
+        max_concurrency=max_concurrency,
+        timeout_seconds=timeout_seconds,
+        cache=TTLCache(max_size=cache_size, ttl_seconds=60),
+    )
+
+
+class TestTavilyClient:
+    """Tests for the shared web search client."""
+
+    @pytest.fixture(autouse=True)
+    def env(self, mock_env_vars):
+        """Provide the settings validated when web_search is imported."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_searches_reuse_connection(self):
+        """Test keep-alive: several searches share one TCP connection."""
+        with TavilyStubServer() as stub:
+            client = make_client(stub.base_url, cache_size=0)
+            for i in range(3):
+                results = await client.search(f"query {i}")
+                assert results[0]["title"] == f"Result for query {i}"
+            await client.aclose()
+
+        assert stub.requests == 3
+        assert stub.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self):
+        """Test normalized repeats of a query skip the network."""
+        with TavilyStubServer() as stub:
+            client = make_client(stub.base_url)
+            await client.search("Latest RAG research")
+            await client.search("  latest rag   RESEARCH ")
+            await client.aclose()
+
+        assert stub.requests == 1
+        assert client.cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_copies(self):
+        """Test editing returned results does not change what the cache serves."""
+        with TavilyStubServer() as stub:
+            client = make_client(stub.base_url)
+            (await client.search("rag"))[0]["title"] = "edited"
+            (await client.search("rag"))[0]["title"] = "edited again"
+            results = await client.search("rag")
+            await client.aclose()
+
+        assert stub.requests == 1
+        assert results[0]["title"] == "Result for rag"
+
+    def test_new_event_loop_closes_previous_client(self):
+        """Test the pooled client of a finished event loop is closed, not leaked."""
+        with TavilyStubServer() as stub:
+            client = make_client(stub.base_url, cache_size=0)
+            asyncio.run(client.search("first loop"))
+            first_client = client._client
+            asyncio.run(client.search("second loop"))
+            asyncio.run(client.aclose())
+
+        assert first_client.is_closed
+        assert stub.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test no more than max_concurrency searches are in flight."""
+        with TavilyStubServer(delay=0.05) as stub:
+            client = make_client(stub.base_url, max_concurrency=2, cache_size=0)
+            await asyncio.gather(*(client.search(f"query {i}") for i in range(6)))
+            await client.aclose()
+
+        assert stub.requests == 6
+        assert stub.max_in_flight <= 2
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Test a slow search raises a timeout instead of hanging."""
+        with TavilyStubServer(delay=0.3) as stub:
+            client = make_client(stub.base_url, timeout_seconds=0.05)
+            with pytest.raises(httpx.TimeoutException):
+                await client.search("slow query")
+            await client.aclose()
+
+
+class TestSearchWebTool:
+    """Tests for the search_web tool using the shared client."""
+
+    @pytest.fixture(autouse=True)
+    def env(self, mock_env_vars):
+        """Provide the settings validated when tools is imported."""
+
+    @pytest.mark.asyncio
+    async def test_search_web_formats_results(self, monkeypatch):
+        """Test results are formatted with [WEB-X] citations."""
+        import tools
+
+        with TavilyStubServer() as stub:
+            client = make_client(stub.base_url)
+            monkeypatch.setattr(tools, "tavily_client", client)
+            monkeypatch.setattr(tools.settings, "tavily_api_key", "test-tavily-key")
+
+            result = await tools.search_web.ainvoke({"query": "vector databases"})
+            await client.aclose()
+
+        assert "[WEB-1] Result for vector databases" in result
+        assert "WEB SOURCES" in result
+
+    @pytest.mark.asyncio
+    async def test_search_web_reports_errors(self, monkeypatch):
+        """Test failures are returned as a tool message rather than raised."""
+        import tools
+
+        with TavilyStubServer(delay=0.3) as stub:
+            client = make_client(stub.base_url, timeout_seconds=0.05)
+            monkeypatch.setattr(tools, "tavily_client", client)
+            monkeypatch.setattr(tools.settings, "tavily_api_key", "test-tavily-key")
+
+            result = await tools.search_web.ainvoke({"query": "slow"})
+            await client.aclose()
+
+        assert result.startswith("Error performing web search")
@@ -2,12 +2,16 @@
 Tools for the LangGraph research agent.
 """
 
-from typing import List, Optional
+from typing import Dict, Hashable, List, Optional, Tuple
 
 from langchain_core.tools import tool
 
 from config import settings
 from vector_store import vector_store_service
+from web_search import tavily_client
+
+# Chunks returned per knowledge base search
+KB_SEARCH_K = 5
 
 
 @tool
@@ -27,16 +31,67 @@ async def search_knowledge_base(query: str) -> str:
         Relevant information with metadata from knowledge base
     """
     # Retrieve relevant documents
-    docs_with_scores = await vector_store_service.similarity_search_with_score(query, k=5)
+    docs_with_scores = await vector_store_service.similarity_search_with_score(query, k=KB_SEARCH_K)
+
+    return format_kb_results(docs_with_scores, query, citations={})
+
+
+async def search_knowledge_base_batch(queries: List[str]) -> List[str]:
+    """
+    Run several knowledge base searches as one batch.
+
+    Queries are embedded in a single request and searched concurrently. Chunks are
+    de-duplicated across the batch: each chunk gets one [KB-X] number, and later
+    queries that return it again name that number and the query whose results hold
+    its text instead of repeating it.
+
+    Args:
+        queries: Search queries, one per search_knowledge_base tool call
+
+    Returns:
+        Formatted search_knowledge_base output for each query, in input order
+    """
+    batch_results = await vector_store_service.batch_similarity_search_with_score(
+        queries, k=KB_SEARCH_K
+    )
+    citations: Dict[Hashable, Tuple[int, str]] = {}
+    return [
+        format_kb_results(docs_with_scores, query, citations)
+        for query, docs_with_scores in zip(queries, batch_results)
+    ]
+
+
+def _chunk_key(doc) -> Hashable:
+    """Identify a chunk by its vector id, falling back to its file, chunk index and text."""
+    vector_id = getattr(doc, "id", None)
+    if vector_id:
+        return str(vector_id)
+    return (doc.metadata.get("file_name"), doc.metadata.get("chunk_index"), doc.page_content)
 
+
+def format_kb_results(
+    docs_with_scores, query: str, citations: Dict[Hashable, Tuple[int, str]]
+) -> str:
+    """
+    Format knowledge base results with [KB-X] citation identifiers.
+
+    Args:
+        docs_with_scores: List of (document, score) tuples
+        query: The search query the results answer
+        citations: Chunk key to (KB number, query that first returned it), shared
+            across a batch of searches
+            (pass an empty dict for a standalone search)
+
+    Returns:
+        Formatted results with a sources section
+    """
     if not docs_with_scores:
         return "No relevant information found in the knowledge base."
 
     # Filter by score threshold and format results with source citations for tracking
     results = []
-    sources_section = "\n\n=== KNOWLEDGE BASE SOURCES (Cite these in your References) ===\n"
+    sources = []
 
-    kb_number = 1
     for doc, score in docs_with_scores:
         # Skip documents below score threshold
         if score < settings.score_threshold:
@@ -56,6 +111,19 @@ async def search_knowledge_base(query: str) -> str:
         else:
             display_title = doc_title if doc_title != "Untitled" else source_file
 
+        key = _chunk_key(doc)
+        if key in citations:
+            # Already returned by an earlier search in this batch
+            kb_number, first_query = citations[key]
+            results.append(
+                f"[KB-{kb_number}] {display_title}\n"
+                f'Full text given as [KB-{kb_number}] in the results for "{first_query}"\n'
+            )
+            continue
+
+        kb_number = len(citations) + 1
+        citations[key] = (kb_number, query)
+
         # Content with citation identifier
         results.append(
             f"[KB-{kb_number}] {display_title}\n"
@@ -66,13 +134,18 @@ async def search_knowledge_base(query: str) -> str:
 
         # Track source for references (use clean file name without extension)
         clean_source = source_file.replace(".md", "").replace("_", " ").title()
-        sources_section += f"[KB-{kb_number}] {clean_source} ({source_file})\n"
-        kb_number += 1
+        sources.append(f"[KB-{kb_number}] {clean_source} ({source_file})\n")
 
     # Return no results message if all were filtered out
     if not results:
         return "No relevant information found above the similarity threshold."
 
+    sources_section = ""
+    if sources:
+        sources_section = (
+            "\n\n=== KNOWLEDGE BASE SOURCES (Cite these in your References) ===\n"
+            + "".join(sources)
+        )
     return "\n---\n\n".join(results) + sources_section
 
 
@@ -246,22 +319,8 @@ async def search_web(query: str) -> str:
         return "Web search is not available (no API key configured)."
 
     try:
-        from langchain_community.tools.tavily_search import TavilySearchResults
-
-        search_tool = TavilySearchResults(
-            api_key=settings.tavily_api_key,
-            max_results=5,
-            search_depth="advanced",
-            include_domains=[
-                "arxiv.org",
-                "github.com",
-                "medium.com",
-                "towardsdatascience.com",
-            ],
-        )
-
-        # Execute search
-        results = await search_tool.ainvoke(query)
+        # Shared pooled client: keep-alive connections, concurrency limit and result cache
+        results = await tavily_client.search(query)
 
         if not results:
             return "No web results found for this query."
@@ -1,28 +1,71 @@
 """
-Vector store service for RAG retrieval using Pinecone.
+Vector store service for RAG retrieval using Pinecone or a local index.
 """
 
-from typing import List, Optional
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone
 
+from cache import CachedQueryEmbeddings, SearchResultCache, TTLCache
 from config import settings
+from local_index import LocalVectorStore
+
+# Index generation marker written by the ingest pipeline after every upsert/delete.
+# Must match ingest/services/pinecone_client.py.
+INDEX_GENERATION_NAMESPACE = "__meta__"
+INDEX_GENERATION_ID = "index-generation"
+
+T = TypeVar("T")
 
 
 class VectorStoreService:
-    """Service for interacting with the Pinecone vector store."""
+    """Service for interacting with the Pinecone or local vector store."""
 
     def __init__(self):
         """Initialize the vector store service."""
-        self.pc = Pinecone(api_key=settings.pinecone_api_key)
-        self.embeddings = OpenAIEmbeddings(
-            openai_api_key=settings.openai_api_key, model=settings.embedding_model
+        self.backend = settings.vector_backend
+        self.pc = (
+            Pinecone(api_key=settings.pinecone_api_key) if self.backend == "pinecone" else None
+        )
+        # Query embeddings are cached so repeated queries (common during research
+        # gathering) skip the OpenAI round-trip on both the tool and simple-RAG paths
+        self.embedding_cache = TTLCache(
+            max_size=settings.embedding_cache_size,
+            ttl_seconds=settings.embedding_cache_ttl_seconds,
+        )
+        self.embeddings = CachedQueryEmbeddings(
+            OpenAIEmbeddings(
+                openai_api_key=settings.openai_api_key, model=settings.embedding_model
+            ),
+            model=settings.embedding_model,
+            cache=self.embedding_cache,
         )
+        # Search results are cached per index generation so popular questions skip
+        # Pinecone entirely until the ingest pipeline changes the index
+        self.result_cache: SearchResultCache = SearchResultCache(
+            max_size=settings.result_cache_size,
+            ttl_seconds=settings.result_cache_ttl_seconds,
+            similarity_threshold=settings.result_cache_similarity_threshold,
+        )
+        self._generation_checked_at: Optional[float] = None
         self.index_name = settings.pinecone_index_name
-        self._vectorstore: Optional[PineconeVectorStore] = None
+        self._vectorstore: Optional[Union[PineconeVectorStore, LocalVectorStore]] = None
+        self._vectorstore_lock = threading.Lock()
+
+        # Pinecone and OpenAI embedding clients are synchronous, so queries run on a
+        # dedicated bounded pool instead of blocking the event loop (and every SSE stream)
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.retrieval_max_concurrency,
+            thread_name_prefix="vector-store",
+        )
 
     def _ensure_index_exists(self):
         """Ensure the Pinecone index exists."""
@@ -34,21 +77,82 @@ class VectorStoreService:
                 f"Index '{self.index_name}' not found. Please run the ingestion pipeline first."
             )
 
+    def _create_vectorstore(self) -> Union[PineconeVectorStore, LocalVectorStore]:
+        """Create the vector store client for the configured backend."""
+        if self.backend == "local":
+            # Memory-mapped index files written by the ingest pipeline's local backend
+            return LocalVectorStore(
+                settings.local_index_path,
+                embedding=self.embeddings,
+                text_key="content_preview",
+                ivf_probes=settings.local_ivf_probes,
+            )
+
+        self._ensure_index_exists()
+        # Use langchain-pinecone which properly supports Pinecone v3+
+        # Note: text_key must match the metadata field from ingestion
+        return PineconeVectorStore(
+            index_name=self.index_name,
+            embedding=self.embeddings,
+            pinecone_api_key=settings.pinecone_api_key,
+            text_key="content_preview",  # Match the field name from ingestion
+        )
+
     @property
-    def vectorstore(self) -> PineconeVectorStore:
+    def vectorstore(self) -> Union[PineconeVectorStore, LocalVectorStore]:
         """Get or create the vector store instance."""
         if self._vectorstore is None:
-            self._ensure_index_exists()
-            # Use langchain-pinecone which properly supports Pinecone v3+
-            # Note: text_key must match the metadata field from ingestion
-            self._vectorstore = PineconeVectorStore(
-                index_name=self.index_name,
-                embedding=self.embeddings,
-                pinecone_api_key=settings.pinecone_api_key,
-                text_key="content_preview",  # Match the field name from ingestion
-            )
+            # Lazy init may race between executor threads
+            with self._vectorstore_lock:
+                if self._vectorstore is None:
+                    self._vectorstore = self._create_vectorstore()
         return self._vectorstore
 
+    def _generation_check_due(self) -> bool:
+        """Whether the index generation marker should be polled again."""
+        return (
+            self._generation_checked_at is None
+            or time.monotonic() - self._generation_checked_at
+            >= settings.index_generation_check_seconds
+        )
+
+    def _refresh_index_generation(self) -> None:
+        """Read the index generation marker and invalidate cached results if it moved."""
+        self._generation_checked_at = time.monotonic()
+        vectorstore = self.vectorstore
+        if isinstance(vectorstore, LocalVectorStore):
+            # The local reader reloads on a new manifest and exposes its generation
+            self.result_cache.check_generation(vectorstore.generation)
+            return
+
+        try:
+            response = self.pc.Index(self.index_name).fetch(
+                ids=[INDEX_GENERATION_ID], namespace=INDEX_GENERATION_NAMESPACE
+            )
+        except Exception as e:
+            # Keep serving the current generation; the next poll will retry
+            print(f"Warning: could not read index generation marker: {e}")
+            return
+
+        marker = response.vectors.get(INDEX_GENERATION_ID)
+        generation = (marker.metadata or {}).get("generation") if marker else None
+        self.result_cache.check_generation(generation)
+
+    async def _run_blocking(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a blocking vector store call on the retrieval thread pool.
+
+        Args:
+            func: Synchronous callable to run
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
     async def similarity_search(self, query: str, k: int = None) -> List[Document]:
         """
         Perform similarity search in the vector store.
@@ -62,9 +166,7 @@ class VectorStoreService:
         """
         k = k or settings.retrieval_k
 
-        # Stub: Perform similarity search
-        # In production, this would query Pinecone
-        results = self.vectorstore.similarity_search(query, k=k)
+        results = await self._run_blocking(lambda: self.vectorstore.similarity_search(query, k=k))
 
         return results
 
@@ -83,11 +185,100 @@ class VectorStoreService:
         """
         k = k or settings.retrieval_k
 
-        # Stub: Perform similarity search with scores
-        results = self.vectorstore.similarity_search_with_score(query, k=k)
+        if not self.result_cache.enabled:
+            return await self._run_blocking(
+                lambda: self.vectorstore.similarity_search_with_score(query, k=k)
+            )
+
+        if self._generation_check_due():
+            await self._run_blocking(self._refresh_index_generation)
 
+        cached = self.result_cache.get(query, k)
+        if cached is not None:
+            return cached
+
+        # Results searched under an older generation must not outlive its invalidation
+        generation = self.result_cache.generation
+        if self.result_cache.semantic_enabled:
+            # Search with the embedding already computed instead of embedding again
+            embedding = await self._run_blocking(self.embeddings.embed_query, query)
+            cached = self.result_cache.get_similar(embedding, k)
+            if cached is not None:
+                return cached
+            results = await self._run_blocking(self._search_by_vector, embedding, k)
+        else:
+            embedding = None
+            results = await self._run_blocking(
+                lambda: self.vectorstore.similarity_search_with_score(query, k=k)
+            )
+
+        if self.result_cache.generation == generation:
+            self.result_cache.set(query, k, results, embedding=embedding)
         return results
 
+    def _search_by_vector(self, embedding: List[float], k: int) -> List[tuple[Document, float]]:
+        """Query the index with a precomputed embedding (blocking)."""
+        return self.vectorstore.similarity_search_by_vector_with_score(embedding, k=k)
+
+    async def batch_similarity_search_with_score(
+        self, queries: List[str], k: Optional[int] = None
+    ) -> List[List[tuple[Document, float]]]:
+        """
+        Perform several similarity searches with one batched embedding request.
+
+        Cached queries are served from the result cache; the rest are embedded in a
+        single request and queried against the index concurrently.
+
+        Args:
+            queries: Search queries
+            k: Number of results per query
+
+        Returns:
+            One list of (document, score) tuples per query, in input order
+        """
+        k = k or settings.retrieval_k
+
+        if self.result_cache.enabled and self._generation_check_due():
+            await self._run_blocking(self._refresh_index_generation)
+
+        cached = [
+            self.result_cache.get(query, k) if self.result_cache.enabled else None
+            for query in queries
+        ]
+        missing = [i for i, found in enumerate(cached) if found is None]
+
+        searched: Dict[int, List[tuple[Document, float]]] = {}
+        if missing:
+            generation = self.result_cache.generation
+            embeddings = await self._run_blocking(
+                self.embeddings.embed_queries, [queries[i] for i in missing]
+            )
+            searches = await asyncio.gather(
+                *(
+                    self._run_blocking(self._search_by_vector, embedding, k)
+                    for embedding in embeddings
+                )
+            )
+
+            cache_results = self.result_cache.generation == generation
+            for i, embedding, found in zip(missing, embeddings, searches):
+                searched[i] = found
+                if cache_results:
+                    self.result_cache.set(queries[i], k, found, embedding=embedding)
+        return [searched[i] if found is None else found for i, found in enumerate(cached)]
+
+    def cache_stats(self) -> dict:
+        """
+        Get retrieval cache statistics.
+
+        Returns:
+            Dictionary of cache name to hit/miss counters
+        """
+        return {
+            "embeddings": self.embedding_cache.stats(),
+            "results": self.result_cache.stats(),
+        }
+
 
 # Global vector store instance
 vector_store_service = VectorStoreService()
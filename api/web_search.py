@@ -0,0 +1,164 @@
+"""
+Long-lived async Tavily search client with connection pooling and result caching.
+"""
+
+import asyncio
+import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from cache import TTLCache, normalize_query
+from config import settings
+
+# Domains the research agent prefers for web results
+INCLUDE_DOMAINS = ["arxiv.org", "github.com", "medium.com", "towardsdatascience.com"]
+
+
+class TavilyClient:
+    """
+    Shared client for the Tavily search API.
+
+    One pooled httpx.AsyncClient (keep-alive, so repeated searches skip TLS setup)
+    and one concurrency semaphore are created per event loop; the previous loop's
+    client is closed when the loop changes. Results are cached by normalized query
+    with a TTL.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        max_concurrency: int,
+        timeout_seconds: float,
+        cache: TTLCache,
+        max_results: int = 5,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Tavily API key
+            base_url: Tavily API base URL
+            max_concurrency: Maximum in-flight searches per process
+            timeout_seconds: Per-call timeout
+            cache: Cache for search results
+            max_results: Results requested per search
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.cache = cache
+        self.max_results = max_results
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _ensure_client(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """
+        Get the pooled client and semaphore for the running event loop, creating them if needed.
+
+        Returns:
+            Tuple of (HTTP client, concurrency semaphore) bound to the running loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._semaphore is not None and self._loop is loop:
+            return self._client, self._semaphore
+
+        # Pools and semaphores are bound to the loop they were first used on
+        if self._client is not None:
+            await self._close_client(self._client, self._loop)
+        self._loop = loop
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client, self._semaphore
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Search the web.
+
+        Args:
+            query: Search query
+
+        Returns:
+            List of result dicts with "title", "url" and "content"
+
+        Raises:
+            httpx.HTTPError: If the request fails or times out
+        """
+        key = normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            # Callers may edit the results; the cached entry must stay intact
+            return copy.deepcopy(cached)
+
+        client, semaphore = await self._ensure_client()
+        async with semaphore:
+            try:
+                # httpx times each phase separately; bound the whole call
+                response = await asyncio.wait_for(
+                    client.post(
+                        "/search",
+                        json={
+                            "api_key": self.api_key,
+                            "query": query,
+                            "max_results": self.max_results,
+                            "search_depth": "advanced",
+                            "include_domains": INCLUDE_DOMAINS,
+                        },
+                    ),
+                    self.timeout_seconds,
+                )
+            except asyncio.TimeoutError as e:
+                raise httpx.TimeoutException(
+                    f"Tavily search timed out after {self.timeout_seconds}s"
+                ) from e
+        response.raise_for_status()
+
+        results: List[Dict[str, Any]] = response.json().get("results", [])
+        self.cache.set(key, copy.deepcopy(results))
+        return results
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._close_client(self._client, self._loop)
+            self._client = None
+            self._loop = None
+
+    @staticmethod
+    async def _close_client(
+        client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]
+    ) -> None:
+        """Close a pooled client, on its own event loop if that loop is still running."""
+        if loop is not None and loop is not asyncio.get_running_loop() and loop.is_running():
+            # Its connections belong to a loop running in another thread
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+            return
+        try:
+            await client.aclose()
+        except RuntimeError:
+            # Its loop is closed, so its connections can no longer be shut down cleanly
+            pass
+
+
+# Global web search client
+tavily_client = TavilyClient(
+    api_key=settings.tavily_api_key or "",
+    base_url=settings.tavily_base_url,
+    max_concurrency=settings.web_search_max_concurrency,
+    timeout_seconds=settings.web_search_timeout_seconds,
+    cache=TTLCache(
+        max_size=settings.web_search_cache_size,
+        ttl_seconds=settings.web_search_cache_ttl_seconds,
+    ),
+)
@@ -7,6 +7,7 @@ A modern, well - architected document ingestion system following SOLID principle
 from .models import (
     ChunkingError,
     ChunkMetadata,
+    ChunkRecord,
     ConfigurationError,
     DocumentChunk,
     DocumentMetadata,
@@ -34,6 +35,7 @@ __all__ = [
     "SearchResult",
     "DocumentMetadata",
     "ChunkMetadata",
+    "ChunkRecord",
     # Exceptions
     "ProcessingError",
     "ChunkingError",
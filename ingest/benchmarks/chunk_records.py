@@ -0,0 +1,139 @@
+"""
+Benchmark for chunk throughput with DocumentChunk models against ChunkRecords.
+
+Extracts, cleans and tokenizes every file in the corpus once, then times the
+per-chunk work of the ingest hot path with the previous representation
+(validated DocumentChunk and ChunkMetadata models, metadata serialized with
+model_dump) against slotted ChunkRecords:
+
+- chunking: DocumentChunkingService.chunk_document against chunk_records;
+- transfer: pickling each document's chunks and loading them back, as worker
+  processes return them;
+- serialization: building the upsert metadata of every chunk.
+
+Tokenization is cached so the numbers reflect chunk construction. Both
+representations must carry the same chunks.
+
+Usage:
+    PYTHONPATH=.. python -m ingest.benchmarks.chunk_records --corpus data/corpus --repeat 5
+"""
+
+import argparse
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from ..models import ChunkRecord, DocumentChunk, FileType, ProcessedDocument
+from ..services import DocumentChunkingService
+from ..utils import DocumentContentExtractor, TextCleaner, TiktokenEncoder, TokenizedText
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[1] / "data" / "corpus"
+SUPPORTED_EXTENSIONS = {".pdf", ".md", ".txt"}
+
+
+class CachedTokenizer(TiktokenEncoder):
+    """Encoder serving tokenizations computed before timing starts."""
+
+    def __init__(self) -> None:
+        """Initialize with an empty tokenization cache."""
+        super().__init__()
+        self._tokenized: Dict[str, TokenizedText] = {}
+
+    def tokenize(self, text: str) -> TokenizedText:
+        """Tokenize a text once, then reuse the result."""
+        if text not in self._tokenized:
+            self._tokenized[text] = super().tokenize(text)
+        return self._tokenized[text]
+
+
+def legacy_vector_metadata(chunk: DocumentChunk) -> Dict[str, Any]:
+    """The previous upsert metadata: model_dump with unset fields filtered out."""
+    return {k: v for k, v in chunk.metadata.model_dump().items() if v is not None}
+
+
+def _best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall-clock time of several calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _report(name: str, count: int, legacy: float, current: float) -> None:
+    """Print per-chunk times of the previous and current representations."""
+    print(f"{name}:")
+    print(f"  DocumentChunk (best): {legacy / count * 1e6:7.2f} us/chunk")
+    print(
+        f"  ChunkRecord (best):   {current / count * 1e6:7.2f} us/chunk "
+        f"({legacy / current:.1f}x)"
+    )
+
+
+def main() -> None:
+    """Time chunk construction, transfer and serialization on the corpus."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    extractor = DocumentContentExtractor()
+    documents: List[ProcessedDocument] = []
+    for path in sorted(args.corpus.rglob("*")):
+        if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        content = TextCleaner.clean_text(extractor.extract_content(path))
+        if content:
+            documents.append(
+                ProcessedDocument(
+                    file_name=path.name,
+                    file_type=FileType(path.suffix.lower()),
+                    title=path.stem,
+                    content=content,
+                    token_count=0,
+                    char_count=len(content),
+                )
+            )
+
+    chunker = DocumentChunkingService(token_encoder=CachedTokenizer())
+    chunks = [chunker.chunk_document(document) for document in documents]
+    records = [chunker.chunk_records(document) for document in documents]
+    if [[ChunkRecord.from_chunk(chunk) for chunk in doc] for doc in chunks] != records:
+        raise SystemExit("Chunk models and records disagree")
+    count = sum(map(len, records))
+    print(f"{len(documents)} documents, {count} chunks")
+    print(
+        f"Pickled size: {sum(len(pickle.dumps(doc)) for doc in chunks) / 1024:.0f} KiB as "
+        f"DocumentChunk, {sum(len(pickle.dumps(doc)) for doc in records) / 1024:.0f} KiB "
+        "as ChunkRecord"
+    )
+
+    _report(
+        "Chunking",
+        count,
+        _best_time(lambda: [chunker.chunk_document(d) for d in documents], args.repeat),
+        _best_time(lambda: [chunker.chunk_records(d) for d in documents], args.repeat),
+    )
+    _report(
+        "Worker transfer (pickle + unpickle)",
+        count,
+        _best_time(lambda: [pickle.loads(pickle.dumps(doc)) for doc in chunks], args.repeat),
+        _best_time(lambda: [pickle.loads(pickle.dumps(doc)) for doc in records], args.repeat),
+    )
+    _report(
+        "Upsert metadata",
+        count,
+        _best_time(
+            lambda: [legacy_vector_metadata(chunk) for doc in chunks for chunk in doc],
+            args.repeat,
+        ),
+        _best_time(
+            lambda: [record.vector_metadata() for doc in records for record in doc], args.repeat
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
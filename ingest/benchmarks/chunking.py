@@ -0,0 +1,106 @@
+"""
+Benchmark for tokenization work in document processing and chunking.
+
+Extracts every file in the corpus once, then times cleaning, title extraction,
+token counting and chunking (DocumentProcessorService.process_file followed by
+DocumentChunkingService.chunk_document) while counting calls into tiktoken.
+Extraction itself is excluded so the numbers reflect tokenization and chunking.
+
+Usage:
+    PYTHONPATH=.. python -m ingest.benchmarks.chunking --corpus data/corpus --repeat 3
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..services import DocumentChunkingService, DocumentProcessorService
+from ..utils import DocumentContentExtractor, TiktokenEncoder
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[1] / "data" / "corpus"
+SUPPORTED_EXTENSIONS = {".pdf", ".md", ".txt"}
+
+
+class CountingEncoding:
+    """Wraps a tiktoken Encoding and counts encode/decode calls and characters."""
+
+    def __init__(self, encoding: Any) -> None:
+        """Wrap an encoding."""
+        self._encoding = encoding
+        self.calls: Dict[str, int] = {}
+        self.chars_encoded = 0
+
+    def __getattr__(self, name: str) -> Any:
+        """Count calls to encode*/decode* methods of the wrapped encoding."""
+        attr = getattr(self._encoding, name)
+        if not callable(attr) or not name.startswith(("encode", "decode")):
+            return attr
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if name.startswith("encode") and args:
+                texts = args[0] if isinstance(args[0], list) else [args[0]]
+                self.chars_encoded += sum(len(text) for text in texts)
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+class PreloadedExtractor(DocumentContentExtractor):
+    """Content extractor serving text extracted before timing starts."""
+
+    def __init__(self, contents: Dict[Path, str]) -> None:
+        """Store the extracted contents by path."""
+        super().__init__()
+        self._contents = contents
+
+    def extract_content(self, file_path: Path, file_hash: Optional[str] = None) -> str:
+        """Return the preloaded content of a file."""
+        return self._contents[file_path]
+
+
+def main() -> None:
+    """Time processing and chunking of the corpus and report tiktoken usage."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    paths: List[Path] = sorted(
+        path for path in args.corpus.rglob("*") if path.suffix.lower() in SUPPORTED_EXTENSIONS
+    )
+    extractor = DocumentContentExtractor()
+    contents = {path: extractor.extract_content(path) for path in paths}
+    print(f"{len(paths)} files, {sum(len(text) for text in contents.values()):,} characters")
+
+    encoder = TiktokenEncoder()
+    # Stands in for the tiktoken Encoding it wraps
+    counting: Any = CountingEncoding(encoder._encoding)
+    encoder._encoding = counting
+    processor = DocumentProcessorService(
+        content_extractor=PreloadedExtractor(contents), token_encoder=encoder
+    )
+    chunker = DocumentChunkingService(token_encoder=encoder)
+
+    timings = []
+    chunk_count = 0
+    for _ in range(args.repeat):
+        counting.calls.clear()
+        counting.chars_encoded = 0
+        chunk_count = 0
+        start = time.perf_counter()
+        for path in paths:
+            document = processor.process_file(path)
+            if document:
+                chunk_count += len(chunker.chunk_document(document))
+        timings.append(time.perf_counter() - start)
+
+    print(f"chunks:         {chunk_count}")
+    print(f"encoder calls:  {sum(counting.calls.values())} {dict(sorted(counting.calls.items()))}")
+    print(f"chars encoded:  {counting.chars_encoded:,}")
+    print(f"seconds (best): {min(timings):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for splitting large Markdown documents into sections.
+
+Builds synthetic documents of doubling size, each with long sections and fenced
+code blocks, and times MarkdownSectionSplitter.sections against the previous
+line-by-line splitter that grew every section by string concatenation. Linear
+scaling shows as a flat time per MB.
+
+Usage:
+    PYTHONPATH=.. python -m ingest.benchmarks.markdown_sections --sizes 1 2 4 8 16
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from ..utils import MarkdownSectionSplitter
+
+WORDS = (
+    "vector embedding retrieval agent index query corpus token chunk model latency "
+    "throughput cache batch pipeline document section paragraph sentence context"
+).split()
+
+
+def build_document(sections: int, lines_per_section: int, seed: int = 0) -> str:
+    """
+    Build a Markdown document with long sections and a code block in each.
+
+    Args:
+        sections: Number of `##` sections
+        lines_per_section: Prose lines per section
+        seed: Random seed so runs are comparable
+
+    Returns:
+        The document text
+    """
+    rng = random.Random(seed)
+    parts = ["# Benchmark document\n"]
+    for i in range(sections):
+        parts.append(f"## Section {i}\n")
+        for j in range(lines_per_section):
+            parts.append(" ".join(rng.choices(WORDS, k=12)).capitalize() + ".\n")
+            if j % 10 == 9:
+                parts.append("\n")
+        parts.append("```python\n# a comment, not a header\nprint('hello')\n```\n\n")
+    return "".join(parts)
+
+
+def legacy_split(text: str) -> List[Dict[str, Any]]:
+    """The previous splitter: per-line concatenation, unaware of code fences."""
+    sections: List[Dict[str, Any]] = []
+    current_section: Dict[str, Any] = {"header": "", "content": "", "level": 0}
+    for line in text.split("\n"):
+        if line.strip().startswith("#"):
+            if str(current_section["content"]).strip():
+                sections.append(current_section)
+            current_section = {
+                "header": line.strip("#").strip(),
+                "content": line + "\n",
+                "level": len(line) - len(line.lstrip("#")),
+            }
+        else:
+            current_section["content"] = str(current_section["content"]) + line + "\n"
+    if str(current_section["content"]).strip():
+        sections.append(current_section)
+    return sections
+
+
+def _best_time(split: Callable[[str], Any], text: str, repeat: int) -> float:
+    """Best wall-clock time of splitting text over several runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        split(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Time both splitters on documents of increasing size."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16],
+        help="Document sizes as multiples of 8 sections of 250 lines",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size")
+    args = parser.parse_args()
+
+    splitter = MarkdownSectionSplitter()
+    print(f"{'MB':>6} {'sections':>9} {'legacy s':>9} {'spans s':>9} {'spans s/MB':>11}")
+    for size in args.sizes:
+        # Grow both the number and the length of sections
+        text = build_document(sections=8 * size, lines_per_section=250 * size)
+        megabytes = len(text) / 1e6
+        legacy = _best_time(legacy_split, text, args.repeat)
+        spans = _best_time(splitter.sections, text, args.repeat)
+        count = len(splitter.sections(text))
+        print(f"{megabytes:6.2f} {count:9d} {legacy:9.3f} {spans:9.4f} {spans / megabytes:11.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark for multiprocess document extraction and chunking.
+
+Generates a synthetic markdown corpus and times CorpusIngester.iter_processed
+and iter_chunks with an increasing number of worker processes. No network calls
+are made; the vector store client is constructed but never used.
+
+Usage:
+    PYTHONPATH=.. python -m ingest.benchmarks.parallel_chunking --files 48 --workers 1 2 4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from ..core.ingest import CorpusIngester
+from ..models import IngestionConfig
+
+# The vector store builds an OpenAI client at construction; it is never called
+os.environ.setdefault("OPENAI_API_KEY", "bench-openai-key")
+
+WORDS = (
+    "vector embedding retrieval agent index query corpus token chunk model latency "
+    "throughput cache batch pipeline document section paragraph sentence context"
+).split()
+
+
+def _paragraph(rng: random.Random) -> str:
+    """Build a paragraph of a few random sentences."""
+    sentences = []
+    for _ in range(rng.randint(3, 8)):
+        words = rng.choices(WORDS, k=rng.randint(8, 24))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def write_corpus(directory: Path, files: int, sections: int, seed: int = 0) -> List[Path]:
+    """
+    Write a synthetic markdown corpus.
+
+    Args:
+        directory: Where to write the files
+        files: Number of files
+        sections: Sections per file
+        seed: Random seed so runs are comparable
+
+    Returns:
+        Paths of the written files
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        parts = [f"# Document {i}\n"]
+        for j in range(sections):
+            parts.append(f"## Section {j}\n")
+            parts.extend(_paragraph(rng) + "\n" for _ in range(rng.randint(2, 6)))
+        path = directory / f"doc_{i:03d}.md"
+        path.write_text("\n".join(parts), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    """Time extraction and chunking for each worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=48, help="Files in the synthetic corpus")
+    parser.add_argument("--sections", type=int, default=40, help="Sections per file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, os.cpu_count() or 1}),
+        help="Worker counts to compare",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        paths = write_corpus(tmp_path, args.files, args.sections)
+        config = IngestionConfig(
+            openai_api_key=os.environ["OPENAI_API_KEY"],
+            vector_backend="local",
+            local_index_path=str(tmp_path / "index"),
+            manifest_path=str(tmp_path / "manifest.json"),
+            embedding_cache_path="",
+            extraction_cache_path="",
+        )
+
+        print(f"{args.files} files, {os.cpu_count()} CPU cores")
+        results = []
+        for workers in args.workers:
+            ingester = CorpusIngester(config, workers=workers)
+            start = time.perf_counter()
+            processed = ingester.iter_processed(paths, corpus_path=tmp_path)
+            chunks = list(ingester.iter_chunks(processed, {}, tmp_path))
+            elapsed = time.perf_counter() - start
+            results.append((workers, elapsed, len(chunks)))
+
+        baseline = results[0][1]
+        print("\nworkers  seconds  speedup  chunks")
+        for workers, elapsed, chunk_count in results:
+            print(f"{workers:>7}  {elapsed:>7.2f}  {baseline / elapsed:>6.2f}x  {chunk_count:>6}")
+
+
+if __name__ == "__main__":
+    main()
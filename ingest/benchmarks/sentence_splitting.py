@@ -0,0 +1,82 @@
+"""
+Benchmark for sentence splitting on the PDFs of the corpus.
+
+Extracts every PDF once, splits the text into paragraphs, then times the
+previous SentenceSplitter (abbreviation regex rebuilt on every call, placeholder
+replace, split and restore per sentence) against SentenceSplitter.spans, which
+finds breaks and abbreviations in one precompiled scan. Both must produce the
+same sentences.
+
+Usage:
+    PYTHONPATH=.. python -m ingest.benchmarks.sentence_splitting --corpus data/corpus --repeat 5
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from ..utils import DocumentContentExtractor, ParagraphSplitter, SentenceSplitter
+from ..utils.text_splitter import DEFAULT_ABBREVIATIONS
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[1] / "data" / "corpus"
+
+
+def legacy_split(text: str) -> List[str]:
+    """The previous splitter: per-call regex, placeholder protection, split and restore."""
+    pattern = r"\b(?:" + "|".join(re.escape(abbr) for abbr in DEFAULT_ABBREVIATIONS) + r")\."
+    protected_text = re.sub(
+        pattern,
+        lambda m: m.group().replace(".", "<!DOT!>"),
+        text,
+        flags=re.IGNORECASE,
+    )
+    sentences = re.split(r"(?<=[.!?])\s+", protected_text)
+    return [s.replace("<!DOT!>", ".").strip() for s in sentences if s.strip()]
+
+
+def _best_time(split: Callable[[str], List[str]], paragraphs: List[str], repeat: int) -> float:
+    """Best wall-clock time of splitting every paragraph over several runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for paragraph in paragraphs:
+            split(paragraph)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Time the previous and current sentence splitters on the corpus PDFs."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the paragraphs")
+    args = parser.parse_args()
+
+    extractor = DocumentContentExtractor()
+    paragraph_splitter = ParagraphSplitter()
+    paragraphs = [
+        paragraph
+        for path in sorted(args.corpus.rglob("*.pdf"))
+        for paragraph in paragraph_splitter.split(extractor.extract_content(path))
+    ]
+    splitter = SentenceSplitter()
+    sentences = 0
+    for paragraph in paragraphs:
+        current = splitter.split(paragraph)
+        if current != legacy_split(paragraph):
+            raise SystemExit(f"Splitters disagree on paragraph: {paragraph[:80]!r}")
+        sentences += len(current)
+    print(f"{len(paragraphs)} paragraphs, {sentences} sentences")
+
+    legacy_seconds = _best_time(legacy_split, paragraphs, args.repeat)
+    current_seconds = _best_time(splitter.split, paragraphs, args.repeat)
+    print(f"legacy split (best):  {legacy_seconds:.4f} s")
+    print(
+        f"single pass (best):   {current_seconds:.4f} s  ({legacy_seconds / current_seconds:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark for text cleaning and embedding-text normalization on the corpus.
+
+Extracts every file in the corpus once and chunks the cleaned text, then times
+and measures the peak memory of:
+
+- document cleaning: the previous TextCleaner (two module-level re.sub passes,
+  a replace and a strip, each copying the document) against
+  TextCleaner.clean_text (one precompiled pass and a strip);
+- chunk normalization: the previous upsert path (whitespace normalized twice
+  per chunk, for the embedding text and again for content_preview, each with
+  two replaces, a split and a join) against TextCleaner.embedding_text once
+  per chunk.
+
+Both versions must produce the same text.
+
+Usage:
+    PYTHONPATH=.. python -m ingest.benchmarks.text_cleaning --corpus data/corpus --repeat 5
+"""
+
+import argparse
+import re
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from ..models import FileType, ProcessedDocument
+from ..services import DocumentChunkingService
+from ..utils import DocumentContentExtractor, TextCleaner
+
+DEFAULT_CORPUS = Path(__file__).resolve().parents[1] / "data" / "corpus"
+SUPPORTED_EXTENSIONS = {".pdf", ".md", ".txt"}
+
+
+def legacy_clean_text(text: str) -> str:
+    """The previous document cleaner: separate passes, each copying the text."""
+    text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
+    text = re.sub(r" +", " ", text)
+    text = text.replace("\x00", "")
+    return text.strip()
+
+
+def _legacy_normalize(text: str) -> str:
+    """The previous PineconeVectorStore._clean_text."""
+    return " ".join(text.replace("\n", " ").replace("\r", " ").split())
+
+
+def legacy_chunk_texts(content: str) -> Tuple[str, str]:
+    """The previous upsert path: (embedding text, preview text), normalized separately."""
+    return _legacy_normalize(content), _legacy_normalize(content)
+
+
+def chunk_texts(content: str) -> Tuple[str, str]:
+    """The current upsert path: one normalization shared by embedding and preview."""
+    text = TextCleaner.embedding_text(content)
+    return text, text
+
+
+def _measure(func: Callable[[str], object], texts: List[str], repeat: int) -> Tuple[float, int]:
+    """Best wall-clock time of a pass over the texts, and the pass's peak traced memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for text in texts:
+        func(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def _report(name: str, legacy: Tuple[float, int], current: Tuple[float, int]) -> None:
+    """Print timings and peak memory of the previous and current versions."""
+    print(f"{name}:")
+    print(f"  legacy (best):   {legacy[0]:.4f} s, peak {legacy[1] / 1024:.0f} KiB")
+    print(
+        f"  current (best):  {current[0]:.4f} s, peak {current[1] / 1024:.0f} KiB "
+        f"({legacy[0] / current[0]:.1f}x)"
+    )
+
+
+def main() -> None:
+    """Time the previous and current cleaning of the corpus and its chunks."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Corpus directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the texts")
+    args = parser.parse_args()
+
+    extractor = DocumentContentExtractor()
+    paths = sorted(p for p in args.corpus.rglob("*") if p.suffix.lower() in SUPPORTED_EXTENSIONS)
+    raw = [extractor.extract_content(path) for path in paths]
+
+    cleaned = []
+    for text in raw:
+        current = TextCleaner.clean_text(text)
+        if current != legacy_clean_text(text):
+            raise SystemExit(f"Cleaners disagree on document: {text[:80]!r}")
+        cleaned.append(current)
+
+    chunker = DocumentChunkingService()
+    contents = [
+        chunk.content
+        for path, text in zip(paths, cleaned)
+        if text
+        for chunk in chunker.chunk_document(
+            ProcessedDocument(
+                file_name=path.name,
+                file_type=FileType(path.suffix.lower()),
+                title=path.stem,
+                content=text,
+                token_count=0,
+                char_count=len(text),
+            )
+        )
+    ]
+    for content in contents:
+        if chunk_texts(content) != legacy_chunk_texts(content):
+            raise SystemExit(f"Normalizers disagree on chunk: {content[:80]!r}")
+    print(
+        f"{len(raw)} documents ({sum(map(len, raw)) / 2**20:.1f}M chars), "
+        f"{len(contents)} chunks"
+    )
+
+    _report(
+        "Document cleaning (4 passes -> 1 pass + strip)",
+        _measure(legacy_clean_text, raw, args.repeat),
+        _measure(TextCleaner.clean_text, raw, args.repeat),
+    )
+    _report(
+        "Chunk normalization (2 per chunk -> 1 per chunk)",
+        _measure(legacy_chunk_texts, contents, args.repeat),
+        _measure(chunk_texts, contents, args.repeat),
+    )
+
+
+if __name__ == "__main__":
+    main()
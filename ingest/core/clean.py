@@ -9,7 +9,7 @@ from pathlib import Path
 # Add parent directory to path for imports when running directly
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ..services import PineconeVectorStore  # noqa: E402
+from ..services import IngestManifest, PineconeVectorStore  # noqa: E402
 from .config_loader import load_config  # noqa: E402
 
 
@@ -26,12 +26,17 @@ def main():
             index_name=config.index_name,
             embedding_model=config.model,
             embedding_dimensions=config.dimensions,
+            backend=config.vector_backend,
+            local_index_path=config.local_index_path,
+            ivf_lists=config.ivf_lists,
         )
 
         # Connect to existing index and clear vectors
         try:
-            vector_store.index = vector_store.pc.Index(vector_store.index_name)
+            vector_store.connect_to_index()
             vector_store.delete_all_vectors()
+            # The next ingestion must re-ingest everything
+            IngestManifest(Path(config.manifest_path)).clear()
             print("✅ Index cleaned successfully!")
         except Exception as e:
             print(f"❌ Could not clean index: {e}")
@@ -61,7 +61,7 @@ class Config:
             ),
         }
 
-    def get_database_config(self) -> Dict[str, str]:
+    def get_database_config(self) -> Dict[str, Any]:
         """Get database configuration."""
         db_config = self._config.get("database", {})
 
@@ -69,7 +69,14 @@ class Config:
             "index_name": os.getenv(
                 "PINECONE_INDEX_NAME",
                 db_config.get("index_name", "ai-agent-demo-index"),
-            )
+            ),
+            "vector_backend": os.getenv(
+                "VECTOR_BACKEND", db_config.get("vector_backend", "pinecone")
+            ),
+            "local_index_path": os.getenv(
+                "LOCAL_INDEX_PATH", db_config.get("local_index_path", "data/local_index")
+            ),
+            "ivf_lists": int(os.getenv("IVF_LISTS", str(db_config.get("ivf_lists", 0)))),
         }
 
     def get_embedding_config(self) -> Dict[str, Any]:
@@ -89,7 +96,7 @@ class Config:
             ),
         }
 
-    def get_processing_config(self) -> Dict[str, int]:
+    def get_processing_config(self) -> Dict[str, Any]:
         """Get processing configuration."""
         processing_config = self._config.get("processing", {})
 
@@ -112,6 +119,72 @@ class Config:
                     str(processing_config.get("upsert_batch_size", 100)),
                 )
             ),
+            "embedding_max_batch_tokens": int(
+                os.getenv(
+                    "EMBEDDING_MAX_BATCH_TOKENS",
+                    str(processing_config.get("embedding_max_batch_tokens", 100_000)),
+                )
+            ),
+            "embedding_concurrency": int(
+                os.getenv(
+                    "EMBEDDING_CONCURRENCY",
+                    str(processing_config.get("embedding_concurrency", 4)),
+                )
+            ),
+            "embedding_max_retries": int(
+                os.getenv(
+                    "EMBEDDING_MAX_RETRIES",
+                    str(processing_config.get("embedding_max_retries", 5)),
+                )
+            ),
+            "upsert_queue_depth": int(
+                os.getenv(
+                    "UPSERT_QUEUE_DEPTH",
+                    str(processing_config.get("upsert_queue_depth", 4)),
+                )
+            ),
+            "upsert_concurrency": int(
+                os.getenv(
+                    "UPSERT_CONCURRENCY",
+                    str(processing_config.get("upsert_concurrency", 4)),
+                )
+            ),
+            "upsert_max_retries": int(
+                os.getenv(
+                    "UPSERT_MAX_RETRIES",
+                    str(processing_config.get("upsert_max_retries", 5)),
+                )
+            ),
+            "upsert_max_payload_bytes": int(
+                os.getenv(
+                    "UPSERT_MAX_PAYLOAD_BYTES",
+                    str(processing_config.get("upsert_max_payload_bytes", 2 * 1024 * 1024)),
+                )
+            ),
+            "embedding_cache_path": os.getenv(
+                "EMBEDDING_CACHE_PATH",
+                processing_config.get("embedding_cache_path", "data/embedding_cache.sqlite3"),
+            ),
+            "extraction_cache_path": os.getenv(
+                "EXTRACTION_CACHE_PATH",
+                processing_config.get("extraction_cache_path", "data/extracted_text.sqlite3"),
+            ),
+            "pdf_workers": int(
+                os.getenv("PDF_WORKERS", str(processing_config.get("pdf_workers", 1)))
+            ),
+            "slow_page_seconds": float(
+                os.getenv("SLOW_PAGE_SECONDS", str(processing_config.get("slow_page_seconds", 2.0)))
+            ),
+            "stream_threshold_bytes": int(
+                os.getenv(
+                    "STREAM_THRESHOLD_BYTES",
+                    str(processing_config.get("stream_threshold_bytes", 32 * 1024 * 1024)),
+                )
+            ),
+            "failed_batch_journal": os.getenv(
+                "FAILED_BATCH_JOURNAL",
+                processing_config.get("failed_batch_journal", "data/failed_embeddings.jsonl"),
+            ),
         }
 
     def get_paths_config(self) -> Dict[str, str]:
@@ -119,7 +192,10 @@ class Config:
         paths_config = self._config.get("paths", {})
 
         return {
-            "corpus_path": os.getenv("CORPUS_PATH", paths_config.get("corpus_path", "data/corpus"))
+            "corpus_path": os.getenv("CORPUS_PATH", paths_config.get("corpus_path", "data/corpus")),
+            "manifest_path": os.getenv(
+                "MANIFEST_PATH", paths_config.get("manifest_path", "data/ingest_manifest.json")
+            ),
         }
 
     def get_logging_config(self) -> Dict[str, Any]:
@@ -149,11 +225,12 @@ class Config:
         """Validate that all required configuration is present."""
         api_config = self.get_api_config()
 
-        required_fields = [
-            ("openai_api_key", "OPENAI_API_KEY"),
-            ("pinecone_api_key", "PINECONE_API_KEY"),
-            ("pinecone_environment", "PINECONE_ENVIRONMENT"),
-        ]
+        required_fields = [("openai_api_key", "OPENAI_API_KEY")]
+        if self.get_database_config()["vector_backend"] == "pinecone":
+            required_fields += [
+                ("pinecone_api_key", "PINECONE_API_KEY"),
+                ("pinecone_environment", "PINECONE_ENVIRONMENT"),
+            ]
 
         missing_fields = []
         for field, env_var in required_fields:
@@ -7,38 +7,132 @@ Processes the data corpus from ai - pocket - projects and creates searchable emb
 import argparse
 import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List
-
-from ..models import DocumentChunk, IngestionConfig, ProcessedDocument
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..models import (
+    ChunkingError,
+    ChunkRecord,
+    IngestionConfig,
+    ProcessedDocument,
+    ProcessingError,
+    StreamedDocument,
+    UpsertReport,
+)
 from ..services import (
     DocumentChunkingService,
     DocumentProcessorService,
+    IngestManifest,
     PineconeVectorStore,
 )
+from ..services.chunking_service import CHUNKER_VERSION
+from ..services.ingest_manifest import hash_config
+from ..utils import DocumentContentExtractor, ExtractedTextCache, TiktokenEncoder
+from ..utils.content_extractor import EXTRACTOR_VERSION
+from ..utils.extraction_cache import hash_file
 from .config_loader import load_config
 
+# (path, processed or streamed document or None if it failed, its chunks; the
+# chunks of a streamed document are produced lazily, as they are iterated)
+ProcessedFile = Tuple[
+    Path, Optional[Union[ProcessedDocument, StreamedDocument]], Iterable[ChunkRecord]
+]
+
+# Services owned by each extraction/chunking worker process (one tiktoken encoder each)
+_worker_services: Optional[Tuple[DocumentProcessorService, DocumentChunkingService]] = None
+
+
+def _manifest_key(path: Path, corpus_path: Path) -> str:
+    """Key a document by its path relative to the corpus, as the manifest and chunk ids do."""
+    return path.relative_to(corpus_path).as_posix()
+
+
+def _content_extractor(config: IngestionConfig, pdf_workers: int) -> DocumentContentExtractor:
+    """Build a content extractor with the configured extracted-text cache."""
+    cache_path = config.extraction_cache_path
+    return DocumentContentExtractor(
+        pdf_workers=pdf_workers,
+        text_cache=ExtractedTextCache(Path(cache_path)) if cache_path else None,
+        slow_page_seconds=config.slow_page_seconds,
+    )
+
+
+def _init_worker(config: IngestionConfig, chunker_settings: Dict[str, int]) -> None:
+    """Build the per-process document processor and chunker."""
+    global _worker_services
+    # Files are already spread over processes, so each extracts its PDFs and
+    # encodes on one thread
+    encoder = TiktokenEncoder(num_threads=1)
+    _worker_services = (
+        DocumentProcessorService(
+            content_extractor=_content_extractor(config, pdf_workers=1), token_encoder=encoder
+        ),
+        DocumentChunkingService(**chunker_settings, token_encoder=encoder),
+    )
+
+
+def _process_and_chunk(
+    path: Path, file_hash: Optional[str] = None, source_path: Optional[str] = None
+) -> Tuple[Optional[ProcessedDocument], List[ChunkRecord]]:
+    """Extract and chunk one file inside a worker process."""
+    if _worker_services is None:
+        raise ProcessingError("Worker process was started without _init_worker")
+    processor, chunker = _worker_services
+    document = processor.process_file(path, file_hash, source_path)
+    return document, chunker.chunk_records(document) if document else []
+
 
 class CorpusIngester:
     """Main class for ingesting the AI pocket projects corpus."""
 
-    def __init__(self, config: IngestionConfig):
-        """Initialize the ingester with configuration."""
+    def __init__(self, config: IngestionConfig, workers: int = 1):
+        """
+        Initialize the ingester with configuration.
+
+        Args:
+            config: Ingestion configuration
+            workers: Processes used for extraction and chunking (1 runs in-process)
+        """
         self.config = config
-        self.doc_processor = DocumentProcessorService()
-        self.chunker = DocumentChunkingService(
-            chunk_size=config.chunk_size,
-            chunk_overlap=config.chunk_overlap,
-            min_chunk_size=config.min_chunk_size,
-            max_chunk_size=config.max_chunk_size,
+        self.workers = workers
+        self.chunker_settings = {
+            "chunk_size": config.chunk_size,
+            "chunk_overlap": config.chunk_overlap,
+            "min_chunk_size": config.min_chunk_size,
+            "max_chunk_size": config.max_chunk_size,
+        }
+        # Shared so the chunker reuses the tokenization done while processing
+        encoder = TiktokenEncoder()
+        self.doc_processor = DocumentProcessorService(
+            content_extractor=_content_extractor(config, pdf_workers=config.pdf_workers),
+            token_encoder=encoder,
+            stream_threshold_bytes=config.stream_threshold_bytes,
         )
+        self.chunker = DocumentChunkingService(**self.chunker_settings, token_encoder=encoder)
         self.vector_store = PineconeVectorStore(
             api_key=config.pinecone_api_key,
             environment=config.pinecone_environment,
             index_name=config.index_name,
             embedding_model=config.model,
             embedding_dimensions=config.dimensions,
+            backend=config.vector_backend,
+            local_index_path=config.local_index_path,
+            ivf_lists=config.ivf_lists,
+            embedding_batch_size=config.embedding_batch_size,
+            embedding_max_batch_tokens=config.embedding_max_batch_tokens,
+            embedding_concurrency=config.embedding_concurrency,
+            embedding_max_retries=config.embedding_max_retries,
+            failed_batch_journal=config.failed_batch_journal,
+            embedding_cache_path=config.embedding_cache_path or None,
+            upsert_queue_depth=config.upsert_queue_depth,
+            upsert_concurrency=config.upsert_concurrency,
+            upsert_max_retries=config.upsert_max_retries,
+            upsert_max_payload_bytes=config.upsert_max_payload_bytes,
         )
+        self.manifest = IngestManifest(Path(config.manifest_path))
 
     def discover_documents(self, corpus_path: Path) -> List[Path]:
         """
@@ -65,112 +159,321 @@ class CorpusIngester:
 
         return documents
 
-    def process_documents(self, document_paths: List[Path]) -> List[ProcessedDocument]:
+    def _stream_file(self, path: Path, source_path: Optional[str]) -> ProcessedFile:
+        """Chunk a large text file lazily from a stream of its paragraphs."""
+        streamed = self.doc_processor.stream_file(path, source_path)
+        if streamed is None:
+            return path, None, []
+        document, paragraphs = streamed
+        return path, document, self.chunker.chunk_stream(document, paragraphs)
+
+    def _iter_in_process(
+        self,
+        document_paths: List[Path],
+        file_hashes: Dict[Path, str],
+        corpus_path: Optional[Path],
+    ) -> Iterator[ProcessedFile]:
+        """Extract and chunk documents one at a time in this process."""
+        for path in document_paths:
+            source_path = _manifest_key(path, corpus_path) if corpus_path else None
+            if self.doc_processor.should_stream(path):
+                yield self._stream_file(path, source_path)
+                continue
+            document = self.doc_processor.process_file(path, file_hashes.get(path), source_path)
+            yield path, document, self.chunker.chunk_records(document) if document else []
+
+    def iter_processed(
+        self,
+        document_paths: List[Path],
+        file_hashes: Optional[Dict[Path, str]] = None,
+        corpus_path: Optional[Path] = None,
+    ) -> Iterator[ProcessedFile]:
         """
-        Process all documents and extract content.
+        Extract and chunk documents lazily, one file at a time.
+
+        PDF extraction and tiktoken-heavy chunking are CPU-bound, so with more than
+        one worker each file is handled end to end by a process with its own
+        processor, chunker and encoder. At most 2 x workers files are in flight
+        ahead of the consumer, and results come back in input order, so the output
+        matches a sequential run exactly. Files large enough to stream are never
+        sent to a worker (their text would be pickled back whole); they are
+        chunked lazily in this process when their turn comes.
+
+        Worker processes are started before this returns, so call it before any
+        embedding/upsert threads exist.
 
         Args:
             document_paths: List of document file paths
+            file_hashes: Content hashes already computed for the paths, passed on
+                so extraction does not hash the files again
+            corpus_path: Path to the corpus directory; chunk ids then include the
+                document's relative path, keeping same-named files apart
 
         Returns:
-            List of processed document dictionaries
+            Iterator of (path, processed document or None if it failed, its chunks)
         """
-        documents = []
+        file_hashes = file_hashes or {}
+        if self.workers <= 1 or len(document_paths) < 2:
+            return self._iter_in_process(document_paths, file_hashes, corpus_path)
+
+        workers = min(self.workers, len(document_paths))
+        print(f"\nProcessing and chunking {len(document_paths)} documents with {workers} workers")
+
+        # Workers start here, before the embedding/upsert thread pools exist, so the
+        # platform default (fork on Linux) is safe and avoids re-importing per worker
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.config, self.chunker_settings),
+        )
+        paths = iter(document_paths)
+
+        def source(path: Path) -> Optional[str]:
+            return _manifest_key(path, corpus_path) if corpus_path else None
+
+        def submit(path: Path) -> Tuple[Path, Optional[Future]]:
+            if self.doc_processor.should_stream(path):
+                return path, None
+            return path, executor.submit(
+                _process_and_chunk, path, file_hashes.get(path), source(path)
+            )
+
+        in_flight = deque(submit(path) for path in islice(paths, 2 * workers))
+
+        def results() -> Iterator[ProcessedFile]:
+            try:
+                while in_flight:
+                    path, future = in_flight.popleft()
+                    next_path = next(paths, None)
+                    if next_path is not None:
+                        in_flight.append(submit(next_path))
+                    if future is None:
+                        yield self._stream_file(path, source(path))
+                        continue
+                    document, chunks = future.result()
+                    yield path, document, chunks
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+        return results()
+
+    def iter_chunks(
+        self,
+        processed: Iterable[ProcessedFile],
+        produced: Dict[str, List[str]],
+        corpus_path: Path,
+    ) -> Iterator[ChunkRecord]:
+        """
+        Flatten processed documents into a chunk stream, recording what each produced.
 
-        print(f"\nProcessing {len(document_paths)} documents...")
+        Args:
+            processed: Output of iter_processed
+            produced: Filled with the chunk ids of each successfully processed file,
+                keyed by its manifest key (path relative to the corpus)
+            corpus_path: Path to the corpus directory
 
-        for doc_path in document_paths:
-            print(f"Processing: {doc_path.name}")
+        Yields:
+            Chunk records, file by file
+        """
+        for path, document, chunks in processed:
+            if document is None:
+                print(f"  ⚠️  Failed to process {path.name}")
+                continue
+            chunk_ids = []
+            try:
+                for chunk in chunks:
+                    chunk_ids.append(chunk.id)
+                    yield chunk
+            except (ProcessingError, ChunkingError) as e:
+                # A streamed file can fail part way; its chunks already yielded
+                # are upserted, but it stays out of the manifest to be retried
+                print(f"  ⚠️  Failed to process {path.name}: {e}")
+                continue
+            print(f"Processed {path.name}: {len(chunk_ids)} chunks")
+            produced[_manifest_key(path, corpus_path)] = chunk_ids
+
+    def config_hash(self) -> str:
+        """Hash the settings that change the chunks or vectors a file produces."""
+        return hash_config(
+            {
+                "chunk_size": self.config.chunk_size,
+                "chunk_overlap": self.config.chunk_overlap,
+                "min_chunk_size": self.config.min_chunk_size,
+                "max_chunk_size": self.config.max_chunk_size,
+                "model": self.config.model,
+                "dimensions": self.config.dimensions,
+                "vector_backend": self.config.vector_backend,
+                "index_name": self.config.index_name,
+                "chunker_version": CHUNKER_VERSION,
+                "extractor_version": EXTRACTOR_VERSION,
+            }
+        )
 
-            document = self.doc_processor.process_file(doc_path)
-            if document:
-                documents.append(document)
-            else:
-                print(f"  ⚠️  Failed to process {doc_path.name}")
+    def plan_changes(
+        self, document_paths: List[Path], corpus_path: Path, full: bool = False
+    ) -> Tuple[Dict[Path, str], List[str]]:
+        """
+        Compare the corpus against the ingest manifest.
 
-        print(f"Successfully processed {len(documents)} documents")
-        return documents
+        Args:
+            document_paths: Documents currently in the corpus
+            corpus_path: Path to the corpus directory
+            full: Treat every document as changed
 
-    def chunk_documents(self, documents: List[ProcessedDocument]) -> List[DocumentChunk]:
+        Returns:
+            Tuple of (changed documents mapped to their content hash, manifest keys
+            of documents that were removed from the corpus)
+        """
+        config_hash = self.config_hash()
+        changed: Dict[Path, str] = {}
+        present = set()
+
+        for path in document_paths:
+            key = _manifest_key(path, corpus_path)
+            present.add(key)
+            content_hash = hash_file(path)
+            if full or not self.manifest.is_current(key, content_hash, config_hash):
+                changed[path] = content_hash
+
+        removed = [key for key in self.manifest.keys if key not in present]
+        return changed, removed
+
+    def update_manifest(
+        self,
+        corpus_path: Path,
+        changed: Dict[Path, str],
+        removed: List[str],
+        produced: Dict[str, List[str]],
+        report: Optional[UpsertReport],
+    ) -> List[str]:
         """
-        Chunk all documents for optimal embedding.
+        Record ingested documents in the manifest and collect vectors to delete.
+
+        Documents that failed to process, embed or upsert are left out of the
+        manifest (keeping their previous vectors) so the next run retries them.
 
         Args:
-            documents: List of processed documents
+            corpus_path: Path to the corpus directory
+            changed: Changed documents mapped to their content hash
+            removed: Manifest keys of documents removed from the corpus
+            produced: Chunk ids of each file that processed successfully, by manifest key
+            report: Upsert report for the chunks, if any were upserted
 
         Returns:
-            List of document chunks
+            Ids of vectors no longer produced by any document
         """
-        all_chunks = []
-
-        print(f"\nChunking {len(documents)} documents...")
+        config_hash = self.config_hash()
+        failed = set(report.failed_ids + report.embedding_failed_ids) if report else set()
 
-        for document in documents:
-            print(f"Chunking: {document.file_name}")
+        stale: List[str] = []
+        for path, content_hash in changed.items():
+            key = _manifest_key(path, corpus_path)
+            new_ids = produced.get(key)
+            if new_ids is None or failed.intersection(new_ids):
+                continue
 
-            chunks = self.chunker.chunk_document(document)
-            all_chunks.extend(chunks)
+            stale.extend(set(self.manifest.chunk_ids(key)) - set(new_ids))
+            self.manifest.record(key, content_hash, config_hash, new_ids)
 
-            print(f"  Created {len(chunks)} chunks")
+        for key in removed:
+            stale.extend(self.manifest.chunk_ids(key))
+            self.manifest.remove(key)
 
-        print(f"Total chunks created: {len(all_chunks)}")
-        return all_chunks
+        return sorted(stale)
 
-    def ingest_to_pinecone(self, chunks: List[DocumentChunk]) -> None:
+    def ingest_to_pinecone(self, chunks: Iterable[ChunkRecord]) -> UpsertReport:
         """
         Ingest chunks into Pinecone vector database.
 
         Args:
-            chunks: List of document chunks to ingest
+            chunks: Chunk records to ingest (a generator is consumed lazily)
+
+        Returns:
+            Report of upserted and failed chunk ids
         """
-        print(f"\nIngesting {len(chunks)} chunks to Pinecone...")
+        print("\nIngesting chunks to Pinecone...")
 
         # Create index if it doesn't exist
         self.vector_store.create_index_if_not_exists()
 
         # Upsert chunks
-        self.vector_store.upsert_chunks(chunks, batch_size=self.config.upsert_batch_size)
+        report = self.vector_store.upsert_chunks(chunks, batch_size=self.config.upsert_batch_size)
+        if not report.ok:
+            print(
+                f"⚠️  {len(report.embedding_failed_ids)} chunks failed to embed and "
+                f"{len(report.failed_ids)} failed to upsert; re-run ingestion to retry them"
+            )
 
         # Print final stats
         stats = self.vector_store.get_index_stats()
         print("\nIngestion complete!")
         print(f"Index stats: {stats}")
 
-    def run_ingestion(self, corpus_path: Path) -> None:
+        cache = self.vector_store.embedder.cache
+        if cache is not None:
+            print(
+                f"Embedding cache: {cache.hits} hits, {cache.misses} misses "
+                f"({cache.hit_ratio:.1%} hit ratio)"
+            )
+        return report
+
+    def run_ingestion(self, corpus_path: Path, full: bool = False) -> None:
         """
-        Run the complete ingestion pipeline.
+        Run the ingestion pipeline for documents added or changed since the last run.
 
         Args:
             corpus_path: Path to the corpus directory
+            full: Re-ingest every document regardless of the manifest
         """
-        print("🚀 Starting AI Pocket Projects Corpus Ingestion")
-        print("=" * 50)
-
-        # Step 1: Discover documents
-        document_paths = self.discover_documents(corpus_path)
-
-        if not document_paths:
-            print("❌ No documents found in corpus directory!")
-            return
-
-        # Step 2: Process documents
-        documents = self.process_documents(document_paths)
-
-        if not documents:
-            print("❌ No documents were successfully processed!")
-            return
-
-        # Step 3: Chunk documents
-        chunks = self.chunk_documents(documents)
-
-        if not chunks:
-            print("❌ No chunks were created!")
-            return
-
-        # Step 4: Ingest to Pinecone
-        self.ingest_to_pinecone(chunks)
-
-        print("\n✅ Ingestion pipeline completed successfully!")
+        try:
+            print("🚀 Starting AI Pocket Projects Corpus Ingestion")
+            print("=" * 50)
+
+            # Step 1: Discover documents
+            document_paths = self.discover_documents(corpus_path)
+
+            if not document_paths:
+                print("❌ No documents found in corpus directory!")
+                return
+
+            # Step 2: Skip documents unchanged since the last run
+            changed, removed = self.plan_changes(document_paths, corpus_path, full=full)
+            print(
+                f"\n{len(changed)} new or changed, {len(document_paths) - len(changed)} unchanged, "
+                f"{len(removed)} removed"
+            )
+
+            if not changed and not removed:
+                print("\n✅ Corpus unchanged since the last run; nothing to ingest.")
+                return
+
+            # Step 3: Stream documents through extraction, chunking, embedding and upsert,
+            # so the first vectors land while later files are still being parsed
+            produced: Dict[str, List[str]] = {}
+            report = None
+            if changed:
+                processed = self.iter_processed(
+                    list(changed), file_hashes=changed, corpus_path=corpus_path
+                )
+                report = self.ingest_to_pinecone(self.iter_chunks(processed, produced, corpus_path))
+
+                if not produced:
+                    print("❌ No documents were successfully processed!")
+                elif not any(produced.values()):
+                    print("❌ No chunks were created!")
+
+            # Step 4: Delete vectors of removed documents and chunks that disappeared
+            stale = self.update_manifest(corpus_path, changed, removed, produced, report)
+            if stale:
+                if self.vector_store.index is None:
+                    self.vector_store.create_index_if_not_exists()
+                self.vector_store.delete_vectors(stale)
+            self.manifest.save()
+
+            print("\n✅ Ingestion pipeline completed successfully!")
+        finally:
+            # Stop PDF page workers and close the extraction cache, even on failure
+            self.doc_processor.close()
 
 
 def main():
@@ -181,6 +484,18 @@ def main():
         type=str,
         help="Path to the corpus directory (overrides config)",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-ingest every document, ignoring the ingest manifest",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes for extraction and chunking (default: 1, 0 = one per CPU core)",
+    )
 
     args = parser.parse_args()
 
@@ -203,8 +518,9 @@ def main():
         sys.exit(1)
 
     # Run ingestion
-    ingester = CorpusIngester(config)
-    ingester.run_ingestion(corpus_path)
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    ingester = CorpusIngester(config, workers=workers)
+    ingester.run_ingestion(corpus_path, full=args.full)
 
 
 if __name__ == "__main__":
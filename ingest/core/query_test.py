@@ -167,11 +167,14 @@ def main():
         index_name=config.index_name,
         embedding_model=config.model,
         embedding_dimensions=config.dimensions,
+        backend=config.vector_backend,
+        local_index_path=config.local_index_path,
+        ivf_lists=config.ivf_lists,
     )
 
     # Connect to existing index
     try:
-        vector_store.index = vector_store.pc.Index(config.index_name)
+        vector_store.connect_to_index()
 
         # Check if index has data
         stats = vector_store.get_index_stats()
@@ -3,9 +3,9 @@ Pydantic models for the ingestion system.
 Provides data validation, serialization, and type safety.
 """
 
-from .chunk import ChunkMetadata, DocumentChunk
+from .chunk import ChunkMetadata, ChunkRecord, DocumentChunk
 from .config import IngestionConfig
-from .document import DocumentMetadata, ProcessedDocument
+from .document import DocumentMetadata, ProcessedDocument, StreamedDocument
 from .enums import FileType
 from .exceptions import (
     ChunkingError,
@@ -21,14 +21,18 @@ from .protocols import (
     VectorStore,
 )
 from .search import SearchResult
+from .upsert import UpsertReport
 
 __all__ = [
     # Data Models
     "ProcessedDocument",
+    "StreamedDocument",
     "DocumentMetadata",
     "DocumentChunk",
     "ChunkMetadata",
+    "ChunkRecord",
     "SearchResult",
+    "UpsertReport",
     "IngestionConfig",
     # Enums
     "FileType",
@@ -2,12 +2,16 @@
 Chunk - related Pydantic models.
 """
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .enums import FileType
 
+# Longest chunk id accepted
+MAX_CHUNK_ID_LENGTH = 200
+
 
 class ChunkMetadata(BaseModel):
     """Metadata for a document chunk with validation."""
@@ -40,7 +44,7 @@ class DocumentChunk(BaseModel):
         if not v or not v.strip():
             raise ValueError("Chunk ID cannot be empty")
         # Basic validation - could be more specific
-        if len(v) > 200:
+        if len(v) > MAX_CHUNK_ID_LENGTH:
             raise ValueError("Chunk ID too long")
         return v
 
@@ -51,3 +55,78 @@ class DocumentChunk(BaseModel):
         if not v or not v.strip():
             raise ValueError("Chunk content cannot be empty")
         return v
+
+
+@dataclass(slots=True)
+class ChunkRecord:
+    """
+    Compact, unvalidated chunk for the ingest hot path.
+
+    Chunks flowing from chunking through embedding to upsert are built as
+    records instead of DocumentChunk models: the source document was validated
+    when it entered the pipeline, and the chunker upholds the remaining
+    invariants by construction (non-blank content, non-negative counts, pages
+    numbered from 1, ids of at most MAX_CHUNK_ID_LENGTH characters). to_chunk
+    validates a record where a DocumentChunk is handed out.
+    """
+
+    id: str
+    content: str
+    file_name: str
+    file_type: FileType
+    document_title: str
+    chunk_index: int
+    token_count: int
+    char_count: int
+    section_header: Optional[str] = None
+    page_number: Optional[int] = None
+
+    @classmethod
+    def from_chunk(cls, chunk: DocumentChunk) -> "ChunkRecord":
+        """Convert a validated DocumentChunk into a record."""
+        metadata = chunk.metadata
+        return cls(
+            id=chunk.id,
+            content=chunk.content,
+            file_name=metadata.file_name,
+            file_type=metadata.file_type,
+            document_title=metadata.document_title,
+            chunk_index=metadata.chunk_index,
+            token_count=metadata.token_count,
+            char_count=metadata.char_count,
+            section_header=metadata.section_header,
+            page_number=metadata.page_number,
+        )
+
+    def to_chunk(self) -> DocumentChunk:
+        """Validate the record into a DocumentChunk."""
+        return DocumentChunk(
+            id=self.id,
+            content=self.content,
+            metadata=ChunkMetadata(
+                file_name=self.file_name,
+                file_type=self.file_type,
+                document_title=self.document_title,
+                chunk_index=self.chunk_index,
+                token_count=self.token_count,
+                char_count=self.char_count,
+                section_header=self.section_header,
+                page_number=self.page_number,
+            ),
+        )
+
+    def vector_metadata(self) -> Dict[str, Any]:
+        """Metadata fields that are set, as ChunkMetadata.model_dump() without the Nones."""
+        metadata = {
+            "file_name": self.file_name,
+            "file_type": self.file_type,
+            "document_title": self.document_title,
+            "chunk_index": self.chunk_index,
+            "token_count": self.token_count,
+            "char_count": self.char_count,
+        }
+        if self.section_header is not None:
+            metadata["section_header"] = self.section_header
+        if self.page_number is not None:
+            metadata["page_number"] = self.page_number
+        return metadata
@@ -2,7 +2,9 @@
 Configuration Pydantic model.
 """
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class IngestionConfig(BaseModel):
@@ -12,8 +14,12 @@ class IngestionConfig(BaseModel):
 
     # API Configuration
     openai_api_key: str = Field(..., min_length=1, description="OpenAI API key")
-    pinecone_api_key: str = Field(..., min_length=1, description="Pinecone API key")
-    pinecone_environment: str = Field(..., min_length=1, description="Pinecone environment")
+    pinecone_api_key: str = Field(
+        default="", description="Pinecone API key (required for the pinecone backend)"
+    )
+    pinecone_environment: str = Field(
+        default="", description="Pinecone environment (required for the pinecone backend)"
+    )
 
     # Database Configuration
     index_name: str = Field(
@@ -21,6 +27,17 @@ class IngestionConfig(BaseModel):
         min_length=1,
         description="Pinecone index name",
     )
+    vector_backend: Literal["pinecone", "local"] = Field(
+        default="pinecone", description="Vector index backend"
+    )
+    local_index_path: str = Field(
+        default="data/local_index",
+        min_length=1,
+        description="Directory for the local vector index",
+    )
+    ivf_lists: int = Field(
+        default=0, ge=0, description="IVF partitions for the local index (0 = brute force)"
+    )
 
     # Embedding Configuration
     model: str = Field(
@@ -41,11 +58,64 @@ class IngestionConfig(BaseModel):
     upsert_batch_size: int = Field(
         default=100, gt=0, le=1000, description="Batch size for vector upserts"
     )
+    embedding_max_batch_tokens: int = Field(
+        default=100_000, gt=0, le=300_000, description="Maximum tokens per embedding request"
+    )
+    embedding_concurrency: int = Field(
+        default=4, gt=0, le=64, description="Embedding requests kept in flight"
+    )
+    embedding_max_retries: int = Field(
+        default=5, ge=0, description="Retries per embedding batch on rate limits and errors"
+    )
+    upsert_queue_depth: int = Field(
+        default=4, gt=0, description="Embedded upsert batches buffered ahead of the upsert stage"
+    )
+    upsert_concurrency: int = Field(
+        default=4, gt=0, le=64, description="Upsert requests kept in flight"
+    )
+    upsert_max_retries: int = Field(
+        default=5, ge=0, description="Retries per upsert batch on throttling and transient errors"
+    )
+    upsert_max_payload_bytes: int = Field(
+        default=2 * 1024 * 1024,
+        gt=0,
+        le=2 * 1024 * 1024,
+        description="Maximum serialized size of one upsert request (Pinecone caps it at 2 MB)",
+    )
+    embedding_cache_path: str = Field(
+        default="data/embedding_cache.sqlite3",
+        description="SQLite cache of chunk embeddings keyed by text hash (empty disables)",
+    )
+    extraction_cache_path: str = Field(
+        default="data/extracted_text.sqlite3",
+        description="SQLite cache of extracted PDF text keyed by file hash (empty disables)",
+    )
+    pdf_workers: int = Field(
+        default=1, gt=0, description="Processes extracting the pages of one large PDF"
+    )
+    slow_page_seconds: float = Field(
+        default=2.0, gt=0, description="Report PDF pages taking at least this long to extract"
+    )
+    stream_threshold_bytes: int = Field(
+        default=32 * 1024 * 1024,
+        ge=0,
+        description="Text and Markdown files larger than this are streamed paragraph by paragraph",
+    )
+    failed_batch_journal: str = Field(
+        default="data/failed_embeddings.jsonl",
+        min_length=1,
+        description="JSONL file recording embedding batches that failed after retries",
+    )
 
     # Path Configuration
     corpus_path: str = Field(
         default="data/corpus", min_length=1, description="Path to corpus directory"
     )
+    manifest_path: str = Field(
+        default="data/ingest_manifest.json",
+        min_length=1,
+        description="Manifest of ingested files used to skip unchanged ones",
+    )
 
     # Logging Configuration
     level: str = Field(default="INFO", description="Logging level")
@@ -68,3 +138,13 @@ class IngestionConfig(BaseModel):
         if v <= 0:
             raise ValueError("Chunk sizes must be positive")
         return v
+
+    @model_validator(mode="after")
+    def validate_backend_credentials(self) -> "IngestionConfig":
+        """Require Pinecone credentials only when the Pinecone backend is used."""
+        if self.vector_backend == "pinecone":
+            if not self.pinecone_api_key or not self.pinecone_environment:
+                raise ValueError(
+                    "pinecone_api_key and pinecone_environment are required for the pinecone backend"
+                )
+        return self
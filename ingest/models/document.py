@@ -2,6 +2,8 @@
 Document - related Pydantic models.
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .enums import FileType
@@ -19,6 +21,19 @@ class DocumentMetadata(BaseModel):
     char_count: int = Field(..., ge=0, description="Number of characters in the document")
 
 
+class StreamedDocument(BaseModel):
+    """A document too large to hold in memory, chunked from a stream of its paragraphs."""
+
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True)
+
+    file_name: str = Field(..., min_length=1, description="Name of the file")
+    file_type: FileType = Field(..., description="Type of the document file")
+    title: str = Field(..., min_length=1, description="Extracted document title")
+    source_path: Optional[str] = Field(
+        default=None, description="Path of the file relative to the corpus, if ingested from one"
+    )
+
+
 class ProcessedDocument(BaseModel):
     """A fully processed document with content and metadata."""
 
@@ -27,6 +42,9 @@ class ProcessedDocument(BaseModel):
     file_name: str = Field(..., min_length=1, description="Name of the file")
     file_type: FileType = Field(..., description="Type of the document file")
     title: str = Field(..., min_length=1, description="Extracted document title")
+    source_path: Optional[str] = Field(
+        default=None, description="Path of the file relative to the corpus, if ingested from one"
+    )
     content: str = Field(..., min_length=1, description="Processed document content")
     token_count: int = Field(..., ge=0, description="Number of tokens in the document")
     char_count: int = Field(..., ge=0, description="Number of characters in the document")
@@ -3,11 +3,12 @@ Protocol definitions for the ingestion system.
 """
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Union
 
-from .chunk import DocumentChunk
+from .chunk import ChunkRecord, DocumentChunk
 from .document import ProcessedDocument
 from .search import SearchResult
+from .upsert import UpsertReport
 
 
 class TokenEncoder(Protocol):
@@ -21,6 +22,10 @@ class TokenEncoder(Protocol):
         """Decode tokens to text."""
         ...
 
+    def tokenize(self, text: str) -> Any:
+        """Encode text once, returning it with the character offset of every token."""
+        ...
+
 
 class DocumentProcessor(Protocol):
     """Protocol for document processing."""
@@ -53,7 +58,9 @@ class VectorStore(Protocol):
         """Create index if it doesn't exist."""
         ...
 
-    def upsert_chunks(self, chunks: List[DocumentChunk], batch_size: int = 100) -> None:
+    def upsert_chunks(
+        self, chunks: Iterable[Union[ChunkRecord, DocumentChunk]], batch_size: int = 100
+    ) -> UpsertReport:
         """Upsert chunks to the vector store."""
         ...
 
@@ -0,0 +1,27 @@
+"""
+Upsert-related Pydantic models.
+"""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class UpsertReport(BaseModel):
+    """Outcome of embedding and upserting a set of chunks."""
+
+    succeeded_ids: List[str] = Field(default_factory=list, description="Vector ids upserted")
+    failed_ids: List[str] = Field(
+        default_factory=list, description="Vector ids whose upsert batch failed after retries"
+    )
+    embedding_failed_ids: List[str] = Field(
+        default_factory=list,
+        description="Chunk ids never upserted because their embedding batch failed",
+    )
+    batches: int = Field(default=0, ge=0, description="Upsert requests that succeeded")
+    retries: int = Field(default=0, ge=0, description="Upsert requests retried")
+
+    @property
+    def ok(self) -> bool:
+        """Whether every chunk was embedded and upserted."""
+        return not self.failed_ids and not self.embedding_failed_ids
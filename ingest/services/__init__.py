@@ -4,10 +4,18 @@ Services for the ingestion system.
 
 from .chunking_service import DocumentChunkingService
 from .document_processor_service import DocumentProcessorService
+from .embedding_cache import EmbeddingCache
+from .embedding_service import EmbeddingService
+from .ingest_manifest import IngestManifest
+from .local_index import LocalVectorIndex
 from .pinecone_client import PineconeVectorStore
 
 __all__ = [
     "DocumentProcessorService",
     "DocumentChunkingService",
     "PineconeVectorStore",
+    "EmbeddingService",
+    "EmbeddingCache",
+    "IngestManifest",
+    "LocalVectorIndex",
 ]
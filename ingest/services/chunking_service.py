@@ -3,17 +3,41 @@ Document chunking service with structure - aware strategies.
 Implements the Single Responsibility Principle and Strategy Pattern.
 """
 
+import hashlib
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
-
-from ..models import ChunkingError, ChunkMetadata, DocumentChunk, ProcessedDocument
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..models import (
+    ChunkingError,
+    ChunkRecord,
+    DocumentChunk,
+    FileType,
+    ProcessedDocument,
+    StreamedDocument,
+)
+from ..models.chunk import MAX_CHUNK_ID_LENGTH
 from ..utils import (
     MarkdownSectionSplitter,
     ParagraphSplitter,
     SentenceSplitter,
+    Span,
     TiktokenEncoder,
+    TokenizedText,
 )
+from ..utils.text_splitter import strip_span
+
+# Bump whenever chunking output changes, so the ingest manifest re-ingests every file
+CHUNKER_VERSION = "2"
+
+# Marker the PDF extractor writes at the start of every page
+PAGE_MARKER = re.compile(r"^--- Page (\d+) ---", re.MULTILINE)
+
+# Characters of streamed paragraphs tokenized and packed into chunks at a time
+STREAM_WINDOW_CHARS = 1_000_000
+
+# A document whose chunks carry its file name, type and title
+Document = Union[ProcessedDocument, StreamedDocument]
 
 
 class ChunkingStrategy(ABC):
@@ -22,7 +46,7 @@ class ChunkingStrategy(ABC):
     @abstractmethod
     def chunk(
         self, document: ProcessedDocument, chunker: "DocumentChunkingService"
-    ) -> List[DocumentChunk]:
+    ) -> List[ChunkRecord]:
         """Chunk a document using this strategy."""
 
 
@@ -35,15 +59,16 @@ class MarkdownChunkingStrategy(ChunkingStrategy):
 
     def chunk(
         self, document: ProcessedDocument, chunker: "DocumentChunkingService"
-    ) -> List[DocumentChunk]:
+    ) -> List[ChunkRecord]:
         """Chunk Markdown document respecting section structure."""
         chunks = []
+        tokenized = chunker._tokenize(document)
 
         # Split by headers first
-        sections = self._section_splitter.split(document.content)
-
-        for section in sections:
-            section_chunks = chunker._chunk_section(document, section)
+        for section in self._section_splitter.sections(tokenized.text):
+            section_chunks = chunker._chunk_section(
+                document, tokenized, section.start, section.end, section.header
+            )
             chunks.extend(section_chunks)
 
         return chunks
@@ -54,23 +79,26 @@ class PDFChunkingStrategy(ChunkingStrategy):
 
     def chunk(
         self, document: ProcessedDocument, chunker: "DocumentChunkingService"
-    ) -> List[DocumentChunk]:
+    ) -> List[ChunkRecord]:
         """Chunk PDF document with page awareness."""
         chunks = []
-
-        # Split by pages first
-        pages = document.content.split("--- Page ")
-
-        for i, page_content in enumerate(pages):
-            if not page_content.strip():
+        tokenized = chunker._tokenize(document)
+        text = tokenized.text
+
+        # Split by pages first; each page keeps its marker for context
+        markers = list(PAGE_MARKER.finditer(text))
+        pages = [(0, markers[0].start() if markers else len(text), 1)]
+        for i, marker in enumerate(markers):
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+            pages.append((marker.start(), end, int(marker.group(1))))
+
+        for start, end, page_num in pages:
+            if strip_span(text, start, end) is None:
                 continue
 
-            # Add page number back for context
-            if i > 0:
-                page_content = f"--- Page {page_content}"
-
-            page_num = i + 1 if i > 0 else 1
-            page_chunks = chunker._chunk_text_content(document, page_content, page_num=page_num)
+            page_chunks = chunker._chunk_text_content(
+                document, tokenized, start, end, page_num=page_num
+            )
             chunks.extend(page_chunks)
 
         return chunks
@@ -81,9 +109,10 @@ class TextChunkingStrategy(ChunkingStrategy):
 
     def chunk(
         self, document: ProcessedDocument, chunker: "DocumentChunkingService"
-    ) -> List[DocumentChunk]:
+    ) -> List[ChunkRecord]:
         """Chunk plain text document."""
-        return chunker._chunk_text_content(document, document.content)
+        tokenized = chunker._tokenize(document)
+        return chunker._chunk_text_content(document, tokenized, 0, len(tokenized.text))
 
 
 class DocumentChunkingService:
@@ -121,6 +150,7 @@ class DocumentChunkingService:
         # Initialize text splitters
         self._paragraph_splitter = ParagraphSplitter()
         self._sentence_splitter = SentenceSplitter()
+        self._section_splitter = MarkdownSectionSplitter()
 
         # Initialize chunking strategies
         self._strategies: Dict[str, ChunkingStrategy] = {
@@ -140,7 +170,29 @@ class DocumentChunkingService:
             document: Document to chunk
 
         Returns:
-            List of document chunks
+            List of validated document chunks
+
+        Raises:
+            ChunkingError: If chunking fails
+        """
+        records = self.chunk_records(document)
+        try:
+            return [record.to_chunk() for record in records]
+        except Exception as e:
+            raise ChunkingError(f"Failed to chunk document {document.file_name}: {e}") from e
+
+    def chunk_records(self, document: ProcessedDocument) -> List[ChunkRecord]:
+        """
+        Split a document into chunk records, for the ingest hot path.
+
+        Records are plain slotted objects, cheaper to build, pickle and
+        serialize than DocumentChunk models; they are not validated again.
+
+        Args:
+            document: Document to chunk
+
+        Returns:
+            List of chunk records
 
         Raises:
             ChunkingError: If chunking fails
@@ -160,155 +212,261 @@ class DocumentChunkingService:
         except Exception as e:
             raise ChunkingError(f"Failed to chunk document {document.file_name}: {e}") from e
 
+    def chunk_stream(
+        self, document: StreamedDocument, paragraphs: Iterable[str]
+    ) -> Iterator[ChunkRecord]:
+        """
+        Chunk a document from a stream of its paragraphs, in bounded memory.
+
+        Paragraphs are gathered into windows of about STREAM_WINDOW_CHARS, each
+        tokenized once and packed like a text document. The last, still-open
+        chunk of a window is carried into the next one, so chunks flow across
+        window edges. Markdown header lines (outside code fences) start a new
+        section, as in chunk_document.
+
+        Args:
+            document: The streamed document's file name, type and title
+            paragraphs: The document's paragraphs in order
+
+        Yields:
+            Chunk records, numbered across the whole document
+
+        Raises:
+            ChunkingError: If chunking fails
+        """
+        self._global_chunk_index = 0
+        markdown = document.file_type == FileType.MARKDOWN
+        header: Optional[str] = "" if markdown else None
+        fence = ""
+        window: List[str] = []
+        window_chars = 0
+
+        try:
+            for paragraph in paragraphs:
+                if markdown:
+                    headers, fence = self._section_splitter.header_lines(paragraph, fence)
+                    start = 0
+                    for offset, next_header, _ in headers:
+                        window.append(paragraph[start:offset])
+                        yield from self._chunk_window(document, window, header, final=True)
+                        window, window_chars, start = [], 0, offset
+                        header = next_header
+                    paragraph = paragraph[start:]
+
+                window.append(paragraph)
+                window_chars += len(paragraph)
+                if window_chars >= STREAM_WINDOW_CHARS:
+                    yield from self._chunk_window(document, window, header, final=False)
+                    window_chars = len(window[0]) if window else 0
+
+            yield from self._chunk_window(document, window, header, final=True)
+        except ChunkingError:
+            raise
+        except Exception as e:
+            raise ChunkingError(f"Failed to chunk document {document.file_name}: {e}") from e
+
+    def _chunk_window(
+        self,
+        document: StreamedDocument,
+        window: List[str],
+        header: Optional[str],
+        final: bool,
+    ) -> List[ChunkRecord]:
+        """
+        Chunk a window of streamed paragraphs.
+
+        A final window ends its section and is chunked like a whole section. The
+        open last chunk of any other window is not emitted; the window is
+        replaced (in place) by that chunk's text, to be continued by the
+        following paragraphs.
+        """
+        text = "\n\n".join(part for part in window if part.strip())
+        if not text:
+            window.clear()
+            return []
+
+        tokenized = self._token_encoder.tokenize(text)
+        if final:
+            window.clear()
+            if header is None:
+                return self._chunk_text_content(document, tokenized, 0, len(text))
+            return self._chunk_section(document, tokenized, 0, len(text), header)
+
+        spans, last = self._pack(tokenized, 0, len(text))
+        window[:] = [text[last[0] :]] if last is not None else []
+        return self._span_chunks(document, tokenized, spans, header)
+
+    def _tokenize(self, document: ProcessedDocument) -> TokenizedText:
+        """Tokenize a document's content (reused if the encoder just tokenized it)."""
+        return self._token_encoder.tokenize(document.content)
+
     def _chunk_section(
-        self, document: ProcessedDocument, section: Dict[str, Any]
-    ) -> List[DocumentChunk]:
+        self,
+        document: Document,
+        tokenized: TokenizedText,
+        start: int,
+        end: int,
+        header: str = "",
+    ) -> List[ChunkRecord]:
         """Chunk a document section intelligently."""
-        content = section["content"]
-        header = section.get("header", "")
-
         # If section is small enough, keep as single chunk
-        token_count = self._token_encoder.count_tokens(content)
-        if token_count <= self.chunk_size:
-            chunk = self._create_chunk(
-                document, content, self._global_chunk_index, section_header=header
-            )
+        if tokenized.count(start, end) <= self.chunk_size:
+            chunk = self._create_span_chunk(document, tokenized, start, end, section_header=header)
             self._global_chunk_index += 1
             return [chunk]
 
         # Otherwise, chunk the content
-        return self._chunk_text_content(document, content, section_header=header)
+        return self._chunk_text_content(document, tokenized, start, end, section_header=header)
+
+    def _units(self, tokenized: TokenizedText, start: int, end: int) -> Iterator[Span]:
+        """Yield paragraph spans, splitting paragraphs over max_chunk_size into sentences."""
+        text = tokenized.text
+        for paragraph_start, paragraph_end in self._paragraph_splitter.spans(text, start, end):
+            if tokenized.count(paragraph_start, paragraph_end) > self.max_chunk_size:
+                yield from self._sentence_splitter.spans(text, paragraph_start, paragraph_end)
+            else:
+                yield paragraph_start, paragraph_end
 
     def _chunk_text_content(
         self,
-        document: ProcessedDocument,
-        content: str,
+        document: Document,
+        tokenized: TokenizedText,
+        start: int,
+        end: int,
         section_header: Optional[str] = None,
         page_num: Optional[int] = None,
-    ) -> List[DocumentChunk]:
-        """Chunk text content with semantic awareness."""
-        # Split into paragraphs first (better than sentences for most content)
-        paragraphs = self._paragraph_splitter.split(content)
-        chunks: List[DocumentChunk] = []
-        current_chunk: List[str] = []
-        current_tokens = 0
-
-        for paragraph in paragraphs:
-            paragraph_tokens = self._token_encoder.count_tokens(paragraph)
-
-            # If single paragraph is too large, split it further
-            if paragraph_tokens > self.max_chunk_size:
-                # Split large paragraph by sentences
-                sentences = self._sentence_splitter.split(paragraph)
-                for sentence in sentences:
-                    sentence_tokens = self._token_encoder.count_tokens(sentence)
-
-                    if current_tokens + sentence_tokens > self.chunk_size and current_chunk:
-                        current_chunk, current_tokens = self._finalize_and_start_new_chunk(
-                            chunks,
-                            current_chunk,
-                            document,
-                            section_header,
-                            page_num,
-                        )
-
-                    current_chunk.append(sentence)
-                    current_tokens += sentence_tokens
-            else:
-                # Normal paragraph processing
-                if current_tokens + paragraph_tokens > self.chunk_size and current_chunk:
-                    current_chunk, current_tokens = self._finalize_and_start_new_chunk(
-                        chunks, current_chunk, document, section_header, page_num
-                    )
-
-                current_chunk.append(paragraph)
-                current_tokens += paragraph_tokens
-
-        # Add final chunk if there's content
-        if current_chunk:
-            chunk_text = "\n\n".join(current_chunk)
-            if self._token_encoder.count_tokens(chunk_text) >= self.min_chunk_size:
-                chunks.append(
-                    self._create_chunk(
-                        document,
-                        chunk_text,
-                        self._global_chunk_index,
-                        section_header=section_header,
-                        page_num=page_num,
-                    )
-                )
-                self._global_chunk_index += 1
-
-        return chunks
+    ) -> List[ChunkRecord]:
+        """
+        Chunk a span of the document with semantic awareness.
 
-    def _finalize_and_start_new_chunk(
-        self,
-        chunks: List[DocumentChunk],
-        current_chunk: List[str],
-        document: ProcessedDocument,
-        section_header: Optional[str] = None,
-        page_num: Optional[int] = None,
-    ) -> tuple[List[str], int]:
+        Paragraphs (or the sentences of oversized paragraphs) are packed into
+        chunks of up to chunk_size tokens. Every chunk is a contiguous span of
+        the document, and each new chunk starts chunk_overlap tokens before the
+        end of the previous one, so token counts and overlaps come from the
+        document's token offsets instead of re-encoding chunk text.
+        """
+        spans, last = self._pack(tokenized, start, end)
+        if last is not None and tokenized.count(*last) >= self.min_chunk_size:
+            spans.append(last)
+        return self._span_chunks(document, tokenized, spans, section_header, page_num)
+
+    def _pack(
+        self, tokenized: TokenizedText, start: int, end: int
+    ) -> Tuple[List[Span], Optional[Span]]:
         """
-        Finalize current chunk, add it to chunks list, and start new chunk with overlap.
+        Pack the units of a span into chunk spans.
 
         Returns:
-            Tuple of (new current_chunk list, new current_tokens count)
+            Tuple of (spans of the chunks closed by a following unit, span of the
+            still-open last chunk or None if it holds only overlap)
         """
-        chunk_text = "\n\n".join(current_chunk)
-        chunks.append(
-            self._create_chunk(
-                document,
-                chunk_text,
-                self._global_chunk_index,
-                section_header=section_header,
-                page_num=page_num,
+        spans: List[Span] = []
+        chunk_start: Optional[int] = None
+        chunk_end = start
+        # Whether the current chunk has content beyond the previous chunk's overlap
+        has_new_content = False
+
+        for unit_start, unit_end in self._units(tokenized, start, end):
+            if (
+                has_new_content
+                and chunk_start is not None
+                and tokenized.count(chunk_start, unit_end) > self.chunk_size
+            ):
+                spans.append((chunk_start, chunk_end))
+                chunk_start = self._overlap_start(tokenized, chunk_start, chunk_end)
+
+            if chunk_start is None:
+                chunk_start = unit_start
+            chunk_end = unit_end
+            has_new_content = True
+
+        if has_new_content and chunk_start is not None:
+            return spans, (chunk_start, chunk_end)
+        return spans, None
+
+    def _span_chunks(
+        self,
+        document: Document,
+        tokenized: TokenizedText,
+        spans: List[Span],
+        section_header: Optional[str] = None,
+        page_num: Optional[int] = None,
+    ) -> List[ChunkRecord]:
+        """Create numbered chunks from spans of the document."""
+        chunks = []
+        for start, end in spans:
+            chunks.append(
+                self._create_span_chunk(document, tokenized, start, end, section_header, page_num)
             )
-        )
-        self._global_chunk_index += 1
-
-        # Start new chunk with overlap
-        overlap_text = self._get_overlap_text(chunk_text)
-        new_chunk = [overlap_text] if overlap_text else []
-        new_tokens = self._token_encoder.count_tokens("\n\n".join(new_chunk))
-
-        return new_chunk, new_tokens
+            self._global_chunk_index += 1
+        return chunks
 
-    def _get_overlap_text(self, chunk_text: str) -> str:
-        """Get overlap text from the end of a chunk."""
-        tokens = self._token_encoder.encode(chunk_text)
-        if len(tokens) <= self.chunk_overlap:
-            return chunk_text
+    def _overlap_start(self, tokenized: TokenizedText, start: int, end: int) -> Optional[int]:
+        """Offset chunk_overlap tokens before the end of a chunk (None without overlap)."""
+        if self.chunk_overlap <= 0:
+            return None
+        first = tokenized.token_index(start)
+        last = tokenized.token_index(end)
+        return tokenized.char_offset(max(first, last - self.chunk_overlap))
 
-        overlap_tokens = tokens[-self.chunk_overlap :]
-        return self._token_encoder.decode(overlap_tokens)
+    def _create_span_chunk(
+        self,
+        document: Document,
+        tokenized: TokenizedText,
+        start: int,
+        end: int,
+        section_header: Optional[str] = None,
+        page_num: Optional[int] = None,
+    ) -> ChunkRecord:
+        """Create a chunk from a span of the document, trimmed of surrounding whitespace."""
+        start, end = strip_span(tokenized.text, start, end) or (start, end)
+        return self._create_chunk(
+            document,
+            tokenized.text[start:end],
+            self._global_chunk_index,
+            section_header=section_header,
+            page_num=page_num,
+            token_count=tokenized.count(start, end),
+        )
 
     def _create_chunk(
         self,
-        document: ProcessedDocument,
+        document: Document,
         chunk_text: str,
         chunk_index: int,
         section_header: Optional[str] = None,
         page_num: Optional[int] = None,
-    ) -> DocumentChunk:
-        """Create a chunk dictionary with enhanced metadata."""
-        # Create unique chunk ID
-        chunk_id = f"{document.file_name}_{chunk_index}"
+        token_count: Optional[int] = None,
+    ) -> ChunkRecord:
+        """Create a chunk record with enhanced metadata."""
+        # Create unique chunk ID; files of the same name in different corpus
+        # folders are told apart by a short hash of their relative path
+        id_prefix = document.file_name
+        if document.source_path:
+            path_hash = hashlib.sha256(document.source_path.encode("utf-8")).hexdigest()[:8]
+            id_prefix = f"{document.file_name}_{path_hash}"
+        chunk_id = f"{id_prefix}_{chunk_index}"
         if section_header:
             # Clean section header for ID
             clean_header = re.sub(r"[^\w\s-]", "", section_header).strip()
             clean_header = re.sub(r"\s+", "_", clean_header)[:50]  # Limit length
-            chunk_id = f"{document.file_name}_{clean_header}_{chunk_index}"
+            chunk_id = f"{id_prefix}_{clean_header}_{chunk_index}"
+        if len(chunk_id) > MAX_CHUNK_ID_LENGTH:
+            raise ChunkingError(f"Chunk ID too long: {chunk_id}")
 
-        metadata = ChunkMetadata(
+        return ChunkRecord(
+            id=chunk_id,
+            content=chunk_text,
             file_name=document.file_name,
             file_type=document.file_type,
             document_title=document.title,
             chunk_index=chunk_index,
-            token_count=self._token_encoder.count_tokens(chunk_text),
+            token_count=(
+                token_count
+                if token_count is not None
+                else self._token_encoder.count_tokens(chunk_text)
+            ),
             char_count=len(chunk_text),
             section_header=section_header,
             page_number=page_num,
         )
-
-        return DocumentChunk(id=chunk_id, content=chunk_text, metadata=metadata)
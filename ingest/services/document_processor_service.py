@@ -3,10 +3,11 @@ Document processing service that orchestrates content extraction and title extra
 Implements the Single Responsibility Principle and Dependency Injection.
 """
 
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
-from ..models import FileType, ProcessedDocument, ProcessingError
+from ..models import FileType, ProcessedDocument, ProcessingError, StreamedDocument
 from ..utils import (
     DocumentContentExtractor,
     DocumentTitleExtractor,
@@ -14,6 +15,13 @@ from ..utils import (
     TiktokenEncoder,
 )
 
+# File types that can be streamed paragraph by paragraph
+STREAMABLE_SUFFIXES = frozenset({".md", ".txt"})
+
+# Leading paragraphs searched for a streamed document's title (the title
+# extractor only looks at the first lines)
+TITLE_PARAGRAPHS = 10
+
 
 class DocumentProcessorService:
     """
@@ -29,6 +37,7 @@ class DocumentProcessorService:
         title_extractor: Optional[DocumentTitleExtractor] = None,
         token_encoder: Optional[TiktokenEncoder] = None,
         text_cleaner: Optional[TextCleaner] = None,
+        stream_threshold_bytes: int = 32 * 1024 * 1024,
     ) -> None:
         """
         Initialize the document processor service.
@@ -38,18 +47,26 @@ class DocumentProcessorService:
             title_extractor: Service for extracting titles from documents
             token_encoder: Service for encoding text to tokens
             text_cleaner: Service for cleaning text content
+            stream_threshold_bytes: Text and Markdown files larger than this are
+                streamed paragraph by paragraph instead of read whole
         """
         self._content_extractor = content_extractor or DocumentContentExtractor()
         self._title_extractor = title_extractor or DocumentTitleExtractor()
         self._token_encoder = token_encoder or TiktokenEncoder()
         self._text_cleaner = text_cleaner or TextCleaner()
+        self.stream_threshold_bytes = stream_threshold_bytes
 
-    def process_file(self, file_path: Path) -> Optional[ProcessedDocument]:
+    def process_file(
+        self, file_path: Path, file_hash: Optional[str] = None, source_path: Optional[str] = None
+    ) -> Optional[ProcessedDocument]:
         """
         Process a single file and extract its content with enhanced metadata.
 
         Args:
             file_path: Path to the file to process
+            file_hash: The file's content hash, if already computed (saves the
+                extraction cache from hashing it again)
+            source_path: The file's path relative to the corpus, if known
 
         Returns:
             ProcessedDocument containing file metadata, content, and extracted title
@@ -57,7 +74,7 @@ class DocumentProcessorService:
         """
         try:
             # Extract raw content
-            raw_content = self._content_extractor.extract_content(file_path)
+            raw_content = self._content_extractor.extract_content(file_path, file_hash)
 
             # Clean the content
             cleaned_content = self._text_cleaner.clean_text(raw_content)
@@ -65,13 +82,14 @@ class DocumentProcessorService:
             # Extract title
             title = self._title_extractor.extract_title(file_path, cleaned_content)
 
-            # Count tokens
-            token_count = self._token_encoder.count_tokens(cleaned_content)
+            # Count tokens; a chunker sharing this encoder reuses the tokenization
+            token_count = len(self._token_encoder.tokenize(cleaned_content))
 
             return ProcessedDocument(
                 file_name=file_path.name,
                 file_type=FileType(file_path.suffix.lower()),
                 title=title,
+                source_path=source_path,
                 content=cleaned_content,
                 token_count=token_count,
                 char_count=len(cleaned_content),
@@ -83,3 +101,69 @@ class DocumentProcessorService:
         except Exception as e:
             print(f"Unexpected error processing {file_path}: {e}")
             return None
+
+    def close(self) -> None:
+        """Release the content extractor's worker processes and cache connection."""
+        self._content_extractor.close()
+
+    def should_stream(self, file_path: Path) -> bool:
+        """
+        Check whether a file is large enough to be streamed instead of read whole.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            True for text and Markdown files over stream_threshold_bytes
+        """
+        return (
+            file_path.suffix.lower() in STREAMABLE_SUFFIXES
+            and file_path.stat().st_size > self.stream_threshold_bytes
+        )
+
+    def stream_file(
+        self, file_path: Path, source_path: Optional[str] = None
+    ) -> Optional[Tuple[StreamedDocument, Iterator[str]]]:
+        """
+        Start streaming a text or Markdown file as cleaned paragraphs.
+
+        Only the first paragraphs are read up front, to extract the title; the
+        rest of the file is read as the returned iterator is consumed.
+
+        Args:
+            file_path: Path to a text or Markdown file
+            source_path: The file's path relative to the corpus, if known
+
+        Returns:
+            Tuple of (document file name, type and title, iterator of its cleaned
+            paragraphs), None if the file cannot be read
+
+        Raises:
+            ProcessingError: While iterating, if the rest of the file cannot be read
+        """
+        try:
+            paragraphs = (
+                cleaned
+                for cleaned in map(
+                    self._text_cleaner.clean_text,
+                    self._content_extractor.iter_paragraphs(file_path),
+                )
+                if cleaned
+            )
+            head = list(islice(paragraphs, TITLE_PARAGRAPHS))
+            title = self._title_extractor.extract_title(file_path, "\n\n".join(head))
+
+            document = StreamedDocument(
+                file_name=file_path.name,
+                file_type=FileType(file_path.suffix.lower()),
+                title=title,
+                source_path=source_path,
+            )
+            return document, chain(head, paragraphs)
+
+        except ProcessingError as e:
+            print(f"Processing error for {file_path}: {e}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error processing {file_path}: {e}")
+            return None
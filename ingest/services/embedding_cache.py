@@ -0,0 +1,128 @@
+"""
+Persistent SQLite cache of chunk embeddings keyed by model, dimensions and text hash.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+
+# SQLite caps the number of bound parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+
+def hash_text(text: str) -> str:
+    """Hex SHA-256 of a text, used as the cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache so unchanged chunk texts are never re-embedded.
+
+    Vectors are stored as float32 blobs. The connection is shared between
+    threads and guarded by a lock.
+    """
+
+    def __init__(self, path: Path, model: str, dimensions: int) -> None:
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite database file
+            model: Embedding model the vectors come from
+            dimensions: Embedding dimensions
+        """
+        self.path = Path(path)
+        self.model = model
+        self.dimensions = dimensions
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL,"
+                " dimensions INTEGER NOT NULL,"
+                " text_hash TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " PRIMARY KEY (model, dimensions, text_hash))"
+            )
+
+    def _select(self, columns: str, hashes: Sequence[str]) -> Iterable[tuple]:
+        """Yield rows for the given hashes under this cache's model and dimensions."""
+        for i in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            batch = hashes[i : i + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT {columns} FROM embeddings"  # nosec B608 - fixed column names
+                    f" WHERE model = ? AND dimensions = ? AND text_hash IN ({placeholders})",
+                    (self.model, self.dimensions, *batch),
+                ).fetchall()
+            yield from rows
+
+    def contains(self, hashes: Sequence[str]) -> Set[str]:
+        """
+        Find which text hashes are cached, without loading their vectors.
+
+        Args:
+            hashes: Text hashes to look up
+
+        Returns:
+            The subset of hashes that are cached
+        """
+        return {row[0] for row in self._select("text_hash", list(set(hashes)))}
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """
+        Load cached vectors.
+
+        Args:
+            hashes: Text hashes to load
+
+        Returns:
+            Mapping of text hash to vector for the hashes that are cached
+        """
+        return {
+            text_hash: np.frombuffer(blob, dtype=np.float32).tolist()
+            for text_hash, blob in self._select("text_hash, vector", list(set(hashes)))
+        }
+
+    def put_many(self, hashes: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """
+        Store vectors.
+
+        Args:
+            hashes: Text hashes
+            vectors: One vector per hash
+        """
+        rows = [
+            (self.model, self.dimensions, text_hash, np.asarray(vector, np.float32).tobytes())
+            for text_hash, vector in zip(hashes, vectors)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+
+    def record(self, hits: int, misses: int) -> None:
+        """Add to the hit/miss counters."""
+        self.hits += hits
+        self.misses += misses
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache (0 before any lookup)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,320 @@
+"""
+Concurrent OpenAI embedding generation with token-aware batching and retries.
+"""
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Deque, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import openai
+from openai import OpenAI
+from tqdm import tqdm
+
+from ..utils import TiktokenEncoder
+from .embedding_cache import EmbeddingCache, hash_text
+
+# Errors worth retrying: throttling and transient server/network failures
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+class _Batch(NamedTuple):
+    """A planned embedding batch; embeddings is set when it was served from the cache."""
+
+    positions: List[int]
+    ids: List[str]
+    texts: List[str]
+    hashes: List[str]
+    embeddings: Optional[List[List[float]]] = None
+
+
+def jittered_backoff(attempt: int, base_delay: float, max_delay: float = 60.0) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base_delay: Delay scale in seconds
+        max_delay: Upper bound on the delay
+
+    Returns:
+        Seconds to sleep before the next attempt
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+class EmbeddingService:
+    """Generates embeddings with several batches in flight and journals failed batches."""
+
+    def __init__(
+        self,
+        client: OpenAI,
+        model: str,
+        batch_size: int = 100,
+        max_batch_tokens: int = 100_000,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
+        journal_path: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        count_tokens: Optional[Callable[[str], int]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the embedding service.
+
+        Args:
+            client: OpenAI client (thread-safe, shared by all workers)
+            model: OpenAI embedding model name
+            batch_size: Maximum texts per embedding request
+            max_batch_tokens: Maximum tokens per embedding request
+            concurrency: Embedding requests kept in flight
+            max_retries: Retries per batch on rate-limit and transient errors
+            retry_base_delay: Base delay in seconds for exponential backoff
+            journal_path: JSONL file recording batches that still failed after retries
+            cache: Persistent cache consulted before calling OpenAI
+            count_tokens: Token counter (defaults to batched tiktoken cl100k_base counts)
+            sleep: Sleep function, injectable for tests
+        """
+        self.client = client
+        self.model = model
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.journal_path = Path(journal_path) if journal_path else None
+        self.cache = cache
+        self._count_tokens = count_tokens
+        self._encoder: Optional[TiktokenEncoder] = None
+        self._sleep = sleep
+        self._journal_lock = threading.Lock()
+
+    def _count_batch(self, texts: List[str]) -> List[int]:
+        """Token counts of texts, in one tiktoken batch unless a counter was injected."""
+        if self._count_tokens is not None:
+            return [self._count_tokens(text) for text in texts]
+        if self._encoder is None:
+            self._encoder = TiktokenEncoder()
+        return self._encoder.count_tokens_batch(texts)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed one batch, backing off and retrying on retryable errors.
+
+        Args:
+            texts: Texts in the batch
+
+        Returns:
+            One embedding per text
+
+        Raises:
+            openai.OpenAIError: If the batch still fails after all retries
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.embeddings.create(model=self.model, input=texts)
+                return [item.embedding for item in response.data]
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+                self._sleep(jittered_backoff(attempt, self.retry_base_delay))
+        raise AssertionError("unreachable")
+
+    def _journal_failure(self, batch_number: int, ids: List[str], error: Exception) -> None:
+        """Append a failed batch to the journal so it can be re-ingested."""
+        if self.journal_path is None:
+            return
+
+        entry = {
+            "failed_at": datetime.now(timezone.utc).isoformat(),
+            "model": self.model,
+            "batch": batch_number,
+            "ids": ids,
+            "error": f"{type(error).__name__}: {error}",
+            "retried": isinstance(error, RETRYABLE_ERRORS),
+        }
+        with self._journal_lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def iter_batches(
+        self,
+        texts: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        show_progress: bool = True,
+    ) -> Iterator[Tuple[List[int], Optional[List[List[float]]]]]:
+        """
+        Embed texts, yielding batches as they become available.
+
+        Args:
+            texts: Texts to embed (any iterable; consumed lazily)
+            ids: Identifiers recorded in the journal for failed texts (defaults to positions)
+            show_progress: Show a progress bar
+
+        Yields:
+            Tuples of (input positions, embeddings); embeddings is None when the
+            batch failed and was journaled
+        """
+        if ids is None:
+            items: Iterable[Tuple[str, str]] = ((str(i), text) for i, text in enumerate(texts))
+        else:
+            items = zip(ids, texts)
+        return self.iter_embedded(items, show_progress)
+
+    def _plan(self, items: Iterable[Tuple[str, str]]) -> Iterator[_Batch]:
+        """
+        Group a stream of (id, text) pairs into cached and to-embed batches.
+
+        The stream is pulled `batch_size` items at a time. Cached texts in each pull
+        come out at once as a batch with embeddings; the rest are token-counted in
+        one batch encode and grouped into batches bounded by `batch_size` and
+        `max_batch_tokens`. A text over the token budget still gets a batch of its own.
+        """
+        source = iter(items)
+        total = 0
+        pending = _Batch([], [], [], [])
+        pending_tokens = 0
+
+        while block := list(islice(source, self.batch_size)):
+            positions = range(total, total + len(block))
+            total += len(block)
+            hashes = [hash_text(text) for _, text in block] if self.cache else [""] * len(block)
+            cached = self.cache.contains(hashes) if self.cache else set()
+
+            hits = [j for j in range(len(block)) if hashes[j] in cached]
+            if self.cache:
+                self.cache.record(hits=len(hits), misses=len(block) - len(hits))
+            if hits and self.cache:
+                vectors = self.cache.get_many([hashes[j] for j in hits])
+                yield _Batch(
+                    [positions[j] for j in hits],
+                    [block[j][0] for j in hits],
+                    [],
+                    [],
+                    [vectors[hashes[j]] for j in hits],
+                )
+
+            misses = [j for j in range(len(block)) if hashes[j] not in cached]
+            counts = self._count_batch([block[j][1] for j in misses])
+            for j, tokens in zip(misses, counts):
+                item_id, text = block[j]
+                if pending.positions and (
+                    len(pending.positions) >= self.batch_size
+                    or pending_tokens + tokens > self.max_batch_tokens
+                ):
+                    yield pending
+                    pending, pending_tokens = _Batch([], [], [], []), 0
+                pending.positions.append(positions[j])
+                pending.ids.append(item_id)
+                pending.texts.append(text)
+                pending.hashes.append(hashes[j])
+                pending_tokens += tokens
+
+        if pending.positions:
+            yield pending
+
+    def iter_embedded(
+        self, items: Iterable[Tuple[str, str]], show_progress: bool = True
+    ) -> Iterator[Tuple[List[int], Optional[List[List[float]]]]]:
+        """
+        Embed a stream of (id, text) pairs with bounded work ahead of the consumer.
+
+        Cached texts are yielded as soon as they are pulled from the stream. Other
+        batches are submitted with at most 2 x `concurrency` in flight and yielded
+        in submission order, so a slow consumer stops the stream from being pulled
+        and bounds how many texts and embeddings are held in memory.
+
+        Args:
+            items: (id, text) pairs; ids are recorded in the journal for failed texts
+            show_progress: Show a progress bar
+
+        Yields:
+            Tuples of (stream positions, embeddings); embeddings is None when the
+            batch failed and was journaled
+        """
+        # Keep the pool busy while the head-of-line batch is being consumed
+        window = 2 * self.concurrency
+        in_flight: Deque[Tuple[int, _Batch, Future]] = deque()
+        texts = failed = submitted = 0
+
+        with (
+            ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="embedding"
+            ) as executor,
+            tqdm(desc="Embedding batches", unit="batch", disable=not show_progress) as bar,
+        ):
+            try:
+                for batch in chain(self._plan(items), [None]):
+                    if batch is not None:
+                        texts += len(batch.positions)
+                        if batch.embeddings is not None:
+                            yield batch.positions, batch.embeddings
+                            continue
+                        submitted += 1
+                        future = executor.submit(self._embed_batch, batch.texts)
+                        in_flight.append((submitted, batch, future))
+
+                    # Drain the head once the window is full, and everything at the end
+                    while in_flight and (len(in_flight) >= window or batch is None):
+                        number, head, future = in_flight.popleft()
+                        embeddings = self._collect(number, head.ids, future)
+                        if embeddings is None:
+                            failed += len(head.positions)
+                        elif self.cache:
+                            self.cache.put_many(head.hashes, embeddings)
+                        bar.update()
+                        yield head.positions, embeddings
+            finally:
+                # Consumer stopped early: drop batches that have not started
+                for _, _, future in in_flight:
+                    future.cancel()
+
+        if failed:
+            where = f" (journaled to {self.journal_path})" if self.journal_path else ""
+            print(f"⚠️  {failed} of {texts} texts could not be embedded{where}")
+
+    def _collect(self, number: int, ids: List[str], future: Future) -> Optional[List[List[float]]]:
+        """Wait for a batch, journaling it and returning None if it failed."""
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Error generating embeddings for batch {number}: {e}")
+            self._journal_failure(number, ids, e)
+            return None
+
+    def embed(
+        self,
+        texts: List[str],
+        ids: Optional[List[str]] = None,
+        show_progress: bool = True,
+    ) -> List[Optional[List[float]]]:
+        """
+        Embed texts with up to `concurrency` batches in flight.
+
+        Args:
+            texts: Texts to embed
+            ids: Identifiers recorded in the journal for failed texts (defaults to positions)
+            show_progress: Show a progress bar
+
+        Returns:
+            One embedding per text, in input order; None for texts whose batch failed
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for batch, batch_embeddings in self.iter_batches(texts, ids, show_progress):
+            if batch_embeddings is not None:
+                for i, embedding in zip(batch, batch_embeddings):
+                    embeddings[i] = embedding
+        return embeddings
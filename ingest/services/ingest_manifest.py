@@ -0,0 +1,112 @@
+"""
+Persistent manifest of ingested files for incremental ingestion.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_VERSION = 1
+
+
+def hash_config(settings: Dict[str, Any]) -> str:
+    """
+    Hash the settings that determine which chunks and vectors a file produces.
+
+    Args:
+        settings: JSON-serializable settings (chunker sizes, embedding model, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class IngestManifest:
+    """
+    Per-file record of content hash, config hash and the chunk ids produced.
+
+    Stored as JSON and replaced atomically on save, so an interrupted run leaves
+    the previous manifest intact and its files are simply re-ingested next time.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Load the manifest, starting empty if it is missing or from another version.
+
+        Args:
+            path: Manifest JSON file
+        """
+        self.path = Path(path)
+        self._files: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self._files = data.get("files", {})
+
+    @property
+    def keys(self) -> List[str]:
+        """Keys (corpus-relative paths) of every recorded file."""
+        return list(self._files)
+
+    def is_current(self, key: str, content_hash: str, config_hash: str) -> bool:
+        """
+        Check whether a file was ingested with this content and config.
+
+        Args:
+            key: Corpus-relative file path
+            content_hash: Current hash of the file's bytes
+            config_hash: Current hash of the chunking/embedding settings
+
+        Returns:
+            True if the file can be skipped
+        """
+        entry = self._files.get(key)
+        return (
+            entry is not None
+            and entry["content_hash"] == content_hash
+            and entry["config_hash"] == config_hash
+        )
+
+    def chunk_ids(self, key: str) -> List[str]:
+        """Chunk ids recorded for a file (empty if it was never ingested)."""
+        entry = self._files.get(key)
+        return list(entry["chunk_ids"]) if entry else []
+
+    def record(self, key: str, content_hash: str, config_hash: str, chunk_ids: List[str]) -> None:
+        """
+        Record a successfully ingested file.
+
+        Args:
+            key: Corpus-relative file path
+            content_hash: Hash of the file's bytes
+            config_hash: Hash of the chunking/embedding settings
+            chunk_ids: Ids of the vectors now in the index for this file
+        """
+        self._files[key] = {
+            "content_hash": content_hash,
+            "config_hash": config_hash,
+            "chunk_ids": list(chunk_ids),
+        }
+
+    def remove(self, key: str) -> Optional[Dict[str, Any]]:
+        """Forget a file, returning its entry if it had one."""
+        return self._files.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every file and delete the manifest from disk."""
+        self._files = {}
+        self.path.unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "files": self._files}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
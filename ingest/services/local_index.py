@@ -0,0 +1,307 @@
+"""
+Local in-process vector index backed by a memory-mapped float32 matrix.
+Drop-in replacement for the subset of the Pinecone Index API used by PineconeVectorStore.
+"""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..models import VectorStoreError
+
+MANIFEST_FILE = "manifest.json"
+META_NAMESPACE = "__meta__"
+
+
+class LocalVectorIndex:
+    """
+    File-backed vector index for offline runs and small corpora.
+
+    Layout on disk (one generation of files is live at a time):
+        manifest.json           - dimension, count, generation and data file names
+        vectors-<tag>.f32       - row-major float32 matrix of unit-normalized vectors
+        metadata-<tag>.json     - side-table of [{"id": ..., "metadata": {...}}] per row
+        ivf-<tag>.npz           - optional IVF centroids and partition row lists
+
+    where <tag> is the generation plus a random suffix, fresh on every persist.
+
+    Writes are buffered in memory and persisted when the index generation marker
+    is written (PineconeVectorStore does this at the end of every upsert and
+    delete), so readers never observe a half-written generation.
+    """
+
+    def __init__(self, path: Path, dimension: int, ivf_lists: int = 0) -> None:
+        """
+        Open (or create) a local index.
+
+        Args:
+            path: Directory holding the index files
+            dimension: Embedding dimensions
+            ivf_lists: Number of IVF partitions to build on persist (0 = brute force)
+        """
+        self.path = Path(path)
+        self.dimension = dimension
+        self.ivf_lists = ivf_lists
+        self.generation: Optional[int] = None
+
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._files: Dict[str, str] = {}
+        # PineconeVectorStore upserts from several threads at once
+        self._lock = threading.RLock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Load the live generation from disk, if any."""
+        manifest_path = self.path / MANIFEST_FILE
+        if not manifest_path.exists():
+            return
+
+        manifest = json.loads(manifest_path.read_text())
+        if manifest["dimension"] != self.dimension:
+            raise VectorStoreError(
+                f"Local index at {self.path} has dimension {manifest['dimension']}, "
+                f"expected {self.dimension}"
+            )
+
+        self.generation = manifest.get("generation")
+        self._files = manifest.get("files", {})
+        count = manifest["count"]
+
+        if count:
+            vectors = np.memmap(
+                self.path / self._files["vectors"],
+                dtype=np.float32,
+                mode="r",
+                shape=(count, self.dimension),
+            )
+            # Writers need a mutable copy; the corpus is small enough to hold in memory
+            self._vectors = np.array(vectors)
+            rows = json.loads((self.path / self._files["metadata"]).read_text())
+            self._ids = [row["id"] for row in rows]
+            self._metadata = [row["metadata"] for row in rows]
+            self._rows = {vector_id: i for i, vector_id in enumerate(self._ids)}
+
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = "") -> None:
+        """
+        Insert or replace vectors.
+
+        Args:
+            vectors: Pinecone-style dicts with "id", "values" and "metadata"
+            namespace: Pinecone namespace; the meta namespace carries the generation marker
+        """
+        with self._lock:
+            if namespace == META_NAMESPACE:
+                for vector in vectors:
+                    generation = vector.get("metadata", {}).get("generation")
+                    if generation is not None:
+                        self.generation = generation
+                self.persist()
+                return
+
+            new_rows = []
+            for vector in vectors:
+                values = np.asarray(vector["values"], dtype=np.float32)
+                if values.shape != (self.dimension,):
+                    raise VectorStoreError(
+                        f"Vector {vector['id']} has dimension {values.shape}, expected {self.dimension}"
+                    )
+                norm = np.linalg.norm(values)
+                if norm:
+                    values = values / norm
+
+                row = self._rows.get(vector["id"])
+                if row is None:
+                    # _ids already includes the rows queued in new_rows
+                    self._rows[vector["id"]] = len(self._ids)
+                    new_rows.append(values)
+                    self._ids.append(vector["id"])
+                    self._metadata.append(vector.get("metadata", {}))
+                else:
+                    self._vectors[row] = values
+                    self._metadata[row] = vector.get("metadata", {})
+
+            if new_rows:
+                self._vectors = np.vstack([self._vectors, np.stack(new_rows)])
+
+    def delete(
+        self,
+        ids: Optional[List[str]] = None,
+        delete_all: bool = False,
+        namespace: str = "",
+    ) -> None:
+        """
+        Delete vectors by id, or everything.
+
+        Args:
+            ids: Vector ids to delete
+            delete_all: Delete every vector in the index
+            namespace: Pinecone namespace (only the default namespace holds vectors)
+        """
+        if namespace == META_NAMESPACE:
+            return
+
+        with self._lock:
+            if delete_all:
+                keep = []
+            else:
+                doomed = set(ids or [])
+                keep = [i for i, vector_id in enumerate(self._ids) if vector_id not in doomed]
+
+            self._vectors = self._vectors[keep]
+            self._ids = [self._ids[i] for i in keep]
+            self._metadata = [self._metadata[i] for i in keep]
+            self._rows = {vector_id: i for i, vector_id in enumerate(self._ids)}
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+    ) -> SimpleNamespace:
+        """
+        Find the top-k most similar vectors by cosine similarity.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            filter: Optional metadata equality filter ({"field": value} or {"field": {"$eq": value}})
+            include_metadata: Whether to include metadata in matches
+
+        Returns:
+            Pinecone-style response with a ``matches`` list
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            if not self._ids or top_k <= 0:
+                return SimpleNamespace(matches=[])
+
+            scores = self._vectors @ query
+            if filter:
+                mask = np.array([_matches_filter(meta, filter) for meta in self._metadata])
+                scores = np.where(mask, scores, -np.inf)
+
+            top_k = min(top_k, len(scores))
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[top])]
+
+            matches = [
+                SimpleNamespace(
+                    id=self._ids[i],
+                    score=float(scores[i]),
+                    metadata=self._metadata[i] if include_metadata else None,
+                )
+                for i in top
+                if np.isfinite(scores[i])
+            ]
+        return SimpleNamespace(matches=matches)
+
+    def describe_index_stats(self) -> SimpleNamespace:
+        """Get Pinecone-style index statistics."""
+        return SimpleNamespace(
+            total_vector_count=len(self._ids),
+            dimension=self.dimension,
+            index_fullness=0.0,
+            namespaces={"": {"vector_count": len(self._ids)}} if self._ids else {},
+        )
+
+    def persist(self) -> None:
+        """Write the current vectors and metadata to disk as a new live generation."""
+        with self._lock:
+            self._persist()
+
+    def _persist(self) -> None:
+        """Write fresh data files, then swap the manifest over to them atomically."""
+        # Never reuse a live file name: readers may have the current files memory-mapped
+        generation = self.generation if self.generation is not None else 0
+        tag = f"{generation}-{uuid.uuid4().hex[:12]}"
+        files = {
+            "vectors": f"vectors-{tag}.f32",
+            "metadata": f"metadata-{tag}.json",
+        }
+
+        self._vectors.astype(np.float32, copy=False).tofile(self.path / files["vectors"])
+        rows = [{"id": i, "metadata": m} for i, m in zip(self._ids, self._metadata)]
+        (self.path / files["metadata"]).write_text(json.dumps(rows))
+
+        if self.ivf_lists and len(self._ids) >= self.ivf_lists:
+            centroids, offsets, order = build_ivf(self._vectors, self.ivf_lists)
+            files["ivf"] = f"ivf-{tag}.npz"
+            np.savez(self.path / files["ivf"], centroids=centroids, offsets=offsets, order=order)
+
+        manifest = {
+            "dimension": self.dimension,
+            "count": len(self._ids),
+            "generation": self.generation,
+            "files": files,
+        }
+        tmp_manifest = self.path / f"{MANIFEST_FILE}.tmp"
+        tmp_manifest.write_text(json.dumps(manifest))
+        os.replace(tmp_manifest, self.path / MANIFEST_FILE)
+
+        # Old generation files stay readable by open memory maps until they are closed
+        for name in set(self._files.values()) - set(files.values()):
+            (self.path / name).unlink(missing_ok=True)
+        self._files = files
+
+
+def build_ivf(
+    vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Partition unit vectors with spherical k-means.
+
+    Args:
+        vectors: (n, d) unit-normalized float32 matrix
+        n_lists: Number of partitions
+        iterations: k-means iterations
+        seed: Random seed for centroid initialization
+
+    Returns:
+        Tuple of (centroids, offsets, order) where rows of partition p are
+        ``order[offsets[p]:offsets[p + 1]]``
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for p in range(n_lists):
+            members = vectors[assignments == p]
+            if len(members):
+                centroid = members.sum(axis=0)
+                centroids[p] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+    assignments = np.argmax(vectors @ centroids.T, axis=1)
+    order = np.argsort(assignments, kind="stable").astype(np.int32)
+    offsets = np.searchsorted(assignments[order], np.arange(n_lists + 1)).astype(np.int32)
+    return centroids.astype(np.float32), offsets, order
+
+
+def _matches_filter(metadata: Dict[str, Any], filter_dict: Dict[str, Any]) -> bool:
+    """Check a metadata dict against a simple Pinecone-style equality filter."""
+    for field, condition in filter_dict.items():
+        value = metadata.get(field)
+        if isinstance(condition, dict):
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+        elif value != condition:
+            return False
+    return True
@@ -3,12 +3,47 @@ Pinecone client and vector database operations.
 Handles index management, embedding generation, and vector upserts.
 """
 
+import json
+import queue
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from openai import OpenAI
 from pinecone import Pinecone, ServerlessSpec
-from tqdm import tqdm
+from pinecone.exceptions import PineconeApiException
+
+from ..models import ChunkRecord, DocumentChunk, UpsertReport, VectorStoreError
+from ..utils import TextCleaner
+from .embedding_cache import EmbeddingCache
+from .embedding_service import EmbeddingService, jittered_backoff
+from .local_index import LocalVectorIndex
+
+# Pinecone rejects upsert requests over 2 MB
+MAX_UPSERT_PAYLOAD_BYTES = 2 * 1024 * 1024
+UPSERT_RETRY_BASE_DELAY = 1.0
+
+# (batch number, vectors) handed from the embedding stage to the upsert workers
+UpsertItem = Tuple[int, List[Dict[str, Any]]]
+
+# Marker record the API polls to invalidate its cached search results.
+# Kept in its own namespace so it never shows up in similarity queries.
+INDEX_GENERATION_NAMESPACE = "__meta__"
+INDEX_GENERATION_ID = "index-generation"
+
+
+def _payload_bytes(vector: Dict[str, Any]) -> int:
+    """Serialized size of one upsert record, as it appears in the request body."""
+    return len(json.dumps(vector, separators=(",", ":"))) + 1
+
+
+def _is_retryable_upsert_error(error: Exception) -> bool:
+    """Whether an upsert error is throttling or transient rather than a bad request."""
+    if isinstance(error, PineconeApiException):
+        return error.status is None or error.status == 429 or error.status >= 500
+    # Local index validation errors will fail the same way again
+    return not isinstance(error, (VectorStoreError, ValueError))
 
 
 class PineconeVectorStore:
@@ -21,6 +56,19 @@ class PineconeVectorStore:
         index_name: str,
         embedding_model: str = "text-embedding-3-small",
         embedding_dimensions: int = 1536,
+        backend: str = "pinecone",
+        local_index_path: Optional[str] = None,
+        ivf_lists: int = 0,
+        embedding_batch_size: int = 100,
+        embedding_max_batch_tokens: int = 100_000,
+        embedding_concurrency: int = 4,
+        embedding_max_retries: int = 5,
+        failed_batch_journal: Optional[str] = None,
+        embedding_cache_path: Optional[str] = None,
+        upsert_queue_depth: int = 4,
+        upsert_concurrency: int = 4,
+        upsert_max_retries: int = 5,
+        upsert_max_payload_bytes: int = MAX_UPSERT_PAYLOAD_BYTES,
     ):
         """
         Initialize Pinecone client and configuration.
@@ -31,22 +79,85 @@ class PineconeVectorStore:
             index_name: Name of the Pinecone index
             embedding_model: OpenAI embedding model name
             embedding_dimensions: Embedding vector dimensions
+            backend: "pinecone" or "local" (in-process memory-mapped index)
+            local_index_path: Directory for the local index (local backend only)
+            ivf_lists: IVF partitions for the local index (0 = brute force)
+            embedding_batch_size: Maximum texts per embedding request
+            embedding_max_batch_tokens: Maximum tokens per embedding request
+            embedding_concurrency: Embedding requests kept in flight
+            embedding_max_retries: Retries per embedding batch on rate limits
+            failed_batch_journal: JSONL file recording embedding batches that failed
+            embedding_cache_path: SQLite file caching chunk embeddings (None disables)
+            upsert_queue_depth: Embedded upsert batches buffered ahead of the upsert stage
+            upsert_concurrency: Upsert requests kept in flight
+            upsert_max_retries: Retries per upsert batch on throttling and transient errors
+            upsert_max_payload_bytes: Maximum serialized size of one upsert request
         """
-        self.pc = Pinecone(api_key=api_key)
+        if backend not in ("pinecone", "local"):
+            raise ValueError(f"Unknown vector backend: {backend}")
+
+        self.backend = backend
+        self.local_index_path = Path(local_index_path or "data/local_index")
+        self.ivf_lists = ivf_lists
+        self.pc = Pinecone(api_key=api_key) if backend == "pinecone" else None
         self.environment = environment
         self.index_name = index_name
         self.embedding_model = embedding_model
         self.embedding_dimensions = embedding_dimensions
+        self.upsert_queue_depth = upsert_queue_depth
+        self.upsert_concurrency = upsert_concurrency
+        self.upsert_max_retries = upsert_max_retries
+        self.upsert_max_payload_bytes = upsert_max_payload_bytes
+        self._sleep = time.sleep
         self.openai_client = OpenAI()
-        self.index = None
+        self.embedder = EmbeddingService(
+            self.openai_client,
+            model=embedding_model,
+            batch_size=embedding_batch_size,
+            max_batch_tokens=embedding_max_batch_tokens,
+            concurrency=embedding_concurrency,
+            max_retries=embedding_max_retries,
+            journal_path=failed_batch_journal,
+            cache=(
+                EmbeddingCache(Path(embedding_cache_path), embedding_model, embedding_dimensions)
+                if embedding_cache_path
+                else None
+            ),
+        )
+        # Pinecone Index or LocalVectorIndex, which share the subset of the API used here
+        self.index: Any = None
+
+    def _pinecone(self) -> Pinecone:
+        """Get the Pinecone client, which only the pinecone backend has."""
+        if self.pc is None:
+            raise VectorStoreError(f"The {self.backend} backend has no Pinecone client")
+        return self.pc
+
+    def connect_to_index(self) -> None:
+        """Connect to an existing index without creating it."""
+        if self.backend == "local":
+            self.index = LocalVectorIndex(
+                self.local_index_path / self.index_name,
+                dimension=self.embedding_dimensions,
+                ivf_lists=self.ivf_lists,
+            )
+        else:
+            self.index = self._pinecone().Index(self.index_name)
 
     def create_index_if_not_exists(self) -> None:
         """Create Pinecone index if it doesn't exist."""
-        existing_indexes = [index.name for index in self.pc.list_indexes()]
+        if self.backend == "local":
+            # Local indexes are created on first open
+            self.connect_to_index()
+            print(f"Using local index at {self.index.path}")
+            return
+
+        pc = self._pinecone()
+        existing_indexes = [index.name for index in pc.list_indexes()]
 
         if self.index_name not in existing_indexes:
             print(f"Creating index '{self.index_name}'...")
-            self.pc.create_index(
+            pc.create_index(
                 name=self.index_name,
                 dimension=self.embedding_dimensions,
                 metric="cosine",
@@ -54,7 +165,7 @@ class PineconeVectorStore:
             )
 
             # Wait for index to be ready
-            while not self.pc.describe_index(self.index_name).status["ready"]:
+            while not pc.describe_index(self.index_name).status["ready"]:
                 print("Waiting for index to be ready...")
                 time.sleep(1)
 
@@ -62,96 +173,212 @@ class PineconeVectorStore:
         else:
             print(f"Index '{self.index_name}' already exists.")
 
-        self.index = self.pc.Index(self.index_name)
+        self.index = pc.Index(self.index_name)
 
-    def generate_embeddings(self, texts: List[str], batch_size: int = 100) -> List[List[float]]:
+    def generate_embeddings(
+        self, texts: List[str], ids: Optional[List[str]] = None
+    ) -> List[Optional[List[float]]]:
         """
         Generate embeddings for a list of texts using OpenAI.
 
+        Batches are sized by count and tokens and several are kept in flight;
+        batches that keep failing are journaled rather than filled with zeros.
+
         Args:
             texts: List of text strings to embed
-            batch_size: Number of texts to process in each batch
+            ids: Identifiers recorded in the failed-batch journal
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, None where the batch failed
         """
-        embeddings = []
-
         print(f"Generating embeddings for {len(texts)} texts...")
+        return self.embedder.embed(texts, ids=ids)
+
+    def _to_vector(
+        self, chunk: ChunkRecord, embedding: List[float], embedded_text: str
+    ) -> Dict[str, Any]:
+        """Build the upsert record for an embedded chunk."""
+        # Unset (None) fields are left out for Pinecone compatibility
+        metadata = chunk.vector_metadata()
+
+        # The preview is the text that was embedded, so whitespace is normalized once
+        metadata["content_preview"] = (
+            embedded_text[:500] + "..." if len(embedded_text) > 500 else embedded_text
+        )
 
-        for i in tqdm(range(0, len(texts), batch_size), desc="Embedding batches"):
-            batch = texts[i : i + batch_size]
+        return {
+            "id": chunk.id,
+            "values": embedding,
+            "metadata": metadata,
+        }
 
-            try:
-                response = self.openai_client.embeddings.create(
-                    model=self.embedding_model, input=batch
-                )
+    def _upsert_with_retry(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Upsert one batch, backing off and retrying on throttling and transient errors.
 
-                batch_embeddings = [item.embedding for item in response.data]
-                embeddings.extend(batch_embeddings)
+        Args:
+            batch: Vectors to upsert
 
+        Returns:
+            Number of retries needed
+
+        Raises:
+            Exception: The last error if the batch still fails
+        """
+        for attempt in range(self.upsert_max_retries + 1):
+            try:
+                self.index.upsert(vectors=batch)
+                return attempt
             except Exception as e:
-                print(f"Error generating embeddings for batch {i // batch_size + 1}: {str(e)}")
-                # Add empty embeddings for failed batch
-                embeddings.extend([[0.0] * self.embedding_dimensions] * len(batch))
+                if attempt == self.upsert_max_retries or not _is_retryable_upsert_error(e):
+                    raise
+                self._sleep(jittered_backoff(attempt, UPSERT_RETRY_BASE_DELAY))
+        raise AssertionError("unreachable")
 
-        return embeddings
+    def _upsert_worker(self, upsert_queue: "queue.Queue[Optional[UpsertItem]]") -> UpsertReport:
+        """
+        Upsert batches from the queue until a None sentinel arrives.
+
+        Args:
+            upsert_queue: Queue of (batch number, vectors) fed by the embedding stage
 
-    def upsert_chunks(self, chunks: List[Dict[str, Any]], batch_size: int = 100) -> None:
+        Returns:
+            This worker's share of the upsert report
         """
-        Upsert document chunks into Pinecone index.
+        report = UpsertReport()
+        while True:
+            item = upsert_queue.get()
+            if item is None:
+                return report
+
+            batch_number, batch = item
+            ids = [vector["id"] for vector in batch]
+            try:
+                report.retries += self._upsert_with_retry(batch)
+                report.succeeded_ids.extend(ids)
+                report.batches += 1
+            except Exception as e:
+                print(f"Error upserting batch {batch_number}: {str(e)}")
+                report.failed_ids.extend(ids)
+
+    def _embedded_vectors(
+        self,
+        chunks: Iterable[Union[ChunkRecord, DocumentChunk]],
+        embedding_failed_ids: List[str],
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Embed a stream of chunks, yielding their upsert records.
 
         Args:
-            chunks: List of chunk dictionaries with content and metadata
-            batch_size: Number of vectors to upsert in each batch
+            chunks: Chunk records or document chunks (consumed lazily)
+            embedding_failed_ids: Collects ids of chunks whose embedding batch failed
+
+        Yields:
+            Upsert records, in the order their embeddings become available
         """
-        if not self.index:
-            raise ValueError("Index not initialized. Call create_index_if_not_exists() first.")
+        # Chunks pulled from the stream but not yet embedded, with their embedding
+        # text, by stream position
+        waiting: Dict[int, Tuple[ChunkRecord, str]] = {}
+
+        def items() -> Iterator[Tuple[str, str]]:
+            for position, chunk in enumerate(chunks):
+                if isinstance(chunk, DocumentChunk):
+                    chunk = ChunkRecord.from_chunk(chunk)
+                text = TextCleaner.embedding_text(chunk.content)
+                waiting[position] = chunk, text
+                yield chunk.id, text
+
+        for batch, embeddings in self.embedder.iter_embedded(items()):
+            batch_chunks = [waiting.pop(i) for i in batch]
+            # Chunks whose embedding batch failed were journaled; skip them
+            if embeddings is None:
+                embedding_failed_ids.extend(chunk.id for chunk, _ in batch_chunks)
+                continue
+            for (chunk, text), embedding in zip(batch_chunks, embeddings):
+                yield self._to_vector(chunk, embedding, text)
+
+    def upsert_chunks(
+        self, chunks: Iterable[Union[ChunkRecord, DocumentChunk]], batch_size: int = 100
+    ) -> UpsertReport:
+        """
+        Embed document chunks and upsert them into the index as a streaming pipeline.
 
-        # Extract and clean text content for embedding
-        texts = []
-        for chunk in chunks:
-            # Clean text: normalize whitespace, remove excessive newlines
-            clean_text = chunk.content.replace("\n", " ").replace("\r", " ")
-            # Normalize multiple spaces to single space
-            clean_text = " ".join(clean_text.split())
-            texts.append(clean_text)
-
-        # Generate embeddings
-        embeddings = self.generate_embeddings(texts)
-
-        # Prepare vectors for upsert
-        vectors = []
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            # Filter out None values from metadata for Pinecone compatibility
-            metadata = {k: v for k, v in chunk.metadata.model_dump().items() if v is not None}
-
-            # Clean content preview (normalize whitespace like we do for embeddings)
-            clean_preview = chunk.content.replace("\n", " ").replace("\r", " ")
-            clean_preview = " ".join(clean_preview.split())
-            metadata["content_preview"] = (
-                clean_preview[:500] + "..." if len(clean_preview) > 500 else clean_preview
-            )
+        Embedding batches feed a bounded queue of upsert batches drained by a pool
+        of `upsert_concurrency` threads, so embedding and upsert network I/O overlap
+        and only `upsert_queue_depth` upsert batches (plus the embeddings in flight)
+        are held in memory at once. Upsert batches hold at most `batch_size` vectors
+        and stay under `upsert_max_payload_bytes` of serialized request body.
 
-            vector = {
-                "id": chunk.id,
-                "values": embedding,
-                "metadata": metadata,
-            }
-            vectors.append(vector)
+        Chunks are pulled lazily, so a generator upstream (extraction and chunking)
+        is only advanced as fast as embedding and upserting keep up, and only the
+        chunks still waiting for their embeddings are held.
 
-        # Upsert in batches
-        print(f"Upserting {len(vectors)} vectors to Pinecone...")
+        Args:
+            chunks: Chunk records or document chunks (any iterable; consumed lazily)
+            batch_size: Maximum number of vectors to upsert in each batch
 
-        for i in tqdm(range(0, len(vectors), batch_size), desc="Upsert batches"):
-            batch = vectors[i : i + batch_size]
+        Returns:
+            Report of upserted and failed ids
+        """
+        if not self.index:
+            raise ValueError("Index not initialized. Call create_index_if_not_exists() first.")
 
+        embedding_failed_ids: List[str] = []
+        print("Embedding and upserting chunks...")
+
+        upsert_queue: "queue.Queue[Optional[UpsertItem]]" = queue.Queue(
+            maxsize=self.upsert_queue_depth
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.upsert_concurrency, thread_name_prefix="upsert"
+        ) as executor:
+            workers = [
+                executor.submit(self._upsert_worker, upsert_queue)
+                for _ in range(self.upsert_concurrency)
+            ]
+
+            pending: List[Dict[str, Any]] = []
+            pending_bytes = 0
+            batch_number = 0
             try:
-                self.index.upsert(vectors=batch)
-            except Exception as e:
-                print(f"Error upserting batch {i // batch_size + 1}: {str(e)}")
+                for vector in self._embedded_vectors(chunks, embedding_failed_ids):
+                    size = _payload_bytes(vector)
+                    if pending and (
+                        len(pending) >= batch_size
+                        or pending_bytes + size > self.upsert_max_payload_bytes
+                    ):
+                        batch_number += 1
+                        # Blocks when the upsert stage falls behind
+                        upsert_queue.put((batch_number, pending))
+                        pending, pending_bytes = [], 0
+                    pending.append(vector)
+                    pending_bytes += size
+
+                if pending:
+                    upsert_queue.put((batch_number + 1, pending))
+            finally:
+                for _ in workers:
+                    upsert_queue.put(None)
+
+            report = UpsertReport(embedding_failed_ids=embedding_failed_ids)
+            for worker in workers:
+                part = worker.result()
+                report.succeeded_ids.extend(part.succeeded_ids)
+                report.failed_ids.extend(part.failed_ids)
+                report.batches += part.batches
+                report.retries += part.retries
+
+        print(
+            f"Successfully upserted {len(report.succeeded_ids)} vectors "
+            f"in {report.batches} batches ({report.retries} retries)"
+        )
+        if report.failed_ids:
+            shown = ", ".join(report.failed_ids[:10])
+            more = f" and {len(report.failed_ids) - 10} more" if len(report.failed_ids) > 10 else ""
+            print(f"⚠️  {len(report.failed_ids)} vectors failed to upsert: {shown}{more}")
 
-        print(f"Successfully upserted {len(vectors)} vectors!")
+        self.bump_index_generation()
+        return report
 
     def query_similar(
         self,
@@ -175,6 +402,8 @@ class PineconeVectorStore:
 
         # Generate embedding for query
         query_embedding = self.generate_embeddings([query_text])[0]
+        if query_embedding is None:
+            raise VectorStoreError("Failed to generate an embedding for the query")
 
         # Query the index
         results = self.index.query(
@@ -195,11 +424,14 @@ class PineconeVectorStore:
             raise ValueError("Index not initialized. Call create_index_if_not_exists() first.")
 
         stats = self.index.describe_index_stats()
+        # Report document vectors only, not the generation marker
+        namespaces = dict(stats.namespaces) if stats.namespaces else {}
+        meta = namespaces.pop(INDEX_GENERATION_NAMESPACE, None)
         return {
-            "total_vector_count": stats.total_vector_count,
+            "total_vector_count": stats.total_vector_count - (meta["vector_count"] if meta else 0),
             "dimension": stats.dimension,
             "index_fullness": stats.index_fullness,
-            "namespaces": dict(stats.namespaces) if stats.namespaces else {},
+            "namespaces": namespaces,
         }
 
     def delete_all_vectors(self) -> None:
@@ -210,3 +442,52 @@ class PineconeVectorStore:
         print("Deleting all vectors from index...")
         self.index.delete(delete_all=True)
         print("All vectors deleted!")
+
+        self.bump_index_generation()
+
+    def delete_vectors(self, ids: List[str], batch_size: int = 1000) -> None:
+        """
+        Delete vectors by id.
+
+        Args:
+            ids: Vector ids to delete
+            batch_size: Ids per delete request (Pinecone accepts up to 1000)
+        """
+        if not self.index:
+            raise ValueError("Index not initialized. Call create_index_if_not_exists() first.")
+        if not ids:
+            return
+
+        print(f"Deleting {len(ids)} stale vectors...")
+        for i in range(0, len(ids), batch_size):
+            self.index.delete(ids=ids[i : i + batch_size])
+
+        self.bump_index_generation()
+
+    def bump_index_generation(self) -> None:
+        """
+        Record a new index generation so API result caches are invalidated.
+
+        The generation is a millisecond timestamp stored as metadata on a marker
+        vector; readers only compare it for equality.
+        """
+        if not self.index:
+            raise ValueError("Index not initialized. Call create_index_if_not_exists() first.")
+
+        generation = time.time_ns() // 1_000_000
+        # Cosine indexes reject all-zero vectors, so the marker gets a unit vector
+        marker_values = [1.0] + [0.0] * (self.embedding_dimensions - 1)
+
+        try:
+            self.index.upsert(
+                vectors=[
+                    {
+                        "id": INDEX_GENERATION_ID,
+                        "values": marker_values,
+                        "metadata": {"generation": generation},
+                    }
+                ],
+                namespace=INDEX_GENERATION_NAMESPACE,
+            )
+        except Exception as e:
+            print(f"Warning: failed to update index generation marker: {e}")
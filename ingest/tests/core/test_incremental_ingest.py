@@ -0,0 +1,154 @@
+"""
+Tests for incremental ingestion in CorpusIngester.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from ...core.ingest import CorpusIngester
+from ...models import IngestionConfig, UpsertReport
+from ..factories import FakeEmbeddingsClient
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Create a corpus with two markdown files."""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.md").write_text("# A\n\nAlpha")
+    (corpus / "b.md").write_text("# B\n\nBeta")
+    return corpus
+
+
+@pytest.fixture
+def ingester(monkeypatch, tmp_path):
+    """Create a local-backend ingester with its manifest in tmp_path."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = IngestionConfig(
+        openai_api_key="test-key",
+        vector_backend="local",
+        local_index_path=str(tmp_path / "index"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        embedding_cache_path=str(tmp_path / "embeddings.sqlite3"),
+        extraction_cache_path=str(tmp_path / "extracted.sqlite3"),
+    )
+    return CorpusIngester(config)
+
+
+def _produced(*files):
+    """Map (file name, chunk count) pairs to chunk ids following the chunker's naming."""
+    return {file_name: [f"{file_name}_{i}" for i in range(count)] for file_name, count in files}
+
+
+class TestIncrementalIngest:
+    """Test cases for manifest-driven change detection."""
+
+    def test_first_run_ingests_everything(self, ingester, corpus):
+        """Test every document is new when there is no manifest."""
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+
+        assert [path.name for path in changed] == ["a.md", "b.md"]
+        assert removed == []
+
+    def test_rerun_skips_unchanged_and_detects_edits_and_removals(self, ingester, corpus):
+        """Test only edited files are re-ingested and removed files are reported."""
+        paths = sorted(corpus.iterdir())
+        changed, removed = ingester.plan_changes(paths, corpus)
+        ingester.update_manifest(
+            corpus, changed, removed, _produced(("a.md", 2), ("b.md", 1)), UpsertReport()
+        )
+
+        (corpus / "a.md").write_text("# A\n\nAlpha, edited")
+        (corpus / "b.md").unlink()
+        (corpus / "c.md").write_text("# C")
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+
+        assert [path.name for path in changed] == ["a.md", "c.md"]
+        assert removed == ["b.md"]
+
+    def test_stale_chunks_and_removed_files_are_deleted(self, ingester, corpus):
+        """Test vectors no longer produced by any file are returned for deletion."""
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+        ingester.update_manifest(
+            corpus,
+            changed,
+            removed,
+            _produced(("a.md", 3), ("b.md", 1)),
+            UpsertReport(),
+        )
+
+        (corpus / "a.md").write_text("# A\n\nShorter")
+        (corpus / "b.md").unlink()
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+        stale = ingester.update_manifest(
+            corpus, changed, removed, _produced(("a.md", 1)), UpsertReport()
+        )
+
+        assert stale == ["a.md_1", "a.md_2", "b.md_0"]
+        assert ingester.manifest.keys == ["a.md"]
+
+    def test_failed_files_are_retried_next_run(self, ingester, corpus):
+        """Test files whose chunks failed to embed stay out of the manifest."""
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+        report = UpsertReport(embedding_failed_ids=["b.md_0"])
+
+        ingester.update_manifest(
+            corpus,
+            changed,
+            removed,
+            _produced(("a.md", 1), ("b.md", 1)),
+            report,
+        )
+        changed, _ = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+
+        assert [path.name for path in changed] == ["b.md"]
+
+    def test_full_run_ignores_manifest(self, ingester, corpus):
+        """Test --full treats every document as changed."""
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+        ingester.update_manifest(
+            corpus, changed, removed, _produced(("a.md", 0), ("b.md", 0)), UpsertReport()
+        )
+
+        changed, _ = ingester.plan_changes(sorted(corpus.iterdir()), corpus, full=True)
+
+        assert len(changed) == 2
+
+    def test_same_named_files_in_subdirectories_are_tracked_apart(self, ingester, tmp_path):
+        """Test same-named files get their own chunk ids, so removing one keeps the other."""
+        ingester.vector_store.embedder.client = FakeEmbeddingsClient(
+            dimensions=ingester.config.dimensions
+        )
+        corpus = tmp_path / "nested"
+        for folder in ("x", "y"):
+            (corpus / folder).mkdir(parents=True)
+            (corpus / folder / "notes.md").write_text(f"# Notes\n\nNotes kept in {folder}.")
+
+        ingester.run_ingestion(corpus)
+        x_ids = ingester.manifest.chunk_ids("x/notes.md")
+        y_ids = ingester.manifest.chunk_ids("y/notes.md")
+
+        assert x_ids and y_ids and set(x_ids).isdisjoint(y_ids)
+        assert ingester.vector_store.get_index_stats()["total_vector_count"] == 2
+
+        (corpus / "x" / "notes.md").unlink()
+        ingester.run_ingestion(corpus)
+
+        assert ingester.manifest.keys == ["y/notes.md"]
+        remaining = ingester.vector_store.index.query(
+            vector=[1.0] * ingester.config.dimensions, top_k=5
+        )
+        assert [match.id for match in remaining.matches] == y_ids
+
+    def test_new_chunker_version_reingests_everything(self, ingester, corpus):
+        """Test bumping the chunker version invalidates every manifest entry."""
+        changed, removed = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+        ingester.update_manifest(
+            corpus, changed, removed, _produced(("a.md", 1), ("b.md", 1)), UpsertReport()
+        )
+
+        with patch("ingest.core.ingest.CHUNKER_VERSION", "next"):
+            changed, _ = ingester.plan_changes(sorted(corpus.iterdir()), corpus)
+
+        assert len(changed) == 2
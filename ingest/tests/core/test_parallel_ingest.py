@@ -0,0 +1,71 @@
+"""
+Tests for multiprocess extraction and chunking in CorpusIngester.
+"""
+
+import pytest
+
+from ...benchmarks.parallel_chunking import write_corpus
+from ...core.ingest import CorpusIngester
+from ...models import IngestionConfig
+
+
+def _process_and_chunk(ingester, paths, corpus):
+    """Run the streaming extract-and-chunk stages, returning (produced ids, chunks)."""
+    produced = {}
+    processed = ingester.iter_processed(paths, corpus_path=corpus)
+    chunks = list(ingester.iter_chunks(processed, produced, corpus))
+    return produced, chunks
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    """Create a local-backend config that keeps every file in tmp_path."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return IngestionConfig(
+        openai_api_key="test-key",
+        vector_backend="local",
+        local_index_path=str(tmp_path / "index"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        embedding_cache_path="",
+        extraction_cache_path="",
+        min_chunk_size=10,
+    )
+
+
+class TestParallelIngest:
+    """Test cases for the process-pool mode."""
+
+    def test_workers_match_sequential_output(self, config, tmp_path):
+        """Test chunks come back identical and in the same order as a sequential run."""
+        corpus = tmp_path / "corpus"
+        corpus.mkdir()
+        paths = write_corpus(corpus, files=5, sections=4)
+        (corpus / "broken.pdf").write_bytes(b"not a pdf")
+        paths.insert(2, corpus / "broken.pdf")
+
+        sequential_ids, sequential_chunks = _process_and_chunk(
+            CorpusIngester(config), paths, corpus
+        )
+        parallel_ids, parallel_chunks = _process_and_chunk(
+            CorpusIngester(config, workers=3), paths, corpus
+        )
+
+        assert list(parallel_ids.items()) == list(sequential_ids.items())
+        assert "broken.pdf" not in parallel_ids
+        assert parallel_chunks == sequential_chunks
+        assert len(parallel_chunks) > len(paths)
+
+    def test_large_text_files_are_streamed_in_process(self, config, tmp_path):
+        """Test streamed files skip the workers and chunk like files read whole."""
+        corpus = tmp_path / "corpus"
+        corpus.mkdir()
+        paths = write_corpus(corpus, files=4, sections=4)
+        whole_ids, whole_chunks = _process_and_chunk(CorpusIngester(config), paths, corpus)
+
+        config.stream_threshold_bytes = 0
+        ingester = CorpusIngester(config, workers=2)
+        ingester.doc_processor.process_file = None  # streamed files are never read whole
+        streamed_ids, streamed_chunks = _process_and_chunk(ingester, paths, corpus)
+
+        assert list(streamed_ids.items()) == list(whole_ids.items())
+        assert streamed_chunks == whole_chunks
@@ -0,0 +1,108 @@
+"""
+Tests for the streaming extract-to-upsert pipeline in CorpusIngester.
+"""
+
+import pytest
+
+from ...core.ingest import CorpusIngester
+from ...models import IngestionConfig, ProcessingError
+from ..factories import FakeEmbeddingsClient
+
+
+@pytest.fixture
+def ingester(monkeypatch, tmp_path):
+    """Create a local-backend ingester with fake embeddings and one-chunk batches."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    config = IngestionConfig(
+        openai_api_key="test-key",
+        vector_backend="local",
+        local_index_path=str(tmp_path / "index"),
+        manifest_path=str(tmp_path / "manifest.json"),
+        embedding_cache_path="",
+        extraction_cache_path="",
+        dimensions=2,
+        embedding_batch_size=1,
+        embedding_concurrency=1,
+        upsert_batch_size=1,
+        upsert_queue_depth=1,
+        upsert_concurrency=1,
+    )
+    ingester = CorpusIngester(config)
+    ingester.vector_store.embedder.client = FakeEmbeddingsClient(dimensions=2)
+    return ingester
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Create a corpus of small markdown files, one chunk each."""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    for i in range(20):
+        (corpus / f"doc{i:02d}.md").write_text(f"# Doc {i}\n\nSome text about topic {i}.")
+    return corpus
+
+
+class TestStreamingIngest:
+    """Test cases for streaming ingestion."""
+
+    def test_first_vectors_land_before_the_corpus_is_parsed(self, ingester, corpus):
+        """Test upserting starts while later files are still waiting to be processed."""
+        events = []
+        process_file = ingester.doc_processor.process_file
+        upsert_with_retry = ingester.vector_store._upsert_with_retry
+
+        def recording_process_file(path, file_hash=None, source_path=None):
+            events.append(("process", path.name))
+            return process_file(path, file_hash, source_path)
+
+        def recording_upsert(batch):
+            events.append(("upsert", batch[0]["id"]))
+            return upsert_with_retry(batch)
+
+        ingester.doc_processor.process_file = recording_process_file
+        ingester.vector_store._upsert_with_retry = recording_upsert
+
+        ingester.run_ingestion(corpus)
+
+        kinds = [kind for kind, _ in events]
+        assert kinds.count("process") == 20
+        assert kinds.count("upsert") == 20
+        assert kinds.index("upsert") < len(kinds) - 1 - kinds[::-1].index("process")
+        assert len(ingester.manifest.keys) == 20
+
+    def test_extractor_is_closed_after_a_failed_run(self, ingester, corpus):
+        """Test the content extractor is closed even when ingestion raises."""
+        closed = []
+        ingester.doc_processor._content_extractor.close = lambda: closed.append(True)
+        ingester.vector_store.upsert_chunks = lambda chunks, batch_size: 1 / 0
+
+        with pytest.raises(ZeroDivisionError):
+            ingester.run_ingestion(corpus)
+
+        assert closed == [True]
+
+    def test_failed_file_is_left_out_of_the_manifest(self, ingester, corpus):
+        """Test a file that fails to process mid-stream does not stop the others."""
+        (corpus / "doc05.pdf").write_bytes(b"not a pdf")
+
+        ingester.run_ingestion(corpus)
+
+        assert len(ingester.manifest.keys) == 20
+        assert "doc05.pdf" not in ingester.manifest.keys
+
+    def test_streamed_file_failing_midway_is_left_out_of_the_manifest(self, ingester, corpus):
+        """Test a streamed file whose read fails part way is retried on the next run."""
+        ingester.doc_processor.stream_threshold_bytes = 0
+        iter_paragraphs = ingester.doc_processor._content_extractor.iter_paragraphs
+
+        def failing_iter_paragraphs(path):
+            yield from iter_paragraphs(path)
+            if path.name == "doc05.md":
+                raise ProcessingError(f"Failed to read file {path}: disk error")
+
+        ingester.doc_processor._content_extractor.iter_paragraphs = failing_iter_paragraphs
+
+        ingester.run_ingestion(corpus)
+
+        assert len(ingester.manifest.keys) == 19
+        assert "doc05.md" not in ingester.manifest.keys
@@ -6,6 +6,7 @@ Each factory is in its own file following the one - class - per - file principle
 from .config_factory import ConfigFactory
 from .content_factory import ContentFactory
 from .data_samples import TestDataSamples
+from .embedding_factory import FakeEmbeddingsClient
 from .token_factory import MockTokenEncoder, TokenFactory
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "MockTokenEncoder",
     "ConfigFactory",
     "TestDataSamples",
+    "FakeEmbeddingsClient",
 ]
@@ -0,0 +1,61 @@
+"""
+Fake OpenAI embeddings client for testing.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import openai
+
+
+class FakeEmbeddingsClient:
+    """OpenAI client stand-in that embeds text as [len(text)] and records calls."""
+
+    def __init__(self, failures=None, delay=0.0, dimensions=1):
+        """
+        Initialize the fake client.
+
+        Args:
+            failures: Map of input text to errors raised, in order, for batches containing it
+            delay: Seconds each request takes
+            dimensions: Length of each returned vector
+        """
+        self.failures = failures or {}
+        self.delay = delay
+        self.dimensions = dimensions
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.embeddings = SimpleNamespace(create=self.create)
+
+    @staticmethod
+    def rate_limit_error() -> openai.RateLimitError:
+        """Build the error the OpenAI client raises on HTTP 429."""
+        request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+        # Some openai releases annotate the response with their own httpx fork
+        response: Any = httpx.Response(429, request=request)
+        return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+    def create(self, model, input):
+        """Embed a batch."""
+        with self._lock:
+            self.calls.append(list(input))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            for text in input:
+                errors = self.failures.get(text)
+                if errors:
+                    raise errors.pop(0)
+            return SimpleNamespace(
+                data=[SimpleNamespace(embedding=[float(len(t))] * self.dimensions) for t in input]
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
@@ -2,8 +2,11 @@
 Factory for creating token encoder test doubles.
 """
 
+import re
 from unittest.mock import Mock
 
+from ...utils import TokenizedText
+
 
 class MockTokenEncoder:
     """Mock token encoder implementation for testing."""
@@ -18,6 +21,9 @@ class MockTokenEncoder:
     def count_tokens(self, text: str) -> int:
         return len(text) // 4
 
+    def tokenize(self, text: str) -> TokenizedText:
+        return TokenizedText(text, range(0, len(text) - len(text) % 4, 4))
+
 
 class TokenFactory:
     """Factory methods for creating token encoder test doubles."""
@@ -31,8 +37,14 @@ class TokenFactory:
         encoder.decode.side_effect = lambda tokens: (
             " ".join([f"token{i}" for i in tokens]) if tokens else ""
         )
+        encoder.tokenize.side_effect = TokenFactory.tokenize_words
         return encoder
 
+    @staticmethod
+    def tokenize_words(text: str) -> TokenizedText:
+        """Tokenize text as one token per whitespace-separated word."""
+        return TokenizedText(text, [match.start() for match in re.finditer(r"\S+", text)])
+
     @staticmethod
     def create_simple_mock_token_encoder() -> MockTokenEncoder:
         """Create a simple mock token encoder implementation."""
@@ -0,0 +1,82 @@
+"""
+Tests for the ChunkRecord hot-path chunk representation.
+"""
+
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from ...models import ChunkingError, ChunkMetadata, ChunkRecord, FileType, ProcessedDocument
+from ...services import DocumentChunkingService
+from ..builders import a_document_chunk
+from ..factories import TokenFactory
+
+
+class TestChunkRecord:
+    """Test cases for ChunkRecord."""
+
+    @pytest.fixture
+    def chunk(self):
+        """Create a validated chunk with a section header and no page number."""
+        return (
+            a_document_chunk()
+            .with_id("guide.md_Setup_3")
+            .with_content("Install it.")
+            .with_metadata(
+                ChunkMetadata(
+                    file_name="guide.md",
+                    file_type=FileType.MARKDOWN,
+                    document_title="Guide",
+                    chunk_index=3,
+                    token_count=3,
+                    char_count=11,
+                    section_header="Setup",
+                )
+            )
+            .build()
+        )
+
+    def test_round_trips_a_document_chunk(self, chunk):
+        """Test a record converts to and from an equal DocumentChunk."""
+        record = ChunkRecord.from_chunk(chunk)
+
+        assert record.to_chunk() == chunk
+
+    def test_vector_metadata_matches_model_dump(self, chunk):
+        """Test record metadata equals the model's dump with unset fields left out."""
+        expected = {k: v for k, v in chunk.metadata.model_dump().items() if v is not None}
+
+        assert ChunkRecord.from_chunk(chunk).vector_metadata() == expected
+
+    def test_to_chunk_validates(self, chunk):
+        """Test converting an invalid record raises a validation error."""
+        record = ChunkRecord.from_chunk(chunk)
+        record.content = "   "
+
+        with pytest.raises(ValidationError):
+            record.to_chunk()
+
+    def test_records_are_slotted_and_pickle_smaller(self, chunk):
+        """Test records carry no instance dict and pickle smaller than the model."""
+        record = ChunkRecord.from_chunk(chunk)
+
+        assert not hasattr(record, "__dict__")
+        assert len(pickle.dumps(record)) < len(pickle.dumps(chunk))
+
+    def test_chunker_rejects_overlong_ids(self):
+        """Test the chunker still enforces the chunk id length limit."""
+        chunker = DocumentChunkingService(
+            min_chunk_size=1, token_encoder=TokenFactory.create_simple_mock_token_encoder()
+        )
+        document = ProcessedDocument(
+            file_name="x" * 200 + ".txt",
+            file_type=FileType.TEXT,
+            title="Long name",
+            content="Some text worth a chunk.",
+            token_count=6,
+            char_count=24,
+        )
+
+        with pytest.raises(ChunkingError, match="Chunk ID too long"):
+            chunker.chunk_records(document)
@@ -6,13 +6,15 @@ from unittest.mock import Mock
 
 import pytest
 
-from ...models import FileType, ProcessedDocument
+from ...models import FileType, ProcessedDocument, StreamedDocument
 from ...services import DocumentChunkingService
 from ...services.chunking_service import (
     MarkdownChunkingStrategy,
     PDFChunkingStrategy,
     TextChunkingStrategy,
 )
+from ...utils import ParagraphSplitter
+from ..factories import TokenFactory
 
 
 class TestDocumentChunkingService:
@@ -115,22 +117,130 @@ class TestDocumentChunkingService:
 
         assert chunk.id == "sample.md_Test_Section_0"
         assert chunk.content == "Test content"
-        assert chunk.metadata.document_title == "Introduction to AI"
-        assert chunk.metadata.section_header == "Test Section"
-        assert chunk.metadata.page_number == 1
-        assert chunk.metadata.chunk_index == 0
+        assert chunk.document_title == "Introduction to AI"
+        assert chunk.section_header == "Test Section"
+        assert chunk.page_number == 1
+        assert chunk.chunk_index == 0
+
+    def test_chunks_overlap_by_token_offsets(self, chunking_service):
+        """Test each chunk starts chunk_overlap tokens before the previous one ends."""
+        content = "\n\n".join(f"Paragraph {i} " + "word " * 30 for i in range(10)).strip()
+        document = ProcessedDocument(
+            file_name="long.txt",
+            file_type=FileType.TEXT,
+            title="Long",
+            content=content,
+            token_count=len(content) // 4,
+            char_count=len(content),
+        )
+
+        chunks = chunking_service.chunk_document(document)
+
+        assert len(chunks) > 1
+        for previous, chunk in zip(chunks, chunks[1:]):
+            previous_end = content.index(previous.content) + len(previous.content)
+            # 20 tokens of 4 characters, less any whitespace trimmed at the boundary
+            assert 76 <= previous_end - content.index(chunk.content) <= 80
+        assert all(chunk.metadata.token_count <= 100 for chunk in chunks)
+
+    def test_tokenizes_each_document_once(self, sample_document):
+        """Test chunk token counts come from one tokenization of the document."""
+        encoder = Mock(wraps=TokenFactory.create_simple_mock_token_encoder())
+        service = DocumentChunkingService(
+            chunk_size=50, chunk_overlap=10, min_chunk_size=5, token_encoder=encoder
+        )
+
+        chunks = service.chunk_document(sample_document)
 
-    def test_get_overlap_text(self, chunking_service):
-        """Test overlap text extraction."""
-        # Mock the token encoder to return predictable results
-        chunking_service._token_encoder.encode = Mock(return_value=list(range(100)))
-        chunking_service._token_encoder.decode = Mock(return_value="overlap_text")
+        assert len(chunks) > 1
+        encoder.tokenize.assert_called_once_with(sample_document.content)
+        encoder.encode.assert_not_called()
+        encoder.count_tokens.assert_not_called()
 
-        overlap = chunking_service._get_overlap_text("Some long text content")
 
-        assert overlap == "overlap_text"
-        chunking_service._token_encoder.encode.assert_called_once()
-        chunking_service._token_encoder.decode.assert_called_once()
+class TestChunkStream:
+    """Test cases for chunking a document streamed paragraph by paragraph."""
+
+    @pytest.fixture
+    def chunking_service(self):
+        """Create a DocumentChunkingService counting one token per word."""
+        return DocumentChunkingService(
+            chunk_size=40,
+            chunk_overlap=8,
+            min_chunk_size=5,
+            max_chunk_size=80,
+            token_encoder=TokenFactory.create_mock_token_encoder(),
+        )
+
+    @staticmethod
+    def stream_and_whole(chunking_service, file_name, file_type, content):
+        """Chunk content both streamed by paragraph and as one document."""
+        document = ProcessedDocument(
+            file_name=file_name,
+            file_type=file_type,
+            title="Title",
+            content=content,
+            token_count=len(content.split()),
+            char_count=len(content),
+        )
+        whole = chunking_service.chunk_document(document)
+        streamed = chunking_service.chunk_stream(
+            StreamedDocument(file_name=file_name, file_type=file_type, title="Title"),
+            ParagraphSplitter().split(content),
+        )
+        return [record.to_chunk().model_dump() for record in streamed], [
+            chunk.model_dump() for chunk in whole
+        ]
+
+    def test_small_text_matches_whole_document(self, chunking_service):
+        """Test a stream that fits one window chunks exactly like the whole document."""
+        content = "\n\n".join(f"Paragraph {i}:" + " word" * (i % 7 + 3) for i in range(40))
+
+        streamed, whole = self.stream_and_whole(
+            chunking_service, "notes.txt", FileType.TEXT, content.strip()
+        )
+
+        assert len(whole) > 1
+        assert streamed == whole
+
+    def test_markdown_sections_match_whole_document(self, chunking_service):
+        """Test headers start sections and fenced `#` lines do not, as in chunk_document."""
+        content = (
+            "Preamble text.\n\n# Setup\nInstall it.\n\n"
+            "```bash\n# not a header\n\n# still code\n```\n\n"
+            + "\n\n".join("Detail" + " word" * 12 for _ in range(8))
+            + "\n## Usage\nRun it.\n\n### Flags\n"
+            + " ".join(["word"] * 50)
+        )
+
+        streamed, whole = self.stream_and_whole(
+            chunking_service, "guide.md", FileType.MARKDOWN, content.strip()
+        )
+
+        assert [chunk["metadata"]["section_header"] for chunk in streamed][:2] == ["", "Setup"]
+        assert streamed == whole
+
+    def test_windows_bound_each_tokenization(self, chunking_service, monkeypatch):
+        """Test a long stream is tokenized a window at a time and chunked continuously."""
+        monkeypatch.setattr("ingest.services.chunking_service.STREAM_WINDOW_CHARS", 500)
+        encoder = Mock(wraps=chunking_service._token_encoder)
+        chunking_service._token_encoder = encoder
+        paragraphs = [f"Paragraph {i} " + "word " * 10 for i in range(200)]
+
+        chunks = list(
+            chunking_service.chunk_stream(
+                StreamedDocument(file_name="big.txt", file_type=FileType.TEXT, title="Big"),
+                iter(paragraphs),
+            )
+        )
+
+        windows = [call.args[0] for call in encoder.tokenize.call_args_list]
+        assert len(windows) > 10
+        assert max(len(window) for window in windows) < 500 + 2 * 40 * 10
+        assert [chunk.chunk_index for chunk in chunks] == list(range(len(chunks)))
+        assert all(chunk.token_count <= 40 for chunk in chunks)
+        text = "\n\n".join(chunk.content for chunk in chunks)
+        assert all(f"Paragraph {i} " in text for i in range(200))
 
 
 class TestChunkingStrategies:
@@ -150,7 +260,7 @@ class TestChunkingStrategies:
             char_count=len(sample_markdown_content),
         )
 
-        chunks = strategy.chunk(document, chunking_service)
+        chunks = [record.to_chunk() for record in strategy.chunk(document, chunking_service)]
         # PDF strategy may return empty for test content without proper structure
         assert len(chunks) >= 0
 
@@ -168,7 +278,7 @@ class TestChunkingStrategies:
             char_count=len(sample_pdf_content),
         )
 
-        chunks = strategy.chunk(document, chunking_service)
+        chunks = [record.to_chunk() for record in strategy.chunk(document, chunking_service)]
         # PDF strategy may return empty for test content without proper structure
         assert len(chunks) >= 0
 
@@ -186,6 +296,6 @@ class TestChunkingStrategies:
             char_count=len(sample_text_content),
         )
 
-        chunks = strategy.chunk(document, chunking_service)
+        chunks = [record.to_chunk() for record in strategy.chunk(document, chunking_service)]
         # PDF strategy may return empty for test content without proper structure
         assert len(chunks) >= 0
@@ -0,0 +1,63 @@
+"""
+Tests for the EmbeddingCache class.
+"""
+
+import pytest
+
+from ...services import EmbeddingCache
+from ...services.embedding_cache import hash_text
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create an empty cache."""
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", model="test-model", dimensions=2)
+    yield cache
+    cache.close()
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache."""
+
+    def test_put_and_get(self, cache):
+        """Test stored vectors round-trip as float32."""
+        cache.put_many([hash_text("a"), hash_text("b")], [[0.5, -1.0], [0.25, 2.0]])
+
+        vectors = cache.get_many([hash_text("a"), hash_text("b"), hash_text("c")])
+
+        assert vectors == {hash_text("a"): [0.5, -1.0], hash_text("b"): [0.25, 2.0]}
+        assert cache.contains([hash_text("a"), hash_text("c")]) == {hash_text("a")}
+
+    def test_keyed_by_model_and_dimensions(self, cache, tmp_path):
+        """Test entries from another model or dimension setting are not served."""
+        cache.put_many([hash_text("a")], [[1.0, 0.0]])
+
+        other_model = EmbeddingCache(tmp_path / "cache.sqlite3", model="other", dimensions=2)
+        other_dims = EmbeddingCache(tmp_path / "cache.sqlite3", model="test-model", dimensions=3)
+
+        assert other_model.contains([hash_text("a")]) == set()
+        assert other_dims.contains([hash_text("a")]) == set()
+
+    def test_persists_across_instances(self, cache, tmp_path):
+        """Test vectors survive reopening the database."""
+        cache.put_many([hash_text("a")], [[1.0, 0.0]])
+        cache.close()
+
+        reopened = EmbeddingCache(tmp_path / "cache.sqlite3", model="test-model", dimensions=2)
+
+        assert reopened.get_many([hash_text("a")]) == {hash_text("a"): [1.0, 0.0]}
+
+    def test_lookups_larger_than_one_statement(self, cache):
+        """Test lookups are split to stay under SQLite's parameter limit."""
+        hashes = [hash_text(str(i)) for i in range(1200)]
+        cache.put_many(hashes, [[float(i), 0.0] for i in range(1200)])
+
+        assert cache.contains(hashes) == set(hashes)
+
+    def test_hit_ratio(self, cache):
+        """Test the hit ratio counts recorded lookups."""
+        assert cache.hit_ratio == 0.0
+
+        cache.record(hits=3, misses=1)
+
+        assert cache.hit_ratio == 0.75
@@ -0,0 +1,192 @@
+"""
+Tests for the EmbeddingService class.
+"""
+
+import json
+
+import pytest
+
+from ...services import EmbeddingCache, EmbeddingService
+from ...services.embedding_service import jittered_backoff
+from ..factories import FakeEmbeddingsClient
+
+
+def _service(client, **kwargs):
+    """Create a service that counts one token per character and never sleeps."""
+    kwargs.setdefault("batch_size", 2)
+    return EmbeddingService(
+        client, model="test-model", count_tokens=len, sleep=lambda _: None, **kwargs
+    )
+
+
+class TestBatching:
+    """Test cases for token-aware batch planning."""
+
+    def test_batches_by_count(self):
+        """Test batches are capped at the maximum item count."""
+        client = FakeEmbeddingsClient()
+
+        _service(client, concurrency=1).embed(["a"] * 5, show_progress=False)
+
+        assert [len(call) for call in client.calls] == [2, 2, 1]
+
+    def test_batches_by_tokens(self):
+        """Test batches close before exceeding the token budget."""
+        client = FakeEmbeddingsClient()
+        service = _service(client, batch_size=10, max_batch_tokens=8, concurrency=1)
+
+        service.embed(["aaaa", "bbbb", "cccc", "d"], show_progress=False)
+
+        assert client.calls == [["aaaa", "bbbb"], ["cccc", "d"]]
+
+    def test_oversized_input_gets_own_batch(self):
+        """Test an input over the budget is still sent, alone."""
+        client = FakeEmbeddingsClient()
+        service = _service(client, batch_size=10, max_batch_tokens=8, concurrency=1)
+
+        service.embed(["a", "b" * 50, "c"], show_progress=False)
+
+        assert client.calls == [["a"], ["b" * 50], ["c"]]
+
+    def test_batches_span_stream_pulls(self, tmp_path):
+        """Test a batch thinned by cache hits keeps filling from the next pull."""
+        cache = EmbeddingCache(tmp_path / "cache.sqlite3", model="test-model", dimensions=1)
+        _service(FakeEmbeddingsClient(), cache=cache).embed(["a"], show_progress=False)
+        client = FakeEmbeddingsClient()
+        service = _service(client, batch_size=3, concurrency=1, cache=cache)
+
+        batches = list(service.iter_batches(iter(["a", "bb", "ccc", "dddd"]), show_progress=False))
+
+        assert [batch for batch, _ in batches] == [[0], [1, 2, 3]]
+        assert client.calls == [["bb", "ccc", "dddd"]]
+
+    def test_counts_tokens_once_per_pull(self, monkeypatch):
+        """Test the default tiktoken counter is called with each pull as one batch."""
+        client = FakeEmbeddingsClient()
+        service = EmbeddingService(client, model="test-model", batch_size=3, concurrency=1)
+        calls = []
+        monkeypatch.setattr(
+            "ingest.utils.TiktokenEncoder.count_tokens_batch",
+            lambda _, texts: calls.append(texts) or [1] * len(texts),
+        )
+
+        service.embed(["a", "b", "c", "d"], show_progress=False)
+
+        assert calls == [["a", "b", "c"], ["d"]]
+        assert client.calls == [["a", "b", "c"], ["d"]]
+
+    def test_jittered_backoff_is_bounded(self):
+        """Test jittered delays stay within the exponential envelope."""
+        for attempt in range(10):
+            assert 0 <= jittered_backoff(attempt, 1.0, max_delay=8.0) <= min(8.0, 2**attempt)
+
+
+class TestEmbeddingService:
+    """Test cases for EmbeddingService."""
+
+    def test_embeds_in_input_order(self):
+        """Test results line up with inputs even when batches finish out of order."""
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+        client = FakeEmbeddingsClient()
+
+        embeddings = _service(client).embed(texts, show_progress=False)
+
+        assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert sorted(len(call) for call in client.calls) == [1, 2, 2]
+
+    def test_keeps_batches_in_flight(self):
+        """Test several batches run concurrently."""
+        client = FakeEmbeddingsClient(delay=0.05)
+
+        _service(client, batch_size=1, concurrency=4).embed(["a"] * 8, show_progress=False)
+
+        assert client.max_in_flight > 1
+
+    def test_retries_rate_limits(self):
+        """Test a throttled batch is retried with backoff."""
+        client = FakeEmbeddingsClient(
+            failures={
+                "bb": [
+                    FakeEmbeddingsClient.rate_limit_error(),
+                    FakeEmbeddingsClient.rate_limit_error(),
+                ]
+            }
+        )
+        sleeps = []
+        service = _service(client)
+        service._sleep = sleeps.append
+
+        embeddings = service.embed(["a", "bb"], show_progress=False)
+
+        assert embeddings == [[1.0], [2.0]]
+        assert len(client.calls) == 3
+        assert len(sleeps) == 2
+
+    def test_failed_batch_is_journaled_not_zeroed(self, tmp_path):
+        """Test a batch that keeps failing yields None and a journal entry."""
+        journal = tmp_path / "failed.jsonl"
+        client = FakeEmbeddingsClient(
+            failures={"ccc": [FakeEmbeddingsClient.rate_limit_error()] * 3}
+        )
+        service = _service(client, max_retries=2, journal_path=str(journal))
+
+        embeddings = service.embed(
+            ["a", "bb", "ccc", "dddd"], ids=["c0", "c1", "c2", "c3"], show_progress=False
+        )
+
+        assert embeddings == [[1.0], [2.0], None, None]
+        entries = [json.loads(line) for line in journal.read_text().splitlines()]
+        assert len(entries) == 1
+        assert entries[0]["ids"] == ["c2", "c3"]
+        assert entries[0]["retried"] is True
+        assert "RateLimitError" in entries[0]["error"]
+
+    def test_non_retryable_error_fails_immediately(self):
+        """Test errors other than throttling/transient failures are not retried."""
+        client = FakeEmbeddingsClient(failures={"a": [ValueError("bad input")]})
+
+        embeddings = _service(client).embed(["a"], show_progress=False)
+
+        assert embeddings == [None]
+        assert len(client.calls) == 1
+
+    @pytest.mark.parametrize("texts", [[], ["only"]])
+    def test_small_inputs(self, texts):
+        """Test empty and single-text inputs."""
+        embeddings = _service(FakeEmbeddingsClient()).embed(texts, show_progress=False)
+
+        assert embeddings == [[float(len(t))] for t in texts]
+
+    def test_iter_batches_bounds_work_ahead_of_consumer(self):
+        """Test only a window of batches is submitted ahead of a paused consumer."""
+        client = FakeEmbeddingsClient()
+        service = _service(client, batch_size=1, concurrency=2)
+
+        batches = service.iter_batches(["a"] * 20, show_progress=False)
+        first_batch, first_embeddings = next(batches)
+
+        assert (first_batch, first_embeddings) == ([0], [[1.0]])
+        assert len(client.calls) <= 2 * service.concurrency
+        assert len(list(batches)) == 19
+
+    def test_cached_texts_skip_the_api(self, tmp_path):
+        """Test only texts missing from the cache are sent to OpenAI."""
+        cache = EmbeddingCache(tmp_path / "cache.sqlite3", model="test-model", dimensions=1)
+        _service(FakeEmbeddingsClient(), cache=cache).embed(["a", "bb"], show_progress=False)
+        client = FakeEmbeddingsClient()
+
+        embeddings = _service(client, cache=cache).embed(["a", "ccc", "bb"], show_progress=False)
+
+        assert embeddings == [[1.0], [3.0], [2.0]]
+        assert client.calls == [["ccc"]]
+        assert (cache.hits, cache.misses) == (2, 3)
+
+    def test_failed_batches_are_not_cached(self, tmp_path):
+        """Test a failed batch is retried against the API on the next run."""
+        cache = EmbeddingCache(tmp_path / "cache.sqlite3", model="test-model", dimensions=1)
+        failing = FakeEmbeddingsClient(failures={"a": [ValueError("bad input")]})
+        _service(failing, cache=cache).embed(["a"], show_progress=False)
+        client = FakeEmbeddingsClient()
+
+        assert _service(client, cache=cache).embed(["a"], show_progress=False) == [[1.0]]
+        assert client.calls == [["a"]]
@@ -0,0 +1,65 @@
+"""
+Tests for the IngestManifest class.
+"""
+
+import json
+
+from ...services import IngestManifest
+from ...services.ingest_manifest import hash_config
+from ...utils import hash_file
+
+
+class TestIngestManifest:
+    """Test cases for IngestManifest."""
+
+    def test_record_save_and_reload(self, tmp_path):
+        """Test recorded files survive a save and reload."""
+        manifest = IngestManifest(tmp_path / "manifest.json")
+        manifest.record("docs/a.md", "content", "config", ["a.md_0", "a.md_1"])
+        manifest.save()
+
+        reloaded = IngestManifest(tmp_path / "manifest.json")
+
+        assert reloaded.keys == ["docs/a.md"]
+        assert reloaded.chunk_ids("docs/a.md") == ["a.md_0", "a.md_1"]
+        assert reloaded.is_current("docs/a.md", "content", "config")
+
+    def test_changed_content_or_config_is_not_current(self, tmp_path):
+        """Test either hash changing marks the file for re-ingestion."""
+        manifest = IngestManifest(tmp_path / "manifest.json")
+        manifest.record("a.md", "content", "config", [])
+
+        assert not manifest.is_current("a.md", "edited", "config")
+        assert not manifest.is_current("a.md", "content", "rechunked")
+        assert not manifest.is_current("b.md", "content", "config")
+
+    def test_remove_and_clear(self, tmp_path):
+        """Test forgetting one file and the whole manifest."""
+        manifest = IngestManifest(tmp_path / "manifest.json")
+        manifest.record("a.md", "content", "config", ["a.md_0"])
+        manifest.record("b.md", "content", "config", ["b.md_0"])
+        manifest.save()
+
+        assert manifest.remove("a.md")["chunk_ids"] == ["a.md_0"]
+        assert manifest.keys == ["b.md"]
+
+        manifest.clear()
+        assert manifest.keys == []
+        assert not (tmp_path / "manifest.json").exists()
+
+    def test_other_versions_start_empty(self, tmp_path):
+        """Test a manifest in an unknown format is ignored rather than trusted."""
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"version": 0, "files": {"a.md": {}}}))
+
+        assert IngestManifest(path).keys == []
+
+    def test_hashes(self, tmp_path):
+        """Test file hashes follow content and config hashes ignore key order."""
+        path = tmp_path / "a.md"
+        path.write_text("hello")
+        first = hash_file(path)
+        path.write_text("hello!")
+
+        assert hash_file(path) != first
+        assert hash_config({"a": 1, "b": 2}) == hash_config({"b": 2, "a": 1})
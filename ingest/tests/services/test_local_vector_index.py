@@ -0,0 +1,160 @@
+"""
+Tests for the LocalVectorIndex class.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from ...models import VectorStoreError
+from ...services import LocalVectorIndex
+from ...services.local_index import build_ivf
+
+
+def _vector(*values):
+    """Pad a short vector out to 4 dimensions."""
+    return list(values) + [0.0] * (4 - len(values))
+
+
+class TestLocalVectorIndex:
+    """Test cases for LocalVectorIndex."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Create an index with three vectors."""
+        index = LocalVectorIndex(tmp_path / "index", dimension=4)
+        index.upsert(
+            vectors=[
+                {"id": "a", "values": _vector(1.0), "metadata": {"file_name": "a.md"}},
+                {"id": "b", "values": _vector(0.0, 1.0), "metadata": {"file_name": "b.md"}},
+                {"id": "c", "values": _vector(0.7, 0.7), "metadata": {"file_name": "c.md"}},
+            ]
+        )
+        return index
+
+    def test_query_returns_top_k_by_cosine(self, index):
+        """Test results are ordered by cosine similarity."""
+        result = index.query(vector=_vector(2.0, 0.1), top_k=2, include_metadata=True)
+
+        assert [m.id for m in result.matches] == ["a", "c"]
+        assert result.matches[0].score == pytest.approx(0.9988, abs=1e-3)
+        assert result.matches[0].metadata == {"file_name": "a.md"}
+
+    def test_query_with_metadata_filter(self, index):
+        """Test equality filters restrict the candidates."""
+        result = index.query(vector=_vector(1.0), top_k=3, filter={"file_name": {"$eq": "b.md"}})
+
+        assert [m.id for m in result.matches] == ["b"]
+
+    def test_upsert_replaces_existing_id(self, index):
+        """Test upserting an existing id overwrites it in place."""
+        index.upsert(vectors=[{"id": "a", "values": _vector(0.0, 0.0, 1.0), "metadata": {}}])
+
+        assert index.describe_index_stats().total_vector_count == 3
+        assert index.query(vector=_vector(0.0, 0.0, 1.0), top_k=1).matches[0].id == "a"
+
+    def test_upsert_replaces_id_added_later_in_a_batch(self, index):
+        """Test replacing the last vector added by a multi-vector upsert."""
+        index.upsert(vectors=[{"id": "c", "values": _vector(0.0, 0.0, 0.0, 1.0), "metadata": {}}])
+
+        assert index.describe_index_stats().total_vector_count == 3
+        assert index.query(vector=_vector(0.0, 0.0, 0.0, 1.0), top_k=1).matches[0].id == "c"
+        assert index.query(vector=_vector(0.0, 1.0), top_k=1).matches[0].id == "b"
+
+    def test_delete_by_id_and_all(self, index):
+        """Test deleting specific ids and the whole index."""
+        index.delete(ids=["b"])
+        assert [m.id for m in index.query(vector=_vector(0.0, 1.0), top_k=3).matches] == ["c", "a"]
+
+        index.delete(delete_all=True)
+        assert index.query(vector=_vector(1.0), top_k=3).matches == []
+
+    def test_concurrent_upserts_keep_every_vector(self, tmp_path):
+        """Test upserts from several threads neither drop nor misplace rows."""
+        index = LocalVectorIndex(tmp_path / "concurrent", dimension=4)
+
+        def upsert(worker):
+            for i in range(20):
+                index.upsert(
+                    vectors=[
+                        {"id": f"{worker}-{i}", "values": _vector(1.0, worker, i), "metadata": {}}
+                    ]
+                )
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(upsert, range(4)))
+
+        assert index.describe_index_stats().total_vector_count == 80
+        assert index.query(vector=_vector(1.0, 3.0, 19.0), top_k=1).matches[0].id == "3-19"
+
+    def test_generation_marker_persists_and_reloads(self, index, tmp_path):
+        """Test writing the generation marker persists a generation readers can load."""
+        index.upsert(
+            vectors=[
+                {"id": "index-generation", "values": _vector(1.0), "metadata": {"generation": 7}}
+            ],
+            namespace="__meta__",
+        )
+
+        reopened = LocalVectorIndex(tmp_path / "index", dimension=4)
+
+        assert reopened.generation == 7
+        assert reopened.describe_index_stats().total_vector_count == 3
+        assert reopened.query(vector=_vector(0.0, 1.0), top_k=1).matches[0].id == "b"
+
+    def test_persist_never_overwrites_live_files(self, index, tmp_path):
+        """Test each persist writes fresh files, even without a generation marker."""
+        index.persist()
+        first = np.memmap(
+            tmp_path / "index" / index._files["vectors"], dtype=np.float32, mode="r", shape=(3, 4)
+        )
+        first_files = dict(index._files)
+
+        index.upsert(vectors=[{"id": "a", "values": _vector(0.0, 0.0, 1.0), "metadata": {}}])
+        index.persist()
+
+        assert index.generation is None
+        assert set(first_files.values()).isdisjoint(index._files.values())
+        np.testing.assert_array_equal(first[0], _vector(1.0))
+        reopened = LocalVectorIndex(tmp_path / "index", dimension=4)
+        assert reopened.query(vector=_vector(0.0, 0.0, 1.0), top_k=1).matches[0].id == "a"
+
+    def test_concurrent_deletes_and_queries(self, tmp_path):
+        """Test deletes racing queries and upserts never see a half-updated index."""
+        index = LocalVectorIndex(tmp_path / "concurrent", dimension=4)
+
+        def churn(worker):
+            for i in range(20):
+                vector_id = f"{worker}-{i}"
+                index.upsert(vectors=[{"id": vector_id, "values": _vector(1.0, i), "metadata": {}}])
+                # A query between a delete's row and id updates would index past the matrix
+                assert index.query(vector=_vector(1.0, i), top_k=5).matches
+                index.delete(ids=[vector_id])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(churn, range(4)))
+
+        assert index.describe_index_stats().total_vector_count == 0
+        assert index._rows == {}
+
+    def test_dimension_mismatch_raises(self, index):
+        """Test vectors of the wrong dimension are rejected."""
+        with pytest.raises(VectorStoreError):
+            index.upsert(vectors=[{"id": "x", "values": [1.0, 0.0], "metadata": {}}])
+
+
+class TestBuildIVF:
+    """Test cases for IVF partitioning."""
+
+    def test_partitions_cover_every_row_once(self):
+        """Test each row lands in exactly one partition."""
+        rng = np.random.default_rng(1)
+        vectors = rng.normal(size=(200, 8)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        centroids, offsets, order = build_ivf(vectors, n_lists=8)
+
+        assert centroids.shape == (8, 8)
+        assert offsets[0] == 0 and offsets[-1] == 200
+        assert sorted(order.tolist()) == list(range(200))
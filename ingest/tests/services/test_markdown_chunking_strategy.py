@@ -9,6 +9,7 @@ import pytest
 from ...models import FileType, ProcessedDocument
 from ...services import DocumentChunkingService
 from ...services.chunking_service import MarkdownChunkingStrategy
+from ..factories import TokenFactory
 
 
 class TestMarkdownChunkingStrategy:
@@ -19,6 +20,7 @@ class TestMarkdownChunkingStrategy:
         """Create a mock token encoder."""
         encoder = Mock()
         encoder.count_tokens.side_effect = lambda text: len(text.split())
+        encoder.tokenize.side_effect = TokenFactory.tokenize_words
         return encoder
 
     @pytest.fixture
@@ -59,7 +61,7 @@ AI has many applications in various fields including:
             char_count=len(sample_markdown_content),
         )
 
-        chunks = strategy.chunk(document, chunking_service)
+        chunks = [record.to_chunk() for record in strategy.chunk(document, chunking_service)]
         assert len(chunks) > 0
 
         # Check that chunks have proper metadata
@@ -67,3 +69,23 @@ AI has many applications in various fields including:
             assert chunk.metadata.file_type == FileType.MARKDOWN
             assert chunk.metadata.document_title == "AI Guide"
             assert chunk.metadata.section_header is not None  # Should extract headers
+
+    def test_code_comments_stay_in_their_section(self, mock_token_encoder):
+        """Test `#` lines in a fenced code block are chunked with their section."""
+        content = "# Setup\n\nInstall it:\n\n```bash\n# create a venv\npython -m venv .venv\n```"
+        chunking_service = DocumentChunkingService(
+            min_chunk_size=1, token_encoder=mock_token_encoder
+        )
+        document = ProcessedDocument(
+            file_name="setup.md",
+            file_type=FileType.MARKDOWN,
+            title="Setup",
+            content=content,
+            token_count=12,
+            char_count=len(content),
+        )
+
+        chunks = MarkdownChunkingStrategy().chunk(document, chunking_service)
+
+        assert {chunk.section_header for chunk in chunks} == {"Setup"}
+        assert any("# create a venv" in chunk.content for chunk in chunks)
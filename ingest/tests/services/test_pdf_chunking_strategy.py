@@ -9,6 +9,7 @@ import pytest
 from ...models import FileType, ProcessedDocument
 from ...services import DocumentChunkingService
 from ...services.chunking_service import PDFChunkingStrategy
+from ..factories import TokenFactory
 
 
 class TestPDFChunkingStrategy:
@@ -19,6 +20,7 @@ class TestPDFChunkingStrategy:
         """Create a mock token encoder."""
         encoder = Mock()
         encoder.count_tokens.side_effect = lambda text: len(text.split())
+        encoder.tokenize.side_effect = TokenFactory.tokenize_words
         return encoder
 
     @pytest.fixture
@@ -60,7 +62,7 @@ that can learn and improve from experience."""
             char_count=len(sample_pdf_content),
         )
 
-        chunks = strategy.chunk(document, chunking_service)
+        chunks = [record.to_chunk() for record in strategy.chunk(document, chunking_service)]
         assert len(chunks) > 0
 
         # Check that chunks have proper metadata
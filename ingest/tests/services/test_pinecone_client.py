@@ -0,0 +1,199 @@
+"""
+Tests for the PineconeVectorStore upsert pipeline.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from pinecone.exceptions import PineconeApiException
+
+from ...models import ChunkRecord
+from ...services import PineconeVectorStore
+from ..builders import a_document_chunk
+from ..factories import FakeEmbeddingsClient
+
+
+class RecordingIndex:
+    """Index stand-in that records upserted batches and can fail on chosen ids."""
+
+    def __init__(self):
+        """Initialize with no upserts or failures."""
+        self.batches = []
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace=""):
+        """Record a batch, raising the next queued error for any failing id in it."""
+        ids = [vector["id"] for vector in vectors]
+        with self._lock:
+            for vector_id in ids:
+                errors = self.failures.get(vector_id)
+                if errors:
+                    raise errors.pop(0)
+            self.batches.append((namespace, ids))
+
+    def describe_index_stats(self):
+        """Count upserted vectors by namespace, as Pinecone reports them."""
+        namespaces = {}
+        for namespace, ids in self.batches:
+            namespaces.setdefault(namespace, set()).update(ids)
+        return SimpleNamespace(
+            total_vector_count=sum(len(ids) for ids in namespaces.values()),
+            dimension=2,
+            index_fullness=0.0,
+            namespaces={name: {"vector_count": len(ids)} for name, ids in namespaces.items()},
+        )
+
+    def data_batches(self):
+        """Upserted id batches outside the meta namespace, sorted by first id."""
+        return sorted(
+            (ids for namespace, ids in self.batches if namespace == ""),
+            key=lambda ids: int(ids[0].split("-")[1]),
+        )
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    """Create a local-backend store with fake embeddings and a recording index."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    store = PineconeVectorStore(
+        api_key="",
+        environment="",
+        index_name="test-index",
+        embedding_dimensions=2,
+        backend="local",
+        local_index_path=str(tmp_path),
+        embedding_batch_size=3,
+        upsert_queue_depth=1,
+        upsert_concurrency=2,
+        failed_batch_journal=str(tmp_path / "failed.jsonl"),
+    )
+    store.embedder.client = FakeEmbeddingsClient(dimensions=2)
+    store.embedder._count_tokens = len
+    store.embedder._sleep = lambda _: None
+    store._sleep = lambda _: None
+    store.index = RecordingIndex()
+    return store
+
+
+def _chunks(count):
+    """Create chunks with distinct ids and content."""
+    return [
+        a_document_chunk().with_id(f"chunk-{i}").with_content(f"content {i}").build()
+        for i in range(count)
+    ]
+
+
+class TestUpsertPipeline:
+    """Test cases for streaming embed-then-upsert."""
+
+    def test_upserts_every_chunk_in_upsert_sized_batches(self, store):
+        """Test embedding batches are regrouped into upsert batches."""
+        report = store.upsert_chunks(_chunks(10), batch_size=4)
+
+        data_batches = store.index.data_batches()
+        assert [len(ids) for ids in data_batches] == [4, 4, 2]
+        assert [i for ids in data_batches for i in ids] == [f"chunk-{i}" for i in range(10)]
+        assert sorted(report.succeeded_ids) == sorted(f"chunk-{i}" for i in range(10))
+        assert report.batches == 3
+        assert report.ok
+
+    def test_skips_chunks_whose_embedding_failed(self, store):
+        """Test failed embedding batches are not upserted as placeholder vectors."""
+        store.embedder.max_retries = 0
+        store.embedder.client.failures = {"content 4": [FakeEmbeddingsClient.rate_limit_error()]}
+
+        report = store.upsert_chunks(_chunks(6), batch_size=10)
+
+        assert store.index.data_batches() == [["chunk-0", "chunk-1", "chunk-2"]]
+        assert report.embedding_failed_ids == ["chunk-3", "chunk-4", "chunk-5"]
+        assert not report.ok
+
+    def test_preview_is_the_embedded_text(self, store):
+        """Test whitespace is normalized once and shared by the embedding and preview."""
+        chunk = a_document_chunk().with_content("First line\n\nsecond\r\n  line").build()
+
+        vectors = list(store._embedded_vectors([chunk], []))
+
+        assert store.embedder.client.calls == [["First line second line"]]
+        assert vectors[0]["metadata"]["content_preview"] == "First line second line"
+
+    def test_bumps_index_generation_after_upsert(self, store):
+        """Test the generation marker is written after the data."""
+        store.upsert_chunks(_chunks(2))
+
+        assert store.index.batches[-1] == ("__meta__", ["index-generation"])
+
+    def test_index_stats_leave_out_the_generation_marker(self, store):
+        """Test the meta namespace is not counted as document vectors."""
+        store.upsert_chunks(_chunks(3), batch_size=10)
+
+        stats = store.get_index_stats()
+
+        assert stats["total_vector_count"] == 3
+        assert stats["namespaces"] == {"": {"vector_count": 3}}
+
+    def test_batches_stay_under_payload_limit(self, store):
+        """Test batches close early when the serialized request would be too large."""
+        chunks = _chunks(6)
+        # Room for two records per request
+        store.upsert_max_payload_bytes = (
+            2
+            * len(
+                json.dumps(
+                    store._to_vector(
+                        ChunkRecord.from_chunk(chunks[0]), [1.0, 1.0], chunks[0].content
+                    ),
+                    separators=(",", ":"),
+                )
+            )
+            + 20
+        )
+
+        store.upsert_chunks(chunks, batch_size=100)
+
+        assert [len(ids) for ids in store.index.data_batches()] == [2, 2, 2]
+
+    def test_retries_throttled_batches(self, store):
+        """Test a batch rejected with HTTP 429 is retried and succeeds."""
+        store.index.failures = {"chunk-0": [PineconeApiException(status=429)]}
+
+        report = store.upsert_chunks(_chunks(4), batch_size=2)
+
+        assert report.retries == 1
+        assert sorted(report.succeeded_ids) == [f"chunk-{i}" for i in range(4)]
+        assert report.ok
+
+    def test_reports_failed_ids_without_retrying_bad_requests(self, store):
+        """Test a batch rejected with HTTP 400 is reported as failed immediately."""
+        store.index.failures = {"chunk-2": [PineconeApiException(status=400)]}
+
+        report = store.upsert_chunks(_chunks(4), batch_size=2)
+
+        assert report.retries == 0
+        assert report.failed_ids == ["chunk-2", "chunk-3"]
+        assert sorted(report.succeeded_ids) == ["chunk-0", "chunk-1"]
+
+    def test_pulls_chunks_lazily(self, store):
+        """Test upserting starts long before a chunk generator is exhausted."""
+        pulled = []
+        pulled_at_upsert = []
+        upsert = store.index.upsert
+
+        def stream():
+            for chunk in _chunks(200):
+                pulled.append(chunk.id)
+                yield chunk
+
+        def recording_upsert(vectors, namespace=""):
+            pulled_at_upsert.append(len(pulled))
+            upsert(vectors, namespace)
+
+        store.index.upsert = recording_upsert
+
+        report = store.upsert_chunks(stream(), batch_size=4)
+
+        assert len(report.succeeded_ids) == 200
+        assert pulled_at_upsert[0] < 100
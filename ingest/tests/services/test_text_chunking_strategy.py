@@ -9,6 +9,7 @@ import pytest
 from ...models import FileType, ProcessedDocument
 from ...services import DocumentChunkingService
 from ...services.chunking_service import TextChunkingStrategy
+from ..factories import TokenFactory
 
 
 class TestTextChunkingStrategy:
@@ -23,6 +24,7 @@ class TestTextChunkingStrategy:
         encoder.decode.side_effect = lambda tokens: (
             " ".join([f"token{i}" for i in tokens]) if tokens else ""
         )
+        encoder.tokenize.side_effect = TokenFactory.tokenize_words
         return encoder
 
     @pytest.fixture
@@ -62,7 +64,7 @@ Applications of NLP include:
             char_count=len(sample_text_content),
         )
 
-        chunks = strategy.chunk(document, chunking_service)
+        chunks = [record.to_chunk() for record in strategy.chunk(document, chunking_service)]
         assert len(chunks) > 0
 
         # Check that chunks have proper metadata
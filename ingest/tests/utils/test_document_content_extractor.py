@@ -6,9 +6,11 @@ from pathlib import Path
 from unittest.mock import Mock, mock_open, patch
 
 import pytest
+from PyPDF2 import PdfWriter
 
 from ...models import ProcessingError
-from ...utils import DocumentContentExtractor
+from ...utils import DocumentContentExtractor, ExtractedTextCache
+from ...utils.content_extractor import detect_encoding
 
 
 class TestDocumentContentExtractor:
@@ -24,7 +26,7 @@ class TestDocumentContentExtractor:
         md_path = Path("/test / sample.md")
         md_content = "# Title\n\nThis is markdown content."
 
-        with patch("builtins.open", mock_open(read_data=md_content)):
+        with patch("builtins.open", mock_open(read_data=md_content.encode("utf-8"))):
             result = extractor.extract_content(md_path)
 
             assert result == md_content
@@ -34,7 +36,7 @@ class TestDocumentContentExtractor:
         txt_path = Path("/test / sample.txt")
         txt_content = "This is plain text content."
 
-        with patch("builtins.open", mock_open(read_data=txt_content)):
+        with patch("builtins.open", mock_open(read_data=txt_content.encode("utf-8"))):
             result = extractor.extract_content(txt_path)
 
             assert result == txt_content
@@ -106,3 +108,145 @@ class TestDocumentContentExtractor:
         with patch("builtins.open", side_effect=PermissionError("Permission denied")):
             with pytest.raises(ProcessingError, match="Failed to extract content"):
                 extractor.extract_content(restricted_path)
+
+
+class TestPDFExtraction:
+    """Test cases for cached and page-parallel PDF extraction."""
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        """Write a PDF file (its bytes key the cache; pages come from the mocked reader)."""
+        path = tmp_path / "paper.pdf"
+        path.write_bytes(b"%PDF-1.4 test bytes")
+        return path
+
+    @pytest.fixture
+    def mock_pypdf2(self):
+        """Mock PyPDF2 with a two-page reader."""
+        pages = [Mock(), Mock()]
+        pages[0].extract_text.return_value = "First page"
+        pages[1].extract_text.return_value = "Second page"
+        with patch("ingest.utils.content_extractor.PyPDF2") as mock_pypdf2:
+            mock_pypdf2.PdfReader.return_value.pages = pages
+            yield mock_pypdf2
+
+    def test_unchanged_pdf_is_served_from_cache(self, tmp_path, pdf_path, mock_pypdf2):
+        """Test a re-extracted PDF with the same bytes is not parsed again."""
+        cache = ExtractedTextCache(tmp_path / "text.sqlite3")
+
+        first = DocumentContentExtractor(text_cache=cache).extract_content(pdf_path)
+        second = DocumentContentExtractor(text_cache=cache).extract_content(pdf_path)
+
+        assert first == second == "--- Page 1 ---\nFirst page\n\n--- Page 2 ---\nSecond page"
+        mock_pypdf2.PdfReader.assert_called_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_changed_pdf_or_extractor_version_misses(self, tmp_path, pdf_path, mock_pypdf2):
+        """Test new file bytes or a new extractor version re-extract the PDF."""
+        extractor = DocumentContentExtractor(text_cache=ExtractedTextCache(tmp_path / "t.db"))
+        extractor.extract_content(pdf_path)
+
+        pdf_path.write_bytes(b"%PDF-1.4 edited bytes")
+        extractor.extract_content(pdf_path)
+        with patch("ingest.utils.content_extractor.EXTRACTOR_VERSION", "next"):
+            extractor.extract_content(pdf_path)
+
+        assert mock_pypdf2.PdfReader.call_count == 3
+
+    def test_supplied_file_hash_is_not_recomputed(self, tmp_path, pdf_path, mock_pypdf2):
+        """Test a hash computed by the caller keys the cache without hashing the file again."""
+        cache = ExtractedTextCache(tmp_path / "text.sqlite3")
+
+        with patch("ingest.utils.content_extractor.hash_file") as mock_hash_file:
+            text = DocumentContentExtractor(text_cache=cache).extract_content(pdf_path, "abc123")
+
+        mock_hash_file.assert_not_called()
+        assert cache.get("abc123", "1") == text
+
+    def test_slow_pages_are_reported(self, pdf_path, mock_pypdf2, capsys):
+        """Test pages over the slow-page threshold are printed with their timing."""
+        DocumentContentExtractor(slow_page_seconds=1e-9).extract_content(pdf_path)
+
+        output = capsys.readouterr().out
+        assert f"Slow page: {pdf_path} page 1 took" in output
+        assert f"Slow page: {pdf_path} page 2 took" in output
+
+    def test_large_pdf_pages_are_extracted_in_worker_processes(self, tmp_path, monkeypatch):
+        """Test page ranges extracted in parallel come back complete and in order."""
+        monkeypatch.setattr("ingest.utils.content_extractor.PAGES_PER_TASK", 3)
+        writer = PdfWriter()
+        for _ in range(10):
+            writer.add_blank_page(width=200, height=200)
+        path = tmp_path / "blank.pdf"
+        with open(path, "wb") as file:
+            writer.write(file)
+        extractor = DocumentContentExtractor(pdf_workers=2)
+
+        try:
+            pages = extractor._extract_pdf_pages(path)
+        finally:
+            extractor.close()
+
+        assert [page.number for page in pages] == list(range(1, 11))
+        assert all(page.error is None for page in pages)
+
+
+class TestTextStreaming:
+    """Test cases for encoding detection and streaming text files by paragraph."""
+
+    @pytest.fixture
+    def extractor(self):
+        """Create a DocumentContentExtractor instance."""
+        return DocumentContentExtractor()
+
+    @pytest.fixture
+    def small_blocks(self, monkeypatch):
+        """Decode streamed files a few bytes at a time."""
+        monkeypatch.setattr("ingest.utils.content_extractor.ENCODING_SAMPLE_BYTES", 5)
+        monkeypatch.setattr("ingest.utils.content_extractor.STREAM_BLOCK_BYTES", 3)
+
+    def test_detect_encoding(self):
+        """Test byte order marks win, then UTF-8, then latin-1."""
+        assert detect_encoding("café".encode("utf-8")) == "utf-8"
+        assert detect_encoding("café".encode("utf-8")[:-1]) == "utf-8"
+        assert detect_encoding("café au lait".encode("latin-1")) == "latin-1"
+        assert detect_encoding("text".encode("utf-8-sig")) == "utf-8-sig"
+        assert detect_encoding("text".encode("utf-16")) == "utf-16"
+        assert detect_encoding("text".encode("utf-32")) == "utf-32"
+
+    def test_latin1_file_is_read_once(self, extractor, tmp_path):
+        """Test a non-UTF-8 file is decoded as latin-1 instead of failing."""
+        path = tmp_path / "notes.txt"
+        path.write_bytes("Déjà vu".encode("latin-1"))
+
+        assert extractor.extract_content(path) == "Déjà vu"
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16"])
+    def test_paragraphs_match_the_whole_file(self, extractor, tmp_path, small_blocks, encoding):
+        """Test streamed paragraphs equal those of the whole text across tiny blocks."""
+        text = "Première ligne.\nSuite 🚀.\n\n  \n\nDeuxième.\r\n\r\nTroisième\n\n"
+        path = tmp_path / "doc.md"
+        path.write_bytes(text.encode(encoding))
+
+        paragraphs = list(extractor.iter_paragraphs(path))
+
+        assert paragraphs == ["Première ligne.\nSuite 🚀.", "Deuxième.", "Troisième"]
+
+    def test_paragraph_without_breaks_is_bounded(self, extractor, tmp_path, monkeypatch):
+        """Test text without blank lines is cut at line breaks to bound memory."""
+        monkeypatch.setattr("ingest.utils.content_extractor.MAX_PARAGRAPH_CHARS", 20)
+        monkeypatch.setattr("ingest.utils.content_extractor.STREAM_BLOCK_BYTES", 16)
+        lines = [f"line {i:02d}" for i in range(30)]
+        path = tmp_path / "log.txt"
+        path.write_text("\n".join(lines))
+
+        paragraphs = list(extractor.iter_paragraphs(path))
+
+        assert len(paragraphs) > 1
+        assert all(len(paragraph) <= 20 for paragraph in paragraphs)
+        assert "\n".join(paragraphs).split("\n") == lines
+
+    def test_missing_file_raises_processing_error(self, extractor, tmp_path):
+        """Test a file that cannot be opened fails with ProcessingError."""
+        with pytest.raises(ProcessingError, match="Failed to read file"):
+            list(extractor.iter_paragraphs(tmp_path / "missing.txt"))
@@ -67,3 +67,36 @@ Content under second header."""
         """Test splitting empty text."""
         result = splitter.split("")
         assert result == []
+
+    def test_sections_are_spans_of_the_text(self, splitter):
+        """Test sections index into the original text instead of copying it."""
+        text = "Preamble.\n# One\nFirst.\n\n## Two\nSecond."
+
+        sections = splitter.sections(text)
+
+        assert [(s.header, s.level) for s in sections] == [("", 0), ("One", 1), ("Two", 2)]
+        assert [text[s.start : s.end] for s in sections] == [
+            "Preamble.",
+            "# One\nFirst.\n",
+            "## Two\nSecond.",
+        ]
+
+    def test_headers_inside_code_fences_are_ignored(self, splitter):
+        """Test `#` lines in fenced code blocks do not start sections."""
+        text = (
+            "# Setup\n"
+            "```bash\n# install the package\npip install -e .\n```\n"
+            "~~~~\n# still code\n```\n# and still code\n~~~~\n"
+            "## Usage\nRun it."
+        )
+
+        sections = splitter.sections(text)
+
+        assert [s.header for s in sections] == ["Setup", "Usage"]
+        assert "# and still code" in text[sections[0].start : sections[0].end]
+
+    def test_unclosed_fence_runs_to_the_end(self, splitter):
+        """Test an unclosed code fence swallows the rest of the document."""
+        text = "# Title\n```\n# not a header\n"
+
+        assert [s.header for s in splitter.sections(text)] == ["Title"]
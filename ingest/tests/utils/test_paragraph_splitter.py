@@ -37,3 +37,12 @@ class TestParagraphSplitter:
         """Test splitting empty text."""
         result = splitter.split("")
         assert result == []
+
+    def test_spans_within_part_of_text(self, splitter):
+        """Test paragraph spans index into the original text and exclude whitespace."""
+        text = "Intro\n\n  First paragraph. \n \nSecond paragraph.\n\nOutro"
+        start, end = text.index("  First"), text.index("\n\nOutro")
+
+        spans = splitter.spans(text, start, end)
+
+        assert [text[s:e] for s, e in spans] == ["First paragraph.", "Second paragraph."]
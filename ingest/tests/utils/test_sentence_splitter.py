@@ -43,3 +43,23 @@ class TestSentenceSplitter:
         text = "This is a single sentence."
         result = splitter.split(text)
         assert result == ["This is a single sentence."]
+
+    def test_spans_are_yielded_lazily(self, splitter):
+        """Test sentence spans index into the text and are produced on demand."""
+        text = "Intro. First one here.  Second, e.g. this! Third"
+
+        spans = splitter.spans(text, start=text.index("First"))
+
+        assert next(spans) == (7, 22)
+        assert [text[start:end] for start, end in spans] == ["Second, e.g. this!", "Third"]
+
+    def test_custom_abbreviations(self):
+        """Test the abbreviation list can be replaced."""
+        text = "See Fig. 3 for details. Dr. Smith agrees."
+
+        assert SentenceSplitter(abbreviations=["Fig"]).split(text) == [
+            "See Fig. 3 for details.",
+            "Dr.",
+            "Smith agrees.",
+        ]
+        assert SentenceSplitter(abbreviations=[]).split("Dr. Who.") == ["Dr.", "Who."]
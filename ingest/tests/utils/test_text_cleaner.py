@@ -2,6 +2,9 @@
 Tests for the TextCleaner class.
 """
 
+import random
+import re
+
 import pytest
 
 from ...utils import TextCleaner
@@ -67,3 +70,15 @@ class TestTextCleaner:
         # The actual implementation may not handle all unicode whitespace
         # Let's test that it at least preserves the text content
         assert "Text" in result and "with" in result and "unicode" in result and "spaces" in result
+
+    def test_single_pass_matches_separate_passes(self, cleaner):
+        """Test the compiled pass equals collapsing lines, then spaces, then removing NULs."""
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice("ab \n\n\t\r\x00") for _ in range(rng.randint(0, 40)))
+            expected = re.sub(r" +", " ", re.sub(r"\n\s*\n\s*\n", "\n\n", text))
+            assert cleaner.clean_text(text) == expected.replace("\x00", "").strip()
+
+    def test_embedding_text_collapses_all_whitespace(self, cleaner):
+        """Test embedding text joins lines and whitespace runs with single spaces."""
+        assert cleaner.embedding_text(" Title\n\nBody\r\n\tmore  text ") == "Title Body more text"
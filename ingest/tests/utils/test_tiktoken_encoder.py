@@ -99,3 +99,73 @@ class TestTiktokenEncoder:
             result = encoder.decode([])
 
             assert result == ""
+
+    @pytest.mark.parametrize("text", ["Plain ASCII text.", "Naïve café — 世界 🎉 done", ""])
+    def test_tokenize_offsets_match_tiktoken(self, encoder, text):
+        """Test token start offsets agree with tiktoken, including multi-byte text."""
+        tokenized = encoder.tokenize(text)
+
+        _, offsets = encoder._encoding.decode_with_offsets(encoder.encode(text))
+        assert tokenized.starts == offsets
+        assert len(tokenized) == encoder.count_tokens(text)
+
+    def test_tokenized_span_counts(self, encoder):
+        """Test counting the tokens of character spans without re-encoding."""
+        text = "First paragraph here.\n\nSecond one."
+        tokenized = encoder.tokenize(text)
+        split = text.index("Second")
+
+        assert tokenized.count(0, split) + tokenized.count(split, len(text)) == len(tokenized)
+        assert tokenized.count(split, len(text)) == encoder.count_tokens("Second one.")
+        assert tokenized.char_offset(tokenized.token_index(split)) == split
+        assert tokenized.char_offset(len(tokenized)) == len(text)
+
+    def test_tokenize_reuses_last_result(self, encoder):
+        """Test tokenizing the same text twice encodes it once."""
+        with patch.object(encoder._encoding, "encode", wraps=encoder._encoding.encode) as encode:
+            first = encoder.tokenize("Same text")
+            second = encoder.tokenize("Same text")
+
+        assert first is second
+        encode.assert_called_once()
+
+    def test_encode_batch_matches_encode(self):
+        """Test batch encoding on several threads gives each text's own tokens."""
+        encoder = TiktokenEncoder(num_threads=4)
+        texts = ["First text.", "", "Naïve café — 世界", "First text."]
+
+        assert encoder.encode_batch(texts) == [encoder.encode(text) for text in texts]
+
+    def test_count_tokens_batch_encodes_each_new_text_once(self, encoder):
+        """Test batch counts encode distinct uncached texts in one batch call."""
+        encoder.count_tokens("## Header")
+        with patch.object(encoder, "encode_batch", wraps=encoder.encode_batch) as encode_batch:
+            counts = encoder.count_tokens_batch(["## Header", "Body text.", "Body text."])
+
+        encode_batch.assert_called_once_with(["Body text."])
+        header, body = len(encoder.encode("## Header")), len(encoder.encode("Body text."))
+        assert counts == [header, body, body]
+
+    def test_count_cache_evicts_least_recently_used(self):
+        """Test the count cache keeps only the most recently used short texts."""
+        encoder = TiktokenEncoder(count_cache_size=2)
+        encoder.count_tokens_batch(["one", "two"])
+        encoder.count_tokens("one")
+        encoder.count_tokens("three")
+
+        assert list(encoder._counts) == ["one", "three"]
+        encoder.count_tokens("x" * 5000)
+        assert "x" * 5000 not in encoder._counts
+
+    def test_tokenize_large_text_in_segments(self, monkeypatch):
+        """Test a text tokenized as a parallel batch of segments keeps whole-text offsets."""
+        monkeypatch.setattr("ingest.utils.token_encoder.SEGMENT_CHARS", 40)
+        encoder = TiktokenEncoder(num_threads=4)
+        text = "\n\n".join(f"Paragraph {i}: naïve text, one more.\n  indented" for i in range(20))
+
+        with patch.object(encoder, "encode_batch", wraps=encoder.encode_batch) as encode_batch:
+            tokenized = encoder.tokenize(text)
+
+        assert len(encode_batch.call_args.args[0]) > 1
+        _, offsets = encoder._encoding.decode_with_offsets(encoder.encode(text))
+        assert tokenized.starts == offsets
@@ -3,16 +3,28 @@ Utilities for the ingestion system.
 """
 
 from .content_extractor import DocumentContentExtractor, TextCleaner
-from .text_splitter import MarkdownSectionSplitter, ParagraphSplitter, SentenceSplitter
+from .extraction_cache import ExtractedTextCache, hash_file
+from .text_splitter import (
+    MarkdownSection,
+    MarkdownSectionSplitter,
+    ParagraphSplitter,
+    SentenceSplitter,
+    Span,
+)
 from .title_extractor import DocumentTitleExtractor
-from .token_encoder import TiktokenEncoder
+from .token_encoder import TiktokenEncoder, TokenizedText
 
 __all__ = [
     "DocumentTitleExtractor",
     "DocumentContentExtractor",
     "TextCleaner",
+    "ExtractedTextCache",
+    "hash_file",
     "TiktokenEncoder",
+    "TokenizedText",
     "SentenceSplitter",
     "ParagraphSplitter",
     "MarkdownSectionSplitter",
+    "MarkdownSection",
+    "Span",
 ]
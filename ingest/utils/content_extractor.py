@@ -3,9 +3,13 @@ Content extraction service for various document formats.
 Implements the Single Responsibility Principle.
 """
 
+import codecs
+import multiprocessing
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 try:
     import PyPDF2
@@ -13,6 +17,98 @@ except ImportError:
     PyPDF2 = None
 
 from ..models import ProcessingError
+from .extraction_cache import ExtractedTextCache, hash_file
+from .text_splitter import PARAGRAPH_BREAK, ParagraphSplitter
+
+# Bump whenever extraction output changes, so cached text is not reused
+EXTRACTOR_VERSION = "1"
+
+# Pages extracted per task when a PDF is split across processes
+PAGES_PER_TASK = 8
+
+# Bytes read from the start of a text file to detect its encoding
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Bytes decoded at a time when streaming a text file
+STREAM_BLOCK_BYTES = 1024 * 1024
+
+# A streamed paragraph without a break this long is cut at a line break or space
+MAX_PARAGRAPH_CHARS = 1024 * 1024
+
+# What TextCleaner.clean_text rewrites: blank lines beyond one, runs of spaces, NULs
+_CLEANUP = re.compile(r"\n\s*\n\s*\n|  +|\x00")
+# Replacement for a cleanup match, keyed by its first character
+_CLEANUP_REPLACEMENTS = {"\n": "\n\n", " ": " ", "\x00": ""}
+
+# Byte order marks, longest first since UTF-32 LE starts with the UTF-16 LE mark
+_BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Detect a text file's encoding from the first bytes of the file.
+
+    Args:
+        sample: Bytes from the start of the file
+
+    Returns:
+        The encoding named by a byte order mark, else UTF-8 if the sample is
+        valid UTF-8 (ignoring a character cut off at its end), else latin-1
+    """
+    for mark, encoding in _BYTE_ORDER_MARKS:
+        if sample.startswith(mark):
+            return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+class PageText(NamedTuple):
+    """Text extracted from one PDF page, with how long it took."""
+
+    number: int
+    text: str
+    seconds: float
+    error: Optional[str] = None
+
+
+def _extract_pages(reader: Any, start: int, end: int) -> List[PageText]:
+    """Extract and time pages [start, end) of an open PdfReader."""
+    pages = []
+    for index in range(start, end):
+        began = time.perf_counter()
+        try:
+            text, error = reader.pages[index].extract_text(), None
+        except Exception as page_error:
+            text, error = "", str(page_error)
+        pages.append(PageText(index + 1, text, time.perf_counter() - began, error))
+    return pages
+
+
+def extract_pdf_pages(file_path: Path, start: int, end: int) -> List[PageText]:
+    """
+    Extract a range of pages from a PDF file.
+
+    Runs in page-extraction worker processes, each opening the file itself.
+
+    Args:
+        file_path: PDF file
+        start: Index of the first page
+        end: Index past the last page
+
+    Returns:
+        The extracted pages in order
+    """
+    with open(file_path, "rb") as file:
+        return _extract_pages(PyPDF2.PdfReader(file), start, end)
 
 
 class DocumentContentExtractor:
@@ -22,20 +118,38 @@ class DocumentContentExtractor:
     Follows the Strategy pattern for different extraction methods.
     """
 
-    def __init__(self) -> None:
-        """Initialize the content extractor with format strategies."""
-        self._extractors: Dict[str, Callable[[Path], str]] = {
+    def __init__(
+        self,
+        pdf_workers: int = 1,
+        text_cache: Optional[ExtractedTextCache] = None,
+        slow_page_seconds: float = 2.0,
+    ) -> None:
+        """
+        Initialize the content extractor with format strategies.
+
+        Args:
+            pdf_workers: Processes extracting the pages of a large PDF (1 extracts in-process)
+            text_cache: Cache of extracted PDF text keyed by file hash and extractor version
+            slow_page_seconds: Pages taking at least this long to extract are reported
+        """
+        self.pdf_workers = pdf_workers
+        self.text_cache = text_cache
+        self.slow_page_seconds = slow_page_seconds
+        self._page_executor: Optional[ProcessPoolExecutor] = None
+        self._paragraph_splitter = ParagraphSplitter()
+        self._extractors: Dict[str, Callable[[Path, Optional[str]], str]] = {
             ".pdf": self._extract_pdf_content,
             ".md": self._extract_text_content,
             ".txt": self._extract_text_content,
         }
 
-    def extract_content(self, file_path: Path) -> str:
+    def extract_content(self, file_path: Path, file_hash: Optional[str] = None) -> str:
         """
         Extract text content from a file based on its type.
 
         Args:
             file_path: Path to the file
+            file_hash: The file's hash_file digest, if the caller already computed it
 
         Returns:
             Extracted text content
@@ -47,48 +161,139 @@ class DocumentContentExtractor:
         extractor = self._extractors.get(file_type, self._extract_text_content)
 
         try:
-            return extractor(file_path)
+            return extractor(file_path, file_hash)
         except Exception as e:
             raise ProcessingError(f"Failed to extract content from {file_path}: {e}") from e
 
-    def _extract_pdf_content(self, file_path: Path) -> str:
-        """Extract text content from PDF files."""
+    def _extract_pdf_content(self, file_path: Path, file_hash: Optional[str] = None) -> str:
+        """Extract text content from PDF files, reusing cached text of unchanged files."""
         if PyPDF2 is None:
             raise ProcessingError("PyPDF2 is required for PDF processing")
 
-        content = []
+        cache = self.text_cache
+        if cache is not None:
+            file_hash = file_hash or hash_file(file_path)
+            cached = cache.get(file_hash, EXTRACTOR_VERSION)
+            if cached is not None:
+                return cached
 
         try:
-            with open(file_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text.strip():
-                            content.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                    except Exception as page_error:
-                        msg = f"Warning: Error extracting page {page_num + 1} from {file_path}"
-                        print(f"{msg}: {page_error}")
+            pages = self._extract_pdf_pages(file_path)
         except Exception as e:
             raise ProcessingError(f"Failed to read PDF file {file_path}: {e}") from e
 
+        text = self._join_pages(file_path, pages)
+        if cache is not None and file_hash:
+            cache.put(file_hash, EXTRACTOR_VERSION, text)
+        return text
+
+    def _join_pages(self, file_path: Path, pages: List[PageText]) -> str:
+        """Join page texts under page markers, reporting failed and slow pages."""
+        content = []
+        for page in pages:
+            if page.error is not None:
+                msg = f"Warning: Error extracting page {page.number} from {file_path}"
+                print(f"{msg}: {page.error}")
+            elif page.text.strip():
+                content.append(f"--- Page {page.number} ---\n{page.text}")
+            if page.seconds >= self.slow_page_seconds:
+                print(f"Slow page: {file_path} page {page.number} took {page.seconds:.2f}s")
         return "\n\n".join(content)
 
-    def _extract_text_content(self, file_path: Path) -> str:
-        """Extract content from text - based files."""
+    def _extract_pdf_pages(self, file_path: Path) -> List[PageText]:
+        """Extract every page of a PDF, spreading large ones over worker processes."""
+        with open(file_path, "rb") as file:
+            reader = PyPDF2.PdfReader(file)
+            page_count = len(reader.pages)
+            if self.pdf_workers <= 1 or page_count <= PAGES_PER_TASK:
+                return _extract_pages(reader, 0, page_count)
+
+        if self._page_executor is None:
+            # Forked from a clean server process: the caller may have threads running
+            self._page_executor = ProcessPoolExecutor(
+                self.pdf_workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        futures = [
+            self._page_executor.submit(
+                extract_pdf_pages, file_path, start, min(start + PAGES_PER_TASK, page_count)
+            )
+            for start in range(0, page_count, PAGES_PER_TASK)
+        ]
+        return [page for future in futures for page in future.result()]
+
+    def close(self) -> None:
+        """Shut down the page-extraction processes and close the text cache."""
+        if self._page_executor is not None:
+            self._page_executor.shutdown()
+            self._page_executor = None
+        if self.text_cache is not None:
+            self.text_cache.close()
+
+    def _extract_text_content(self, file_path: Path, file_hash: Optional[str] = None) -> str:
+        """Extract content from text - based files, reading them once (they are not cached)."""
+        try:
+            with open(file_path, "rb") as file:
+                data = file.read()
+        except Exception as e:
+            raise ProcessingError(f"Failed to read file {file_path}: {e}") from e
+
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return file.read()
+            return data.decode(detect_encoding(data[:ENCODING_SAMPLE_BYTES]))
         except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                with open(file_path, "r", encoding="latin-1") as file:
-                    return file.read()
-            except Exception as e:
-                raise ProcessingError(f"Failed to read text file {file_path}: {e}") from e
+            # Invalid bytes past the sample; decode the bytes already read instead
+            return data.decode("latin-1")
+
+    def iter_paragraphs(self, file_path: Path) -> Iterator[str]:
+        """
+        Stream a text file's paragraphs without reading the whole file into memory.
+
+        The encoding is detected from the first ENCODING_SAMPLE_BYTES, then the
+        file is decoded incrementally, STREAM_BLOCK_BYTES at a time. Bytes past
+        the sample that are invalid in that encoding become U+FFFD.
+
+        Args:
+            file_path: Path to a text or Markdown file
+
+        Yields:
+            Non-blank paragraphs with surrounding whitespace removed
+
+        Raises:
+            ProcessingError: If the file cannot be read
+        """
+        try:
+            with open(file_path, "rb") as file:
+                block = file.read(ENCODING_SAMPLE_BYTES)
+                decoder = codecs.getincrementaldecoder(detect_encoding(block))(errors="replace")
+                pending = ""
+                while block:
+                    pending += decoder.decode(block)
+                    complete, pending = self._complete_paragraphs(pending)
+                    yield from complete
+                    block = file.read(STREAM_BLOCK_BYTES)
+                pending += decoder.decode(b"", final=True)
         except Exception as e:
             raise ProcessingError(f"Failed to read file {file_path}: {e}") from e
+        yield from self._paragraph_splitter.split(pending)
+
+    def _complete_paragraphs(self, text: str) -> Tuple[List[str], str]:
+        """Split decoded text into the paragraphs known to be complete and the rest."""
+        last_break = None
+        for last_break in PARAGRAPH_BREAK.finditer(text):
+            pass
+        split_at = last_break.start() if last_break else 0
+        paragraphs = self._paragraph_splitter.split(text[:split_at])
+        rest = text[split_at:]
+
+        # Bound memory on text without paragraph breaks
+        while len(rest) > MAX_PARAGRAPH_CHARS:
+            cut = rest.rfind("\n", 1, MAX_PARAGRAPH_CHARS)
+            if cut <= 0:
+                cut = rest.rfind(" ", 1, MAX_PARAGRAPH_CHARS)
+            if cut <= 0:
+                cut = MAX_PARAGRAPH_CHARS
+            paragraphs.extend(self._paragraph_splitter.split(rest[:cut]))
+            rest = rest[cut:]
+        return paragraphs, rest
 
 
 class TextCleaner:
@@ -103,17 +308,27 @@ class TextCleaner:
         """
         Clean and normalize text content.
 
+        Collapses blank lines beyond one and runs of spaces, and removes NUL
+        characters, in a single precompiled pass over the text.
+
         Args:
             text: Raw text content
 
         Returns:
             Cleaned text content
         """
-        # Remove excessive whitespace
-        text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
-        text = re.sub(r" +", " ", text)
+        return _CLEANUP.sub(lambda match: _CLEANUP_REPLACEMENTS[match.group()[0]], text).strip()
 
-        # Remove special characters that might cause issues
-        text = text.replace("\x00", "")
+    @staticmethod
+    def embedding_text(text: str) -> str:
+        """
+        Normalize cleaned text for embedding.
 
-        return text.strip()
+        Args:
+            text: Cleaned text, e.g. a chunk's content
+
+        Returns:
+            The text with every run of whitespace, line breaks included, turned
+            into a single space
+        """
+        return " ".join(text.split())
@@ -0,0 +1,109 @@
+"""
+Persistent SQLite cache of extracted document text keyed by file hash and extractor version.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+def hash_file(path: Path) -> str:
+    """
+    Hash a file's bytes.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class ExtractedTextCache:
+    """
+    On-disk cache of extracted text so unchanged PDFs are never parsed twice.
+
+    The connection is opened on first use, so an extractor built before worker
+    processes are forked does not share it with them.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open (or create) the database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS extracted_text ("
+                    " file_hash TEXT NOT NULL,"
+                    " extractor_version TEXT NOT NULL,"
+                    " text TEXT NOT NULL,"
+                    " PRIMARY KEY (file_hash, extractor_version))"
+                )
+        return self._conn
+
+    def get(self, file_hash: str, extractor_version: str) -> Optional[str]:
+        """
+        Look up the text extracted from a file.
+
+        Args:
+            file_hash: Hash of the file's bytes
+            extractor_version: Version of the extractor that produced the text
+
+        Returns:
+            The cached text, or None if the file was not extracted by this version
+        """
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT text FROM extracted_text WHERE file_hash = ? AND extractor_version = ?",
+                    (file_hash, extractor_version),
+                )
+                .fetchone()
+            )
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, file_hash: str, extractor_version: str, text: str) -> None:
+        """
+        Store the text extracted from a file.
+
+        Args:
+            file_hash: Hash of the file's bytes
+            extractor_version: Version of the extractor that produced the text
+            text: Extracted text
+        """
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extracted_text VALUES (?, ?, ?)",
+                (file_hash, extractor_version, text),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -5,7 +5,66 @@ Implements the Single Responsibility Principle.
 
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# Character span (start, end) into a larger string
+Span = Tuple[int, int]
+
+# Abbreviations whose dot does not end a sentence
+DEFAULT_ABBREVIATIONS = frozenset(
+    {
+        "Dr",
+        "Mr",
+        "Mrs",
+        "Ms",
+        "Prof",
+        "Sr",
+        "Jr",
+        "vs",
+        "etc",
+        "i.e",
+        "e.g",
+        "Ph.D",
+        "M.D",
+        "B.A",
+        "M.A",
+        "Inc",
+        "Corp",
+        "Ltd",
+        "Co",
+        "St",
+        "Ave",
+        "Blvd",
+    }
+)
+
+
+class MarkdownSection(NamedTuple):
+    """A Markdown section as a span of the document, starting at its header line."""
+
+    start: int
+    end: int
+    header: str
+    level: int
+
+
+# A blank line between paragraphs
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_NON_SPACE = re.compile(r"\S")
+_TRAILING_SPACE = re.compile(r"\s*$")
+# A line that may open or close a code fence, or start a header
+_MARKDOWN_LINE = re.compile(
+    r"^[^\S\n]*(?:(?P<fence>`{3,}|~{3,})(?P<info>.*)|(?P<hashes>#+).*)$", re.MULTILINE
+)
+
+
+def strip_span(text: str, start: int, end: int) -> Optional[Span]:
+    """Shrink a span of text to exclude surrounding whitespace (None if it is blank)."""
+    first = _NON_SPACE.search(text, start, end)
+    if first is None:
+        return None
+    trailing = _TRAILING_SPACE.search(text, first.start(), end)
+    return first.start(), trailing.start() if trailing else end
 
 
 class TextSplitter(ABC):
@@ -21,33 +80,26 @@ class SentenceSplitter(TextSplitter):
     Splits text into sentences with improved handling of abbreviations.
     """
 
-    def __init__(self) -> None:
-        """Initialize the sentence splitter."""
-        # Common abbreviations that shouldn't trigger sentence breaks
-        self._abbreviations = {
-            "Dr",
-            "Mr",
-            "Mrs",
-            "Ms",
-            "Prof",
-            "Sr",
-            "Jr",
-            "vs",
-            "etc",
-            "i.e",
-            "e.g",
-            "Ph.D",
-            "M.D",
-            "B.A",
-            "M.A",
-            "Inc",
-            "Corp",
-            "Ltd",
-            "Co",
-            "St",
-            "Ave",
-            "Blvd",
-        }
+    def __init__(self, abbreviations: Optional[Iterable[str]] = None) -> None:
+        """
+        Initialize the sentence splitter.
+
+        Args:
+            abbreviations: Abbreviations, without their final dot, whose dot does
+                not end a sentence (case-insensitive; defaults to DEFAULT_ABBREVIATIONS)
+        """
+        self._abbreviations = frozenset(
+            DEFAULT_ABBREVIATIONS if abbreviations is None else abbreviations
+        )
+        # One scan finds both sentence breaks and abbreviations; an abbreviation
+        # swallows the whitespace after its dot so that it is not a break.
+        # Longest first so that e.g. "Corp" is tried before "Co".
+        alternatives = "|".join(
+            re.escape(abbreviation)
+            for abbreviation in sorted(self._abbreviations, key=lambda a: (-len(a), a))
+        )
+        abbreviation = rf"(?P<abbreviation>\b(?:{alternatives})\.\s*)|" if alternatives else ""
+        self._boundary = re.compile(rf"{abbreviation}(?<=[.!?])\s+", re.IGNORECASE)
 
     def split(self, text: str) -> List[str]:
         """
@@ -59,30 +111,33 @@ class SentenceSplitter(TextSplitter):
         Returns:
             List of sentences
         """
-        # Protect abbreviations by temporarily replacing dots
-        protected_text = self._protect_abbreviations(text)
+        return [text[start:end] for start, end in self.spans(text)]
 
-        # Split on sentence endings
-        sentences = re.split(r"(?<=[.!?])\s+", protected_text)
-
-        # Restore dots in abbreviations and clean up
-        sentences = [self._restore_abbreviations(s).strip() for s in sentences if s.strip()]
-
-        return sentences
+    def spans(self, text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Span]:
+        """
+        Split part of a text into sentences, yielding their character spans.
 
-    def _protect_abbreviations(self, text: str) -> str:
-        """Replace dots in abbreviations with placeholder."""
-        pattern = r"\b(?:" + "|".join(re.escape(abbr) for abbr in self._abbreviations) + r")\."
-        return re.sub(
-            pattern,
-            lambda m: m.group().replace(".", "<!DOT!>"),
-            text,
-            flags=re.IGNORECASE,
-        )
+        Args:
+            text: Text containing the part to split
+            start: Start offset of the part
+            end: End offset of the part (defaults to the end of the text)
 
-    def _restore_abbreviations(self, text: str) -> str:
-        """Restore dots in abbreviations."""
-        return text.replace("<!DOT!>", ".")
+        Yields:
+            (start, end) spans into text, one per non-blank sentence, with
+            surrounding whitespace excluded
+        """
+        end = len(text) if end is None else end
+        cursor = start
+        for match in self._boundary.finditer(text, start, end):
+            if match.lastgroup == "abbreviation":
+                continue
+            span = strip_span(text, cursor, match.start())
+            if span is not None:
+                yield span
+            cursor = match.end()
+        span = strip_span(text, cursor, end)
+        if span is not None:
+            yield span
 
 
 class ParagraphSplitter(TextSplitter):
@@ -100,9 +155,30 @@ class ParagraphSplitter(TextSplitter):
         Returns:
             List of paragraphs
         """
+        return [text[start:end] for start, end in self.spans(text)]
+
+    def spans(self, text: str, start: int = 0, end: Optional[int] = None) -> List[Span]:
+        """
+        Split part of a text into paragraphs, returning their character spans.
+
+        Args:
+            text: Text containing the part to split
+            start: Start offset of the part
+            end: End offset of the part (defaults to the end of the text)
+
+        Returns:
+            List of (start, end) spans into text, one per non-blank paragraph,
+            with surrounding whitespace excluded
+        """
+        end = len(text) if end is None else end
         # Split by double newlines (paragraph breaks)
-        paragraphs = re.split(r"\n\s*\n", text)
-        return [p.strip() for p in paragraphs if p.strip()]
+        bounds = [start]
+        for match in PARAGRAPH_BREAK.finditer(text, start, end):
+            bounds.extend(match.span())
+        bounds.append(end)
+
+        spans = (strip_span(text, bounds[i], bounds[i + 1]) for i in range(0, len(bounds), 2))
+        return [span for span in spans if span is not None]
 
 
 class MarkdownSectionSplitter(TextSplitter):
@@ -120,30 +196,69 @@ class MarkdownSectionSplitter(TextSplitter):
         Returns:
             List of section dictionaries with header and content
         """
-        lines = text.split("\n")
-        sections: List[Dict[str, Any]] = []
-        current_section: Dict[str, Any] = {"header": "", "content": "", "level": 0}
-
-        for line in lines:
-            # Check for headers
-            if line.strip().startswith("#"):
-                # Save previous section if it has content
-                if str(current_section["content"]).strip():
-                    sections.append(current_section)
-
-                # Start new section
-                header_level = len(line) - len(line.lstrip("#"))
-                header_text = line.strip("#").strip()
-                current_section = {
-                    "header": header_text,
-                    "content": line + "\n",
-                    "level": header_level,
-                }
-            else:
-                current_section["content"] = str(current_section["content"]) + line + "\n"
-
-        # Add final section
-        if str(current_section["content"]).strip():
-            sections.append(current_section)
+        return [
+            {
+                "header": section.header,
+                "content": text[section.start : section.end] + "\n",
+                "level": section.level,
+            }
+            for section in self.sections(text)
+        ]
+
+    def sections(self, text: str) -> List[MarkdownSection]:
+        """
+        Split Markdown text into section spans in one pass, without copying it.
+
+        A section runs from its header line up to the line break before the
+        next header. Lines starting with `#` inside fenced code blocks are not
+        headers. Text before the first header forms a section with an empty
+        header and level 0, unless it is blank.
+
+        Args:
+            text: Markdown text to split
 
+        Returns:
+            List of sections in document order
+        """
+        sections: List[MarkdownSection] = []
+        start, header, level = 0, "", 0
+
+        for offset, next_header, next_level in self.header_lines(text)[0]:
+            if level or strip_span(text, start, offset) is not None:
+                sections.append(MarkdownSection(start, max(start, offset - 1), header, level))
+            start, header, level = offset, next_header, next_level
+
+        if level or strip_span(text, start, len(text)) is not None:
+            sections.append(MarkdownSection(start, len(text), header, level))
         return sections
+
+    def header_lines(self, text: str, fence: str = "") -> Tuple[List[Tuple[int, str, int]], str]:
+        """
+        Find the header lines of Markdown text, skipping fenced code blocks.
+
+        Text can be scanned piece by piece (e.g. paragraph by paragraph) by
+        passing the fence state returned for one piece into the next.
+
+        Args:
+            text: Markdown text to scan
+            fence: Opening marker of a code fence still open before the text
+
+        Returns:
+            Tuple of ((offset, header, level) per header line, the fence still
+            open at the end of the text or "")
+        """
+        headers = []
+        for match in _MARKDOWN_LINE.finditer(text):
+            marker = match.group("fence")
+            if fence:
+                # A closing fence repeats the opening character at least as often
+                if marker and marker[0] == fence[0] and len(marker) >= len(fence):
+                    if not match.group("info").strip():
+                        fence = ""
+                continue
+            if marker:
+                fence = marker
+                continue
+            header = match.group().strip().strip("#").strip()
+            headers.append((match.start(), header, len(match.group("hashes"))))
+        return headers, fence
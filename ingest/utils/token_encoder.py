@@ -3,7 +3,14 @@ Token encoding service using tiktoken.
 Implements the Single Responsibility Principle.
 """
 
-from typing import List
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
 
 try:
     import tiktoken
@@ -12,6 +19,61 @@ except ImportError:
 
 from ..models import ProcessingError
 
+# Texts longer than this are not kept in the token count cache
+MAX_CACHED_TEXT_CHARS = 1024
+
+# Large texts are tokenized in segments of about this many characters, one per thread
+SEGMENT_CHARS = 50_000
+
+# A line break followed by a non-space character: tiktoken never merges a token
+# across it, so encoding the text on either side separately gives the same tokens
+_SEGMENT_BREAK = re.compile(r"\n(?=\S)")
+
+
+class TokenizedText:
+    """
+    A text together with the character offset at which each of its tokens starts.
+
+    Lets callers count the tokens of any character span, and map between token
+    and character positions, without encoding the text again.
+    """
+
+    def __init__(self, text: str, starts: Iterable[int]) -> None:
+        """
+        Initialize the tokenized text.
+
+        Args:
+            text: The encoded text
+            starts: Non-decreasing character offset of each token in the text
+        """
+        self.text = text
+        self.starts = list(starts)
+
+    def __len__(self) -> int:
+        """Number of tokens in the whole text."""
+        return len(self.starts)
+
+    def token_index(self, char_offset: int) -> int:
+        """Index of the first token starting at or after a character offset."""
+        return bisect_left(self.starts, char_offset)
+
+    def char_offset(self, token_index: int) -> int:
+        """Character offset where a token starts (the text length past the last token)."""
+        return self.starts[token_index] if token_index < len(self.starts) else len(self.text)
+
+    def count(self, start: int, end: int) -> int:
+        """
+        Count the tokens starting within a character span.
+
+        Args:
+            start: Span start offset
+            end: Span end offset (exclusive)
+
+        Returns:
+            Number of tokens
+        """
+        return self.token_index(end) - self.token_index(start)
+
 
 class TiktokenEncoder:
     """
@@ -20,12 +82,20 @@ class TiktokenEncoder:
     Implements the TokenEncoder protocol.
     """
 
-    def __init__(self, encoding_model: str = "cl100k_base") -> None:
+    def __init__(
+        self,
+        encoding_model: str = "cl100k_base",
+        num_threads: Optional[int] = None,
+        count_cache_size: int = 4096,
+    ) -> None:
         """
         Initialize the token encoder.
 
         Args:
             encoding_model: The tiktoken encoding model to use
+            num_threads: Threads used by tiktoken's batch encoding, 1 to encode
+                serially (default: one per CPU core, at most 8)
+            count_cache_size: Token counts of short texts kept in an LRU cache
 
         Raises:
             ProcessingError: If tiktoken is not available
@@ -38,6 +108,13 @@ class TiktokenEncoder:
         except Exception as e:
             raise ProcessingError(f"Failed to initialize tiktoken encoder: {e}") from e
 
+        self.num_threads = num_threads or min(8, os.cpu_count() or 1)
+        self.count_cache_size = count_cache_size
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._counts_lock = threading.Lock()
+        self._token_byte_lengths: Optional[np.ndarray] = None
+        self._last_tokenized: Optional[TokenizedText] = None
+
     def encode(self, text: str) -> List[int]:
         """
         Encode text to tokens.
@@ -50,6 +127,20 @@ class TiktokenEncoder:
         """
         return self._encoding.encode(text)
 
+    def encode_batch(self, texts: Sequence[str]) -> List[List[int]]:
+        """
+        Encode several texts, in parallel on tiktoken's thread pool.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            List of token IDs for each text, in order
+        """
+        if self.num_threads <= 1 or len(texts) <= 1:
+            return [self.encode(text) for text in texts]
+        return self._encoding.encode_batch(list(texts), num_threads=self.num_threads)
+
     def decode(self, tokens: List[int]) -> str:
         """
         Decode tokens to text.
@@ -72,4 +163,119 @@ class TiktokenEncoder:
         Returns:
             Number of tokens
         """
-        return len(self.encode(text))
+        count = self._cached_count(text)
+        if count is None:
+            count = len(self.encode(text))
+            self._remember_count(text, count)
+        return count
+
+    def count_tokens_batch(self, texts: Sequence[str]) -> List[int]:
+        """
+        Count the tokens of several texts with one batch encode.
+
+        Short texts seen recently (headers, boilerplate paragraphs) are served from
+        the count cache, and each distinct uncached text is encoded once.
+
+        Args:
+            texts: Texts to count tokens for
+
+        Returns:
+            Number of tokens in each text, in order
+        """
+        cached = {text: self._cached_count(text) for text in texts}
+        counts = {text: count for text, count in cached.items() if count is not None}
+        missing = [text for text, count in cached.items() if count is None]
+        for text, tokens in zip(missing, self.encode_batch(missing)):
+            counts[text] = len(tokens)
+            self._remember_count(text, counts[text])
+        return [counts[text] for text in texts]
+
+    def _cached_count(self, text: str) -> Optional[int]:
+        """Token count of a text from the LRU cache, if present."""
+        if len(text) > MAX_CACHED_TEXT_CHARS:
+            return None
+        with self._counts_lock:
+            count = self._counts.get(text)
+            if count is not None:
+                self._counts.move_to_end(text)
+            return count
+
+    def _remember_count(self, text: str, count: int) -> None:
+        """Store a short text's token count, evicting the least recently used."""
+        if len(text) > MAX_CACHED_TEXT_CHARS or self.count_cache_size <= 0:
+            return
+        with self._counts_lock:
+            self._counts[text] = count
+            self._counts.move_to_end(text)
+            while len(self._counts) > self.count_cache_size:
+                self._counts.popitem(last=False)
+
+    def _byte_lengths(self) -> np.ndarray:
+        """UTF-8 byte length of every token id, built on first use."""
+        if self._token_byte_lengths is None:
+            lengths = np.zeros(self._encoding.n_vocab, dtype=np.int64)
+            for token in range(self._encoding.n_vocab):
+                try:
+                    lengths[token] = len(self._encoding.decode_single_token_bytes(token))
+                except KeyError:
+                    continue
+            self._token_byte_lengths = lengths
+        return self._token_byte_lengths
+
+    def tokenize(self, text: str) -> TokenizedText:
+        """
+        Encode text once, keeping the character offset of every token.
+
+        The most recent result is kept, so a document tokenized while being
+        processed is not encoded again when the same encoder chunks it.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            The text with its token start offsets
+        """
+        last = self._last_tokenized
+        if last is not None and last.text == text:
+            return last
+
+        tokens = self._encode_segmented(text)
+        lengths = self._byte_lengths()[tokens]
+        byte_starts = np.cumsum(lengths) - lengths
+
+        if text.isascii():
+            starts = byte_starts
+        else:
+            # Map byte offsets to character offsets; a token starting inside a
+            # multi-byte character is placed at that character
+            raw = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+            continuation = (raw & 0xC0) == 0x80
+            char_starts_before = np.cumsum(~continuation) - ~continuation
+            starts = char_starts_before[byte_starts] - continuation[byte_starts]
+
+        self._last_tokenized = TokenizedText(text, starts.tolist())
+        return self._last_tokenized
+
+    def _encode_segmented(self, text: str) -> np.ndarray:
+        """
+        Encode a text, splitting a large one at line breaks into a parallel batch.
+
+        Segments end right after a line break that is followed by a non-space
+        character, which tiktoken never merges across, so the concatenated tokens
+        are the same as encoding the whole text.
+        """
+        bounds = [0]
+        if self.num_threads > 1:
+            while len(text) - bounds[-1] > SEGMENT_CHARS:
+                match = _SEGMENT_BREAK.search(text, bounds[-1] + SEGMENT_CHARS)
+                if match is None:
+                    break
+                bounds.append(match.end())
+        if len(bounds) == 1:
+            return np.asarray(self.encode(text), dtype=np.int64)
+
+        bounds.append(len(text))
+        segments = [text[start:end] for start, end in zip(bounds, bounds[1:])]
+        return np.concatenate(
+            [np.asarray(tokens, dtype=np.int64) for tokens in self.encode_batch(segments)]
+        )